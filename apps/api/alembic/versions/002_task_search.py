@@ -0,0 +1,61 @@
+"""Task full-text search: generated tsvector column and GIN indexes
+
+Revision ID: 002_task_search
+Revises: 001_initial
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "002_task_search"
+down_revision: Union[str, None] = "001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match Task.search_vector in app/models/task.py
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Maintained by Postgres on every insert/update of title or description
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_tasks_search_vector", "tasks", ["search_vector"], postgresql_using="gin"
+    )
+
+    # Optional trigram index for typo-tolerant / partial-word title matching
+    # (TASK_SEARCH_TRIGRAM_ENABLED). Skipped where the pg_trgm extension isn't available.
+    bind = op.get_bind()
+    available = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if available:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_title_trgm "
+            "ON tasks USING gin (title gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_tasks_title_trgm")
+    op.drop_index("idx_tasks_search_vector", table_name="tasks")
+    op.drop_column("tasks", "search_vector")
+    # pg_trgm is left installed: other objects may depend on it
@@ -0,0 +1,47 @@
+"""Task delta sync: (user_id, updated_at) index and deletion tombstones
+
+Revision ID: 003_task_sync
+Revises: 002_task_search
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "003_task_sync"
+down_revision: Union[str, None] = "002_task_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset scans of a user's changes in (updated_at, id) order
+    op.create_index("idx_user_updated", "tasks", ["user_id", "updated_at", "id"])
+
+    op.create_table(
+        "task_tombstones",
+        sa.Column("task_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index(
+        "idx_tombstone_user_deleted", "task_tombstones", ["user_id", "deleted_at", "task_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_tombstone_user_deleted", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    op.drop_index("idx_user_updated", table_name="tasks")
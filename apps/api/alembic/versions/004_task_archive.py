@@ -0,0 +1,116 @@
+"""Task archival: partition tasks by an archived flag
+
+Revision ID: 004_task_archive
+Revises: 003_task_sync
+Create Date: 2026-10-19 15:00:00.000000
+
+`tasks` becomes a table partitioned by LIST (archived): `tasks_active` holds the live tasks and
+`tasks_archived` the completed tasks the worker archives (tasks.archival). Queries filtered on
+`archived` only scan, and keep in cache, the indexes of one partition.
+
+The primary key becomes (id, archived), since unique constraints of a partitioned table must
+include the partition key, so Postgres no longer enforces a unique `id` across the table. Each
+partition keeps a unique index on `id`; a duplicate across partitions would need the same
+UUID inserted twice, and task ids are only generated by the API (uuid4), never taken from
+clients. Code inserting tasks must keep it that way.
+
+The table is rebuilt (copy, drop, rename) under an exclusive lock: run it in a maintenance
+window on large tables.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "004_task_archive"
+down_revision: Union[str, None] = "003_task_sync"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Stored columns (search_vector is generated)
+COLUMNS = (
+    "id, title, description, status, priority, due_date, user_id, created_at, updated_at, "
+    "archived"
+)
+
+# Indexes of the tasks table (001_initial to 003_task_sync), recreated after the rebuild
+INDEXES = {
+    "ix_tasks_status": ["status"],
+    "ix_tasks_priority": ["priority"],
+    "ix_tasks_due_date": ["due_date"],
+    "ix_tasks_user_id": ["user_id"],
+    "ix_tasks_created_at": ["created_at"],
+    "idx_user_status": ["user_id", "status"],
+    "idx_user_due_date": ["user_id", "due_date"],
+    "idx_user_created": ["user_id", "created_at"],
+    "idx_user_updated": ["user_id", "updated_at", "id"],
+}
+
+
+def _create_indexes() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "tasks", columns)
+    op.create_index(
+        "idx_tasks_search_vector", "tasks", ["search_vector"], postgresql_using="gin"
+    )
+    # Optional trigram index (see 002_task_search), only where it existed before
+    bind = op.get_bind()
+    installed = bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).scalar()
+    if installed:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_title_trgm "
+            "ON tasks USING gin (title gin_trgm_ops)"
+        )
+
+
+def upgrade() -> None:
+    # Fast default: no table rewrite
+    op.add_column(
+        "tasks",
+        sa.Column("archived", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+    op.execute(
+        "CREATE TABLE tasks_partitioned (LIKE tasks INCLUDING DEFAULTS INCLUDING GENERATED) "
+        "PARTITION BY LIST (archived)"
+    )
+    op.execute("CREATE TABLE tasks_active PARTITION OF tasks_partitioned FOR VALUES IN (false)")
+    op.execute("CREATE TABLE tasks_archived PARTITION OF tasks_partitioned FOR VALUES IN (true)")
+    op.execute(f"INSERT INTO tasks_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM tasks")
+
+    op.drop_table("tasks")
+    op.rename_table("tasks_partitioned", "tasks")
+
+    # Unique constraints of a partitioned table must include the partition key
+    op.create_primary_key("tasks_pkey", "tasks", ["id", "archived"])
+    # `id` is unique within each partition (see above for across partitions)
+    op.execute("CREATE UNIQUE INDEX idx_tasks_active_id ON tasks_active (id)")
+    op.execute("CREATE UNIQUE INDEX idx_tasks_archived_id ON tasks_archived (id)")
+    op.create_foreign_key("tasks_user_id_fkey", "tasks", "users", ["user_id"], ["id"])
+    _create_indexes()
+
+    # Archival candidates (DONE, oldest change first); only needed on the active partition
+    op.execute(
+        "CREATE INDEX idx_tasks_active_done_updated ON tasks_active (updated_at) "
+        "WHERE status = 'done'"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE TABLE tasks_unpartitioned (LIKE tasks INCLUDING DEFAULTS INCLUDING GENERATED)"
+    )
+    op.execute(f"INSERT INTO tasks_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM tasks")
+
+    # Drops the partitions and their indexes
+    op.drop_table("tasks")
+    op.rename_table("tasks_unpartitioned", "tasks")
+    op.drop_column("tasks", "archived")
+
+    op.create_primary_key("tasks_pkey", "tasks", ["id"])
+    op.create_foreign_key("tasks_user_id_fkey", "tasks", "users", ["user_id"], ["id"])
+    _create_indexes()
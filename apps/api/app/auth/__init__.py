@@ -1,11 +1,21 @@
 """Authentication module"""
 
-from app.auth.dependencies import get_current_user_dependency
-from app.auth.jwt import create_access_token, create_refresh_token, verify_token
-
-__all__ = [
-    "create_access_token",
-    "create_refresh_token",
-    "verify_token",
-    "get_current_user_dependency",
-]
+from importlib import import_module
+
+# Re-exports are resolved on first access so that importing a submodule (e.g. app.auth.jwt from
+# tooling) doesn't pull in FastAPI dependencies it doesn't use
+_EXPORTS = {
+    "create_access_token": "app.auth.jwt",
+    "create_refresh_token": "app.auth.jwt",
+    "verify_token": "app.auth.jwt",
+    "get_current_user_dependency": "app.auth.dependencies",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
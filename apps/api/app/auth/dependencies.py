@@ -1,53 +1,40 @@
 """Authentication dependencies"""
 
-from uuid import UUID
-
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.jwt import verify_token
 from app.database import get_db
+from app.middleware.authentication import get_principal
 from app.models.user import User
 from app.services.user_service import get_user_by_id
 
-security = HTTPBearer()
-
 
 async def get_current_user_dependency(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """
     Dependency to get current authenticated user from database
 
+    The access token (Bearer header or cookie) was already verified by
+    AuthenticationMiddleware; this only loads the user.
+
     Returns:
         User model instance
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If not authenticated or user not found
     """
-    token = credentials.credentials
-    payload = verify_token(token)
-
-    # Extract user ID from token
-    user_id_str = payload.get("sub")
-    if not user_id_str:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token: missing user ID",
-        )
-
-    try:
-        user_id = UUID(user_id_str)
-    except ValueError:
+    principal = get_principal(request)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token: invalid user ID format",
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
         )
 
     # Fetch user from database
-    user = await get_user_by_id(db, user_id)
+    user = await get_user_by_id(db, principal.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -2,11 +2,27 @@
 
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import uuid4
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
 
+from app.auth.keys import get_key_ring
+from app.cache import store_refresh_token
 from app.core.config import settings
+from app.core.exceptions import AuthenticationError
+
+
+def _encode(claims: dict) -> str:
+    key = get_key_ring().active
+    headers = {"kid": key.kid} if key.kid else None
+    return jwt.encode(claims, key.signing, algorithm=key.algorithm, headers=headers)
+
+
+def _decode(token: str) -> dict:
+    """Verify signature and expiry with the key named by the token's kid (raises JWTError)"""
+    key = get_key_ring().verification_key(token)
+    return jwt.decode(token, key.verifying, algorithms=[key.algorithm])
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -16,18 +32,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encoded_jwt
+    # jti identifies the token for revocation (see app.services.token_revocation)
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid4().hex})
+    return _encode(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
     """Create JWT refresh token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid4().hex})
+    return _encode(to_encode)
 
 
 def verify_token(token: str, token_type: str = "access") -> dict:
@@ -44,7 +59,7 @@ def verify_token(token: str, token_type: str = "access") -> dict:
         )
 
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = _decode(token)
 
         # Verify token type
         if payload.get("type") != token_type:
@@ -72,13 +87,11 @@ def verify_token_safe(token: str, token_type: str = "access") -> dict:
     """
     Verify JWT token (safe for GraphQL - raises AuthenticationError instead of HTTPException)
     """
-    from app.core.exceptions import AuthenticationError
-
     if not token:
         raise AuthenticationError("Token is required")
 
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = _decode(token)
 
         # Verify token type
         if payload.get("type") != token_type:
@@ -104,9 +117,6 @@ async def create_auth_tokens_for_user(user_id: str, email: str) -> tuple[str, st
     Returns:
         Tuple of (access_token, refresh_token)
     """
-    from app.cache import store_refresh_token
-    from app.core.config import settings
-
     token_data = {
         "sub": user_id,
         "email": email,
@@ -0,0 +1,136 @@
+"""
+JWT signing keys
+
+With an HS* JWT_ALGORITHM, tokens are signed and verified with the shared JWT_SECRET_KEY and
+carry no key ID. With an asymmetric algorithm (ES256, RS256, ...), each PEM file in
+JWT_KEYS_DIR is a key whose ID (`kid`) is the file name without `.pem`:
+- the key named by JWT_ACTIVE_KEY_ID signs new tokens, so it must be a private key
+- every key verifies tokens carrying its `kid`, so a retired key keeps accepting the tokens it
+  signed until they expire (it can be reduced to its public key)
+- public keys are published at /.well-known/jwks.json, so other services (edge proxies, the
+  worker) can verify tokens without holding a secret
+
+Keys are parsed once per process and reused for every token.
+"""
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import JWTError
+
+from app.core.config import settings
+
+# How long clients may cache the JWKS. Publish a new key at least this long before
+# activating it, so verifiers have it by the time tokens signed with it arrive.
+JWKS_MAX_AGE_SECONDS = 300
+
+LEGACY_ALGORITHM = "HS256"
+
+
+@dataclass(frozen=True)
+class JWTKey:
+    kid: Optional[str]  # None: shared-secret key, tokens carry no kid
+    algorithm: str
+    verifying: Key
+    signing: Optional[Key] = None  # None for verify-only (public) keys
+    public_jwk: Optional[dict] = None  # None for shared secrets, which are never published
+
+
+def _is_symmetric(algorithm: str) -> bool:
+    return algorithm.upper().startswith("HS")
+
+
+def _secret_key(algorithm: str) -> JWTKey:
+    key = jwk.construct(settings.JWT_SECRET_KEY, algorithm)
+    return JWTKey(kid=None, algorithm=algorithm, verifying=key, signing=key)
+
+
+def _load_key(path: Path, algorithm: str) -> JWTKey:
+    kid = path.stem
+    try:
+        key = jwk.construct(path.read_text(), algorithm)
+    except Exception as e:
+        raise ValueError(f"JWT key {path}: not a valid {algorithm} key ({e})") from e
+
+    public = key if key.is_public() else key.public_key()
+    signing = None if key.is_public() else key
+    # jwk.construct doesn't check the key type against the algorithm; a probe signature does
+    if signing is not None:
+        try:
+            valid = public.verify(b"probe", signing.sign(b"probe"))
+        except Exception:
+            valid = False
+        if not valid:
+            raise ValueError(f"JWT key {path}: not a {algorithm} key")
+
+    public_jwk = {**public.to_dict(), "kid": kid, "alg": algorithm, "use": "sig"}
+    return JWTKey(
+        kid=kid, algorithm=algorithm, verifying=public, signing=signing, public_jwk=public_jwk
+    )
+
+
+class KeyRing:
+    """The signing key plus every key tokens may be verified with"""
+
+    def __init__(
+        self, active: JWTKey, keys: Dict[str, JWTKey], legacy: Optional[JWTKey] = None
+    ):
+        self.active = active
+        self.keys = keys  # By kid
+        self.legacy = legacy  # Verifies tokens without a kid
+
+    def verification_key(self, token: str) -> JWTKey:
+        """
+        Key to verify `token` with, chosen by its `kid` header
+
+        Raises:
+            JWTError: Malformed header or unknown key ID
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self.legacy is None:
+                raise JWTError("Token has no key ID")
+            return self.legacy
+        key = self.keys.get(kid)
+        if key is None:
+            raise JWTError("Unknown key ID")
+        return key
+
+    def jwks(self) -> dict:
+        """Public keys as a JSON Web Key Set"""
+        return {"keys": [key.public_jwk for key in self.keys.values() if key.public_jwk]}
+
+
+@cache
+def get_key_ring() -> KeyRing:
+    """
+    Build the key ring from settings (once per process)
+
+    Raises:
+        ValueError: Missing or invalid key configuration
+    """
+    algorithm = settings.JWT_ALGORITHM
+    if _is_symmetric(algorithm):
+        secret = _secret_key(algorithm)
+        return KeyRing(active=secret, keys={}, legacy=secret)
+
+    if not settings.JWT_KEYS_DIR:
+        raise ValueError(f"JWT_ALGORITHM={algorithm} requires JWT_KEYS_DIR")
+    paths = sorted(Path(settings.JWT_KEYS_DIR).glob("*.pem"))
+    keys = {key.kid: key for key in (_load_key(path, algorithm) for path in paths)}
+
+    active = keys.get(settings.JWT_ACTIVE_KEY_ID)
+    if active is None:
+        raise ValueError(
+            f"JWT_ACTIVE_KEY_ID={settings.JWT_ACTIVE_KEY_ID!r} is not a key in "
+            f"{settings.JWT_KEYS_DIR} (found: {', '.join(keys) or 'none'})"
+        )
+    if active.signing is None:
+        raise ValueError(f"Active JWT key {active.kid!r} is a public key; it can't sign")
+
+    legacy = _secret_key(LEGACY_ALGORITHM) if settings.JWT_VERIFY_SECRET_KEY_TOKENS else None
+    return KeyRing(active=active, keys=keys, legacy=legacy)
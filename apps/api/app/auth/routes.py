@@ -1,8 +1,9 @@
 """Authentication routes"""
 
+import asyncio
+
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt import create_access_token, create_refresh_token, verify_token
@@ -15,14 +16,25 @@ from app.cache import (
 )
 from app.core.config import settings
 from app.database import get_db
+from app.middleware.authentication import get_principal
+from app.middleware.rate_limit import concurrency_limit, password_hashing, rate_limit
 from app.schemas.auth import LoginRequest, RefreshTokenRequest, TokenResponse
-from app.services.user_service import get_user_by_email, verify_password
+from app.services.password_rehash import schedule_rehash
+from app.services.token_revocation import token_revocation
+from app.services.user_service import get_user_by_email, verify_password_and_check_rehash
 
 router = APIRouter()
 logger = structlog.get_logger(__name__)
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[
+        Depends(rate_limit("login", settings.RATE_LIMIT_LOGIN)),
+        Depends(concurrency_limit(password_hashing)),
+    ],
+)
 async def login(
     credentials: LoginRequest,
     request: Request,
@@ -30,15 +42,8 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ):
     """Login endpoint - authenticate user and return JWT tokens"""
-    # Rate limiting: 5 attempts per minute per IP
-    try:
-        limiter = request.app.state.limiter
-        limiter.limit("5/minute", key_func=get_remote_address)(lambda: None)()
-    except Exception:
-        pass  # Continue if rate limiting fails
-
     # Get user from database
-    user = await get_user_by_email(db, credentials.email)
+    user = await get_user_by_email(db, credentials.email, include_password_hash=True)
     if not user:
         logger.warning("Login attempt with non-existent email", email=credentials.email)
         raise HTTPException(
@@ -47,7 +52,10 @@ async def login(
         )
 
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    verified, needs_rehash = verify_password_and_check_rehash(
+        credentials.password, user.password_hash
+    )
+    if not verified:
         logger.warning(
             "Login attempt with incorrect password", email=credentials.email, user_id=str(user.id)
         )
@@ -57,6 +65,8 @@ async def login(
         )
 
     logger.info("User logged in successfully", user_id=str(user.id), email=credentials.email)
+    if needs_rehash:
+        schedule_rehash(user.id, user.password_hash, credentials.password)
 
     # Create tokens
     token_data = {
@@ -105,7 +115,11 @@ async def login(
     )
 
 
-@router.post("/refresh", response_model=TokenResponse)
+@router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("refresh", settings.RATE_LIMIT_REFRESH))],
+)
 async def refresh_token_endpoint(
     request_data: RefreshTokenRequest,
     request: Request,
@@ -113,13 +127,6 @@ async def refresh_token_endpoint(
     db: AsyncSession = Depends(get_db),
 ):
     """Refresh access token with rotation"""
-    # Rate limiting: 10 attempts per minute per IP
-    try:
-        limiter = request.app.state.limiter
-        limiter.limit("10/minute", key_func=get_remote_address)(lambda: None)()
-    except Exception:
-        pass  # Continue if rate limiting fails
-
     # Verify refresh token
     if not request_data.refresh_token:
         raise HTTPException(
@@ -139,15 +146,18 @@ async def refresh_token_endpoint(
             detail="Invalid token payload",
         )
 
-    # Check if token is revoked
-    if await is_token_revoked(user_id, request_data.refresh_token):
+    # Revocation check and token lookup share one Redis round trip (auto-pipelined)
+    revoked, stored_token = await asyncio.gather(
+        is_token_revoked(user_id, request_data.refresh_token),
+        get_refresh_token(user_id, request_data.refresh_token),
+    )
+    if revoked:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
         )
 
     # Verify token exists in Redis
-    stored_token = await get_refresh_token(user_id, request_data.refresh_token)
     if not stored_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -210,7 +220,7 @@ async def logout(
     request: Request,
     response: Response,
 ):
-    """Logout endpoint - revoke refresh token"""
+    """Logout endpoint - revoke refresh token and the access token presented with it"""
     if not request_data.refresh_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -233,6 +243,11 @@ async def logout(
         # If token is invalid, still return success (idempotent)
         pass
 
+    # Revoke the access token too, so it stops working before it expires
+    principal = get_principal(request)
+    if principal is not None:
+        await token_revocation.revoke_token(principal.claims)
+
     # Clear cookies
     response.delete_cookie(key="taskflow_access_token", path="/")
     response.delete_cookie(key="taskflow_refresh_token", path="/")
@@ -1,55 +1,185 @@
 """Redis cache utilities for token storage and management"""
 
-import json
-from typing import Optional
+import asyncio
+import time
+from typing import Dict, Optional, Union
 
 import redis.asyncio as aioredis
 import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
 
+from app.core import serialization
 from app.core.config import settings
+from app.near_cache import NearCache
+from app.redis_pipeline import AutoPipeline
 
 logger = structlog.get_logger(__name__)
 
-# Global Redis connection pool
-_redis_pool: Optional[aioredis.ConnectionPool] = None
-_redis_client: Optional[aioredis.Redis] = None
-
+# Named connection pools, one per workload, so a slow bulk operation can't take the
+# connections needed on the login/token path
+DEFAULT_POOL = "default"
+AUTH_POOL = "auth"
+CACHE_POOL = "cache"
+RATE_LIMIT_POOL = "rate_limit"
+REDIS_POOLS = (DEFAULT_POOL, AUTH_POOL, CACHE_POOL, RATE_LIMIT_POOL)
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "redis_pool_connections",
+    "Connections per Redis pool",
+    ["pool", "state"],  # in_use, idle, max
+)
+REDIS_POOL_WAIT = Histogram(
+    "redis_pool_wait_seconds",
+    "Time spent waiting to check out a Redis connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+REDIS_POOL_EXHAUSTED = Counter(
+    "redis_pool_exhausted_total",
+    "Checkouts that timed out because the pool was saturated",
+    ["pool"],
+)
+
+
+class InstrumentedConnectionPool(aioredis.BlockingConnectionPool):
+    """Blocking connection pool exporting checkout wait time and saturation"""
+
+    def __init__(self, *args, pool_name: str = DEFAULT_POOL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_name = pool_name
+
+        REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="in_use").set_function(
+            lambda: len(self._in_use_connections)
+        )
+        REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="idle").set_function(
+            lambda: len(self._available_connections)
+        )
+        REDIS_POOL_CONNECTIONS.labels(pool=pool_name, state="max").set(self.max_connections)
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except aioredis.ConnectionError as e:
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                REDIS_POOL_EXHAUSTED.labels(pool=self.pool_name).inc()
+                logger.warning("Redis pool exhausted", pool=self.pool_name)
+            raise
+        finally:
+            REDIS_POOL_WAIT.labels(pool=self.pool_name).observe(time.perf_counter() - started)
+
+
+# Global Redis clients (one per named pool) and their auto-pipelining wrappers
+_redis_clients: Dict[str, aioredis.Redis] = {}
+_pipelines: Dict[str, AutoPipeline] = {}
+
+
+def _create_pool(name: str) -> InstrumentedConnectionPool:
+    return InstrumentedConnectionPool.from_url(
+        settings.REDIS_URL,
+        pool_name=name,
+        max_connections=settings.REDIS_POOL_MAX_CONNECTIONS.get(
+            name, settings.REDIS_MAX_CONNECTIONS
+        ),
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+        socket_keepalive=True,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        retry=Retry(
+            ExponentialBackoff(
+                cap=settings.REDIS_RETRY_BACKOFF_CAP_SECONDS,
+                base=settings.REDIS_RETRY_BACKOFF_BASE_SECONDS,
+            ),
+            settings.REDIS_RETRY_ATTEMPTS,
+        ),
+        # Without retry_on_error redis-py replaces the retry policy with "no retries"
+        retry_on_error=[aioredis.ConnectionError, aioredis.TimeoutError],
+        decode_responses=True,
+    )
+
+
+async def get_redis(pool: str = DEFAULT_POOL) -> aioredis.Redis:
+    """
+    Get Redis client for a named pool (singleton per pool)
 
-async def get_redis() -> aioredis.Redis:
-    """Get Redis client instance (singleton)"""
-    global _redis_client, _redis_pool
+    Args:
+        pool: One of REDIS_POOLS ("default", "auth", "cache", "rate_limit")
 
-    if _redis_client is None:
-        _redis_pool = aioredis.ConnectionPool.from_url(
-            settings.REDIS_URL,
-            max_connections=10,
-            decode_responses=True,
+    Raises:
+        ValueError: If the pool name is unknown
+    """
+    client = _redis_clients.get(pool)
+    if client is None:
+        if pool not in REDIS_POOLS:
+            raise ValueError(f"Unknown Redis pool: {pool}")
+
+        connection_pool = _create_pool(pool)
+        client = aioredis.Redis(connection_pool=connection_pool)
+        _redis_clients[pool] = client
+        logger.info(
+            "Redis connection pool created",
+            pool=pool,
+            max_connections=connection_pool.max_connections,
         )
-        _redis_client = aioredis.Redis(connection_pool=_redis_pool)
-        logger.info("Redis connection pool created", url=settings.REDIS_URL)
 
-    return _redis_client
+    return client
 
 
-async def close_redis() -> None:
-    """Close Redis connection pool"""
-    global _redis_client, _redis_pool
+async def get_pipeline(pool: str = DEFAULT_POOL) -> Union[AutoPipeline, aioredis.Redis]:
+    """
+    Get the auto-pipelining client for a named pool
 
-    if _redis_client:
-        await _redis_client.close()
-        _redis_client = None
+    Commands awaited concurrently (e.g. under asyncio.gather or from sibling GraphQL
+    resolvers) share one round trip. Falls back to the plain client when
+    REDIS_AUTO_PIPELINE_ENABLED is off; both expose get/exists/setex/delete.
 
-    if _redis_pool:
-        await _redis_pool.disconnect()
-        _redis_pool = None
+    Raises:
+        ValueError: If the pool name is unknown
+    """
+    client = await get_redis(pool)
+    if not settings.REDIS_AUTO_PIPELINE_ENABLED:
+        return client
 
-    logger.info("Redis connection pool closed")
+    pipeline = _pipelines.get(pool)
+    if pipeline is None or pipeline.client is not client:
+        pipeline = AutoPipeline(client, max_batch_size=settings.REDIS_AUTO_PIPELINE_MAX_BATCH)
+        _pipelines[pool] = pipeline
+    return pipeline
+
+
+async def close_redis() -> None:
+    """Close all Redis connection pools"""
+    await near_cache.stop()
+
+    for name, client in list(_redis_clients.items()):
+        await client.close()
+        await client.connection_pool.disconnect()
+        del _redis_clients[name]
+    _pipelines.clear()
+
+    logger.info("Redis connection pools closed")
 
 
 # Token storage keys
 REFRESH_TOKEN_PREFIX = "refresh_token:"
 REVOKED_TOKEN_PREFIX = "revoked_token:"
 
+# In-process cache of token lookups, invalidated by Redis (see app/near_cache.py)
+near_cache = NearCache(
+    prefixes=(REFRESH_TOKEN_PREFIX, REVOKED_TOKEN_PREFIX),
+    max_entries=settings.REDIS_NEAR_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.REDIS_NEAR_CACHE_TTL_SECONDS,
+)
+
+
+async def start_near_cache() -> None:
+    """Start near-cache invalidation tracking if enabled"""
+    if settings.REDIS_NEAR_CACHE_ENABLED:
+        await near_cache.start()
+
 
 async def store_refresh_token(user_id: str, token: str, expires_in_days: int = 7) -> None:
     """
@@ -60,11 +190,13 @@ async def store_refresh_token(user_id: str, token: str, expires_in_days: int = 7
         token: Refresh token string
         expires_in_days: Token expiration in days (default: 7)
     """
-    redis_client = await get_redis()
+    redis_client = await get_redis(AUTH_POOL)
     key = f"{REFRESH_TOKEN_PREFIX}{user_id}:{token}"
     ttl_seconds = expires_in_days * 24 * 60 * 60  # Convert days to seconds
 
-    await redis_client.setex(key, ttl_seconds, json.dumps({"user_id": user_id, "token": token}))
+    await redis_client.setex(
+        key, ttl_seconds, serialization.dumps({"user_id": user_id, "token": token})
+    )
     logger.debug("Refresh token stored", user_id=user_id, ttl_days=expires_in_days)
 
 
@@ -79,12 +211,12 @@ async def get_refresh_token(user_id: str, token: str) -> Optional[dict]:
     Returns:
         Token data if found, None otherwise
     """
-    redis_client = await get_redis()
+    redis_client = await get_pipeline(AUTH_POOL)
     key = f"{REFRESH_TOKEN_PREFIX}{user_id}:{token}"
 
-    data = await redis_client.get(key)
+    data = await near_cache.get(key, lambda: redis_client.get(key))
     if data:
-        return json.loads(data)
+        return serialization.loads(data)
 
     return None
 
@@ -98,7 +230,7 @@ async def revoke_refresh_token(user_id: str, token: str, expires_in_days: int =
         token: Refresh token string
         expires_in_days: How long to keep revoked token record (default: 7)
     """
-    redis_client = await get_redis()
+    redis_client = await get_redis(AUTH_POOL)
     token_key = f"{REFRESH_TOKEN_PREFIX}{user_id}:{token}"
     revoked_key = f"{REVOKED_TOKEN_PREFIX}{user_id}:{token}"
 
@@ -126,10 +258,10 @@ async def is_token_revoked(user_id: str, token: str) -> bool:
     Returns:
         True if token is revoked, False otherwise
     """
-    redis_client = await get_redis()
+    redis_client = await get_pipeline(AUTH_POOL)
     revoked_key = f"{REVOKED_TOKEN_PREFIX}{user_id}:{token}"
 
-    exists = await redis_client.exists(revoked_key)
+    exists = await near_cache.get(revoked_key, lambda: redis_client.exists(revoked_key))
     return bool(exists)
 
 
@@ -140,7 +272,7 @@ async def revoke_all_user_tokens(user_id: str) -> None:
     Args:
         user_id: User ID (UUID string)
     """
-    redis_client = await get_redis()
+    redis_client = await get_redis(AUTH_POOL)
     pattern = f"{REFRESH_TOKEN_PREFIX}{user_id}:*"
 
     # Find all tokens for this user
@@ -164,7 +296,7 @@ async def delete_refresh_token(user_id: str, token: str) -> None:
         user_id: User ID (UUID string)
         token: Refresh token string
     """
-    redis_client = await get_redis()
+    redis_client = await get_redis(AUTH_POOL)
     key = f"{REFRESH_TOKEN_PREFIX}{user_id}:{token}"
 
     deleted = await redis_client.delete(key)
@@ -0,0 +1,42 @@
+"""
+Bloom filter of strings
+
+Answers "definitely not a member" or "possibly a member": there are no false negatives, and
+false positives occur at about the configured rate while no more than `capacity` items have
+been added. Members can't be removed; build a new filter to drop them.
+"""
+
+import hashlib
+import math
+from typing import Iterable, List
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` items at `error_rate` false positives"""
+
+    def __init__(self, capacity: int, error_rate: float, items: Iterable[str] = ()):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        for item in items:
+            self.add(item)
+
+    def _positions(self, item: str) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item)
+        )
@@ -1,7 +1,7 @@
 """Application configuration"""
 
 import json
-from typing import List
+from typing import Dict, List
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,13 +17,70 @@ class Settings(BaseSettings):
     # Redis
     # Docker Redis runs on port 6380
     REDIS_URL: str = "redis://localhost:6380/0"
+    # Connection pools (one per workload: default, auth, cache, rate_limit)
+    REDIS_MAX_CONNECTIONS: int = 10  # Per pool, unless overridden below
+    REDIS_POOL_MAX_CONNECTIONS: Dict[str, int] = {"auth": 20, "cache": 10, "rate_limit": 10}
+    REDIS_POOL_TIMEOUT_SECONDS: float = 1.0  # Wait for a free connection before failing
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 2.0
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    REDIS_RETRY_ATTEMPTS: int = 3
+    REDIS_RETRY_BACKOFF_BASE_SECONDS: float = 0.05
+    REDIS_RETRY_BACKOFF_CAP_SECONDS: float = 1.0
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    # In-process cache of hot token lookups, invalidated via Redis CLIENT TRACKING
+    REDIS_NEAR_CACHE_ENABLED: bool = False
+    REDIS_NEAR_CACHE_MAX_ENTRIES: int = 10000
+    REDIS_NEAR_CACHE_TTL_SECONDS: float = 60.0  # Safety net for missed invalidations
+    # Coalesce Redis commands issued in the same event-loop tick into one pipeline
+    REDIS_AUTO_PIPELINE_ENABLED: bool = True
+    REDIS_AUTO_PIPELINE_MAX_BATCH: int = 128
+
+    # Shared pub/sub subscriber: messages a slow subscription (e.g. a GraphQL subscription
+    # over WebSocket) may have queued before it is ended
+    PUBSUB_SUBSCRIPTION_MAX_QUEUED: int = 100
+
+    # User lookups: per-process LRU (L1) in front of Redis (L2, no password hashes)
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_L1_TTL_SECONDS: float = 30.0
+    USER_CACHE_TTL_SECONDS: int = 300
+
+    # Task search: also match titles with words similar to the query (needs pg_trgm, see
+    # migration 002_task_search)
+    TASK_SEARCH_TRIGRAM_ENABLED: bool = False
+    # Delta sync: changes this recent are reported again on the next sync, covering writes
+    # committed late by slow transactions
+    TASK_SYNC_SETTLE_SECONDS: float = 5.0
+    # Deletions are remembered this long; older sync cursors must do a full sync
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30
 
     # JWT
     JWT_SECRET_KEY: str = "your-secret-key-change-in-production"
-    JWT_ALGORITHM: str = "HS256"
+    JWT_ALGORITHM: str = "HS256"  # HS256 (shared secret) or asymmetric, e.g. ES256, RS256
+    # Asymmetric algorithms: directory of <kid>.pem keys (see app/auth/keys.py); the active one
+    # signs, all of them verify and are published at /.well-known/jwks.json
+    JWT_KEYS_DIR: str = ""
+    JWT_ACTIVE_KEY_ID: str = ""
+    # Asymmetric algorithms: also accept tokens without a kid signed with JWT_SECRET_KEY
+    # (HS256), while switching over from HS256
+    JWT_VERIFY_SECRET_KEY_TOKENS: bool = False
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Access token revocation (logout): revoked token IDs are mirrored in an in-process Bloom
+    # filter so only filter hits cost a Redis lookup; rebuilt periodically to drop expired IDs.
+    # Disabled (or while pub/sub is down), every authenticated request checks Redis.
+    TOKEN_REVOCATION_FILTER_ENABLED: bool = True
+    TOKEN_REVOCATION_FILTER_CAPACITY: int = 100000  # Grows if more IDs are revoked
+    TOKEN_REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_FILTER_REFRESH_SECONDS: float = 60.0
+
+    # Password hashing
+    # Outdated password hashes are rehashed by the worker after login; the task message
+    # carries the password encrypted with this Fernet key (shared with the worker). Empty
+    # disables rehashing
+    PASSWORD_REHASH_KEY: str = ""
+
     # CORS (Traefik routes)
     # Accept both JSON string from env or list
     # Note: Must include all origins that will make requests (cannot use wildcard with credentials)
@@ -34,10 +91,15 @@ class Settings(BaseSettings):
         "http://localhost:3000",  # Next.js dev server (if running locally)
     ]
 
-    @field_validator("CORS_ORIGINS", mode="before")
+    # Reverse proxies (addresses or CIDR networks) whose X-Forwarded-For header is trusted to
+    # name the client, e.g. Traefik. Rate limits key on the client address; without this,
+    # every request through a proxy shares the proxy's address. Same formats as CORS_ORIGINS
+    TRUSTED_PROXIES: str | List[str] = []
+
+    @field_validator("CORS_ORIGINS", "TRUSTED_PROXIES", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
-        """Parse CORS_ORIGINS from JSON string or list"""
+        """Parse CORS_ORIGINS / TRUSTED_PROXIES from JSON string or list"""
         if isinstance(v, str):
             try:
                 # Try parsing as JSON array
@@ -49,6 +111,15 @@ class Settings(BaseSettings):
                 return [origin.strip() for origin in v.split(",") if origin.strip()]
         return v
 
+    # Rate limiting (Redis-backed, shared by all workers and replicas)
+    # Limits use "<count>/<period>" syntax, e.g. "5/minute", "100/hour"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN: str = "5/minute"
+    RATE_LIMIT_REFRESH: str = "10/minute"
+    RATE_LIMIT_REGISTER: str = "10/hour"
+    # Concurrent password hash/verify operations per process (extra requests are rejected)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+
     # Cookie settings
     COOKIE_SECURE: bool = False  # Set to True in production (HTTPS only)
     COOKIE_HTTPONLY: bool = True  # httpOnly cookies for security
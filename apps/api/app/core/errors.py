@@ -1,7 +1,7 @@
 """Exception handlers"""
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -27,7 +27,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
             status_code=exc.status_code,
             message=exc.message,
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={"error": exc.message},
         )
@@ -39,7 +39,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
             path=request.url.path,
             exc_info=exc,
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": "Internal server error"},
         )
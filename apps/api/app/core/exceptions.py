@@ -23,3 +23,12 @@ class ValidationError(Exception):
     def __init__(self, message: str = "Validation failed"):
         self.message = message
         super().__init__(self.message)
+
+
+class RateLimitError(Exception):
+    """Raised when a rate or concurrency limit is exceeded"""
+
+    def __init__(self, message: str = "Too many requests", retry_after: float = 0.0):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
@@ -0,0 +1,43 @@
+"""
+JSON serialization
+
+One place for encoding/decoding JSON across REST responses, the GraphQL router (see
+app.graphql.encoding) and the Redis cache layer, backed by orjson. datetime, date and UUID values
+are encoded natively (RFC 3339 / canonical UUID strings, identical to isoformat()/str()), so
+callers can hand them over as-is. That includes the UUID subclass asyncpg returns for uuid
+columns, which orjson doesn't recognise natively.
+"""
+
+from typing import Any, Union
+from uuid import UUID
+
+import orjson
+
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    # Only called for types orjson can't encode itself
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to JSON bytes"""
+    return orjson.dumps(obj, default=_default)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode to a JSON string (for APIs that expect str, e.g. Redis with decode_responses)"""
+    return orjson.dumps(obj, default=_default).decode()
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Decode JSON
+
+    Raises:
+        JSONDecodeError: If the data is not valid JSON
+    """
+    return orjson.loads(data)
@@ -0,0 +1,80 @@
+"""
+Single-flight coalescing of identical concurrent reads
+
+While a call for a key is in flight, later callers with the same key wait for it and receive
+the same result instead of issuing their own query. Nothing is cached once the call finishes.
+
+Results are handed to every waiter, so they must be plain data (dicts, tuples, dataclasses),
+never ORM instances bound to the leader's session.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from prometheus_client import Counter
+from sqlalchemy.sql import Executable
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Single-flight calls",
+    ["group", "result"],  # leader, shared
+)
+
+
+class SingleFlight:
+    """Per-process group of in-flight calls keyed by a hashable key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` for `key`, or wait for the call already in flight for it
+
+        If the leading caller is cancelled, a waiting caller takes over and runs `fn` itself.
+
+        Raises:
+            Exception: Whatever `fn` raised, for the leader and every waiter
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            SINGLEFLIGHT_CALLS.labels(group=self.name, result="shared").inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue  # Leader was cancelled, not us
+                raise
+
+        SINGLEFLIGHT_CALLS.labels(group=self.name, result="leader").inc()
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def statement_key(statement: Executable) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+    """Single-flight key for a SQLAlchemy statement: its SQL text plus bound parameters"""
+    compiled = statement.compile()
+    params = tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+    return str(compiled), params
@@ -0,0 +1,75 @@
+"""
+GraphQL response encoding with orjson
+
+The router encodes and parses with app.core.serialization, and temporal scalars are left as
+objects for orjson to encode. That includes subscription messages: the WebSocket handlers send
+through serialization too (Starlette's send_json uses the stdlib encoder, which can't encode
+datetime).
+"""
+
+import datetime
+from typing import Any, Union
+
+from strawberry.custom_scalar import scalar
+from strawberry.fastapi import GraphQLRouter
+from strawberry.fastapi.handlers import GraphQLTransportWSHandler, GraphQLWSHandler
+from strawberry.http import GraphQLHTTPResponse
+from strawberry.http.exceptions import HTTPException
+from strawberry.schema.types.base_scalars import Date, DateTime
+
+from app.core import serialization
+
+
+class FastGraphQLTransportWSHandler(GraphQLTransportWSHandler):
+    """graphql-transport-ws handler sending messages encoded with orjson"""
+
+    async def send_json(self, data: dict) -> None:
+        await self._ws.send_text(serialization.dumps_str(data))
+
+
+class FastGraphQLWSHandler(GraphQLWSHandler):
+    """Legacy graphql-ws handler sending messages encoded with orjson"""
+
+    async def send_json(self, data: Any) -> None:
+        await self._ws.send_text(serialization.dumps_str(data))
+
+
+class FastGraphQLRouter(GraphQLRouter):
+    """GraphQL router encoding and parsing with orjson"""
+
+    graphql_transport_ws_handler_class = FastGraphQLTransportWSHandler
+    graphql_ws_handler_class = FastGraphQLWSHandler
+
+    def encode_json(self, response_data: GraphQLHTTPResponse) -> bytes:
+        return serialization.dumps(response_data)
+
+    def parse_json(self, data: Union[str, bytes]) -> Any:
+        try:
+            return serialization.loads(data)
+        except serialization.JSONDecodeError as e:
+            raise HTTPException(400, "Unable to parse request body as JSON") from e
+
+
+def _passthrough(value: Any) -> Any:
+    return value
+
+
+# Leave temporal values as objects after execution and let orjson encode them; the wire format
+# matches Strawberry's default isoformat() output. Input parsing is unchanged.
+SCALAR_OVERRIDES = {
+    datetime.datetime: scalar(
+        datetime.datetime,
+        name="DateTime",
+        description="Date with time (isoformat)",
+        serialize=_passthrough,
+        parse_value=DateTime._scalar_definition.parse_value,
+    ),
+    datetime.date: scalar(
+        datetime.date,
+        name="Date",
+        description="Date (isoformat)",
+        serialize=_passthrough,
+        parse_value=Date._scalar_definition.parse_value,
+    ),
+}
+
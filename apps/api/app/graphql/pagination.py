@@ -0,0 +1,86 @@
+"""
+Cursor pagination helpers
+
+Cursors are opaque to clients: base64url-encoded JSON of the keyset position of the last item
+on a page (e.g. [created_at, id] for tasks, [rank, created_at, id] for search results).
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+from uuid import UUID
+
+import strawberry
+
+from app.core import serialization
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@strawberry.type
+class PageInfo:
+    """Pagination state of a connection"""
+
+    __slots__ = ("has_next_page", "end_cursor")
+
+    has_next_page: bool
+    end_cursor: Optional[str]
+
+
+def page_size(first: Optional[int]) -> int:
+    """
+    Validate a requested page size, applying the default and maximum
+
+    Raises:
+        ValueError: If `first` is not positive
+    """
+    if first is None:
+        return DEFAULT_PAGE_SIZE
+    if first <= 0:
+        raise ValueError("first must be a positive integer")
+    return min(first, MAX_PAGE_SIZE)
+
+
+def encode_cursor(*position: Any) -> str:
+    """Encode a keyset position, e.g. (created_at, id)"""
+    return base64.urlsafe_b64encode(serialization.dumps(position)).decode()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Cursor timestamp; must carry a UTC offset like those encode_cursor() produces"""
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        raise ValueError("Timestamp without UTC offset")
+    return timestamp
+
+
+def _decode(cursor: str, *parsers: Callable[[Any], Any]) -> Tuple[Any, ...]:
+    """Decode a cursor, converting each position value with the matching parser"""
+    try:
+        values = serialization.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(parsers):
+            raise ValueError(f"Expected {len(parsers)} values")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a (created_at, id) cursor produced by encode_cursor()
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return _decode(cursor, _parse_timestamp, UUID)
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, datetime, UUID]:
+    """
+    Decode a (rank, created_at, id) cursor produced by encode_cursor()
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return _decode(cursor, float, _parse_timestamp, UUID)
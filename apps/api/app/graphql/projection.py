@@ -0,0 +1,75 @@
+"""
+Selection-set column projection
+
+Turns the fields an operation selects on a Strawberry type into the table columns a resolver
+needs to fetch, so list queries read only what the client asked for.
+"""
+
+from typing import Iterable, List, Mapping, Sequence, Set
+
+from sqlalchemy.sql.elements import ColumnElement
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField, Selection
+
+
+def _collect(selections: Iterable[Selection], path: Sequence[str], names: Set[str]) -> None:
+    """Add the GraphQL field names selected at `path` (fragments are flattened)"""
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            _collect(selection.selections, path, names)
+        elif isinstance(selection, SelectedField):
+            if not path:
+                names.add(selection.name)
+            elif selection.name == path[0]:
+                _collect(selection.selections, path[1:], names)
+
+
+def selected_field_names(info: Info, path: Sequence[str] = ()) -> Set[str]:
+    """
+    GraphQL names of the fields selected below the current field
+
+    Args:
+        info: Resolver info
+        path: Field names leading to the object type, e.g. ("nodes",) for a connection
+
+    @skip/@include are not evaluated, so conditionally selected fields are included.
+    """
+    names: Set[str] = set()
+    for field in info.selected_fields:
+        _collect(field.selections, path, names)
+    return names
+
+
+def selected_columns(
+    info: Info,
+    type_: type,
+    columns: Mapping[str, ColumnElement],
+    path: Sequence[str] = (),
+    required: Iterable[str] = (),
+) -> List[ColumnElement]:
+    """
+    Columns to fetch for the fields of `type_` selected below the current field
+
+    Args:
+        info: Resolver info
+        type_: Strawberry type whose fields are selected (e.g. Task)
+        columns: Column per Python field name; fields not listed need no column
+        path: Field names leading to `type_`, e.g. ("nodes",) for a connection
+        required: Python field names fetched regardless of the selection (keys, cursors)
+
+    Returns:
+        Columns in `columns` order
+    """
+    name_converter = info.schema.config.name_converter
+    graphql_to_python = {
+        name_converter.get_graphql_name(field): field.python_name
+        for field in type_.__strawberry_definition__.fields
+    }
+
+    wanted = set(required)
+    for name in selected_field_names(info, path):
+        python_name = graphql_to_python.get(name)
+        if python_name is not None:
+            wanted.add(python_name)
+
+    return [column for name, column in columns.items() if name in wanted]
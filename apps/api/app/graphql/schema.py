@@ -1,21 +1,89 @@
 """Strawberry GraphQL schema"""
 
-from datetime import UTC, date, datetime
-from typing import List, Optional
+import asyncio
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncGenerator, List, Optional, Type, TypeVar
+from uuid import UUID
 
 import strawberry
+import structlog
 from strawberry.types import Info
 
+from app.auth.jwt import create_auth_tokens_for_user, verify_token, verify_token_safe
+from app.cache import (
+    delete_refresh_token,
+    get_refresh_token,
+    is_token_revoked,
+    revoke_refresh_token,
+)
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError, AuthorizationError
+from app.core.validation import validate_email, validate_password
+from app.database import AsyncSessionLocal
 from app.graphql.context import GraphQLContext
-
-# Phase 1: Basic GraphQL types and stub resolvers
-# Phase 2: Will add actual database queries
+from app.graphql.encoding import SCALAR_OVERRIDES
+from app.graphql.extensions import RateLimitExtension
+from app.graphql.pagination import (
+    PageInfo,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    page_size,
+)
+from app.graphql.projection import selected_columns
+from app.middleware.rate_limit import password_hashing
+from app.models.task import TaskPriority, TaskStatus
+from app.pubsub import pubsub_hub
+from app.services.task_events import decode_task_change, task_channel
+from app.services.task_service import (
+    CURSOR_COLUMNS,
+    SYNC_COLUMNS,
+    TASK_COLUMNS,
+    create_task,
+    delete_task,
+    get_task,
+    list_task_changes,
+    list_tasks,
+    search_cursor,
+    search_tasks,
+    task_cursor,
+    update_task,
+)
+from app.services.password_rehash import schedule_rehash
+from app.services.token_revocation import token_revocation
+from app.services.user_service import (
+    USER_LIST_COLUMNS,
+    create_user,
+    get_user_by_email,
+    get_user_by_id,
+    list_users,
+    verify_password_and_check_rehash,
+)
+
+logger = structlog.get_logger(__name__)
+
+MAX_SEARCH_QUERY_LENGTH = 256
+
+EnumT = TypeVar("EnumT", bound=Enum)
+
+
+def _parse_enum(enum: Type[EnumT], value: str, label: str) -> EnumT:
+    """Parse a task status/priority argument, listing the valid values on error"""
+    try:
+        return enum(value)
+    except ValueError:
+        valid = ", ".join(member.value for member in enum)
+        raise ValueError(f"{label} must be one of: {valid}") from None
 
 
 @strawberry.type
 class User:
     """User GraphQL type"""
 
+    # Output types are built per row; slots drop the per-instance __dict__
+    __slots__ = ("id", "email", "created_at")
+
     id: str
     email: str
     created_at: datetime
@@ -29,11 +97,37 @@ class User:
             created_at=user_model.created_at,
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Create User GraphQL type from a column-level select row (see user_service)
+
+        Rows may hold only the selected columns; unselected fields are never resolved.
+        """
+        values = row._mapping
+        return cls(
+            id=str(values["id"]),
+            email=values.get("email"),
+            created_at=values.get("created_at"),
+        )
+
 
 @strawberry.type
 class Task:
     """Task GraphQL type"""
 
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "status",
+        "priority",
+        "due_date",
+        "user_id",
+        "created_at",
+        "updated_at",
+    )
+
     id: str
     title: str
     description: Optional[str]
@@ -44,29 +138,202 @@ class Task:
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Create Task GraphQL type from a column-level select row (see task_service)
+
+        Rows may hold only the selected columns; unselected fields are never resolved.
+        """
+        return cls.from_mapping(row._mapping)
+
+    @classmethod
+    def from_mapping(cls, values):
+        """Create Task GraphQL type from column values by name (row mapping or change event)"""
+        status = values.get("status")
+        priority = values.get("priority")
+        user_id = values.get("user_id")
+        return cls(
+            id=str(values["id"]),
+            title=values.get("title"),
+            description=values.get("description"),
+            status=status.value if status is not None else None,
+            priority=priority.value if priority is not None else None,
+            due_date=values.get("due_date"),
+            user_id=str(user_id) if user_id is not None else None,
+            created_at=values.get("created_at"),
+            updated_at=values.get("updated_at"),
+        )
+
+
+@strawberry.type
+class TaskChange:
+    """A change to one of the user's tasks"""
+
+    __slots__ = ("op", "id", "task")
+
+    op: str  # created, updated or deleted
+    id: str
+    task: Optional[Task]  # State after the change; null for deletions
+
+
+@strawberry.type
+class TaskDelta:
+    """Changes to the user's tasks since a sync cursor"""
+
+    __slots__ = ("changed", "deleted_ids", "cursor", "has_more")
+
+    changed: List[Task]  # Created or updated, oldest change first
+    deleted_ids: List[str]
+    cursor: str  # Pass to the next tasksChangedSince call
+    has_more: bool  # More changes are waiting: call again with `cursor` right away
+
+
+@strawberry.type
+class TaskConnection:
+    """A page of tasks"""
+
+    __slots__ = ("nodes", "page_info")
+
+    nodes: List[Task]
+    page_info: PageInfo
+
 
 @strawberry.type
 class Query:
     """GraphQL Query type"""
 
     @strawberry.field
-    async def tasks(self) -> List[Task]:
-        """Get all tasks (Phase 1: returns empty list)"""
-        # Phase 1: Stub - returns empty list
-        # Phase 2: Will query database
-        return []
+    async def tasks(
+        self,
+        info: Info[GraphQLContext, None],
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        archived: bool = False,
+    ) -> TaskConnection:
+        """
+        Get the current user's tasks, newest first (requires authentication)
+
+        Completed tasks are archived after a while; `archived: true` lists those instead.
+        Reopening an archived task (status other than done) makes it active again.
+        """
+        user = await info.context.require_user()
+        limit = page_size(first)
+        position = decode_cursor(after) if after else None
+        columns = selected_columns(
+            info, Task, TASK_COLUMNS, path=("nodes",), required=CURSOR_COLUMNS
+        )
+
+        # One extra row tells whether there is a next page
+        db = await info.context.get_db()
+        rows = await list_tasks(
+            db, user.id, limit + 1, after=position, columns=columns, archived=archived
+        )
+        has_next_page = len(rows) > limit
+        rows = rows[:limit]
+
+        return TaskConnection(
+            nodes=[Task.from_row(row) for row in rows],
+            page_info=PageInfo(
+                has_next_page=has_next_page,
+                end_cursor=encode_cursor(*task_cursor(rows[-1])) if rows else None,
+            ),
+        )
 
     @strawberry.field
-    async def task(self, id: str) -> Optional[Task]:
-        """Get task by ID (Phase 1: returns None)"""
-        # Phase 1: Stub - returns None
-        # Phase 2: Will query database
+    async def tasks_changed_since(
+        self,
+        info: Info[GraphQLContext, None],
+        cursor: Optional[str] = None,
+        first: Optional[int] = None,
+    ) -> TaskDelta:
+        """
+        Delta sync of the current user's tasks (requires authentication)
+
+        Without a cursor, returns every task (paged); afterwards only the tasks created,
+        updated or deleted since the cursor.
+        """
+        user = await info.context.require_user()
+        limit = page_size(first)
+        position = decode_cursor(cursor) if cursor else None
+        columns = selected_columns(
+            info, Task, TASK_COLUMNS, path=("changed",), required=SYNC_COLUMNS
+        )
 
+        db = await info.context.get_db()
+        changes = await list_task_changes(db, user.id, limit, after=position, columns=columns)
+
+        return TaskDelta(
+            changed=[Task.from_row(row) for row in changes.changed],
+            deleted_ids=[str(task_id) for task_id in changes.deleted],
+            cursor=encode_cursor(*changes.cursor),
+            has_more=changes.has_more,
+        )
+
+    @strawberry.field
+    async def search_tasks(
+        self,
+        query: str,
+        info: Info[GraphQLContext, None],
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> TaskConnection:
+        """Search the current user's tasks, best match first (requires authentication)"""
+        query = query.strip()
+        if not query:
+            raise ValueError("query must not be empty")
+        if len(query) > MAX_SEARCH_QUERY_LENGTH:
+            raise ValueError(f"query must be at most {MAX_SEARCH_QUERY_LENGTH} characters")
+
+        user = await info.context.require_user()
+        limit = page_size(first)
+        position = decode_search_cursor(after) if after else None
+        columns = selected_columns(
+            info, Task, TASK_COLUMNS, path=("nodes",), required=CURSOR_COLUMNS
+        )
+
+        db = await info.context.get_db()
+        rows = await search_tasks(
+            db,
+            user.id,
+            query,
+            limit + 1,
+            after=position,
+            columns=columns,
+            archived=None if include_archived else False,
+        )
+        has_next_page = len(rows) > limit
+        rows = rows[:limit]
+
+        return TaskConnection(
+            nodes=[Task.from_row(row) for row in rows],
+            page_info=PageInfo(
+                has_next_page=has_next_page,
+                end_cursor=encode_cursor(*search_cursor(rows[-1])) if rows else None,
+            ),
+        )
+
+    @strawberry.field
+    async def task(self, id: str, info: Info[GraphQLContext, None]) -> Optional[Task]:
+        """Get one of the current user's tasks by ID (requires authentication)"""
         # Validate input
         if not id or not id.strip():
             return None
 
-        return None
+        try:
+            task_id = UUID(id)
+        except ValueError:
+            return None
+
+        user = await info.context.require_user()
+        db = await info.context.get_db()
+        columns = selected_columns(info, Task, TASK_COLUMNS, required=("id",))
+        row = await get_task(db, user.id, task_id, columns=columns)
+        if row is None:
+            return None
+
+        return Task.from_row(row)
 
     @strawberry.field
     async def me(self, info: Info[GraphQLContext, None]) -> Optional[User]:
@@ -79,10 +346,6 @@ class Query:
     @strawberry.field
     async def user(self, id: str, info: Info[GraphQLContext, None]) -> Optional[User]:
         """Get user by ID"""
-        from uuid import UUID
-
-        from app.services.user_service import get_user_by_id
-
         try:
             user_id = UUID(id)
         except ValueError:
@@ -98,20 +361,15 @@ class Query:
     @strawberry.field
     async def users(self, info: Info[GraphQLContext, None]) -> List[User]:
         """Get all users (requires authentication)"""
-        from sqlalchemy import select
-
-        from app.models.user import User as UserModel
-
         # Require authentication
         await info.context.require_user()
 
-        # Query database directly
+        # Concurrent identical queries share one round trip; rows go straight to GraphQL types
         db = await info.context.get_db()
-        stmt = select(UserModel).order_by(UserModel.created_at.desc())
-        result = await db.execute(stmt)
-        users = result.scalars().all()
+        columns = selected_columns(info, User, USER_LIST_COLUMNS, required=("id",))
+        rows = await list_users(db, columns=columns)
 
-        return [User.from_model(user) for user in users]
+        return [User.from_row(row) for row in rows]
 
 
 @strawberry.input
@@ -153,97 +411,95 @@ class Mutation:
     @strawberry.mutation
     async def create_task(
         self,
+        info: Info[GraphQLContext, None],
         title: str,
         description: Optional[str] = None,
         priority: str = "medium",
         due_date: Optional[date] = None,
     ) -> Task:
-        """Create a new task (Phase 1: returns stub)"""
-        # Phase 1: Stub - returns mock task
-        # Phase 2: Will create in database
-
+        """Create a task for the current user (requires authentication)"""
         # Validate input
         if not title or not title.strip():
             raise ValueError("Title is required")
 
-        # Validate priority
-        valid_priorities = ["low", "medium", "high"]
-        if priority not in valid_priorities:
-            raise ValueError(f"Priority must be one of: {', '.join(valid_priorities)}")
-
-        import uuid
-        from datetime import datetime
-
-        return Task(
-            id=str(uuid.uuid4()),
+        user = await info.context.require_user()
+        db = await info.context.get_db()
+        row = await create_task(
+            db,
+            user.id,
             title=title.strip(),
             description=description.strip() if description else None,
-            status="todo",
-            priority=priority,
+            priority=_parse_enum(TaskPriority, priority, "Priority"),
             due_date=due_date,
-            user_id=str(uuid.uuid4()),  # Phase 2: Will use authenticated user
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC),
         )
+        return Task.from_row(row)
 
     @strawberry.mutation
     async def update_task(
         self,
+        info: Info[GraphQLContext, None],
         id: str,
         title: Optional[str] = None,
         description: Optional[str] = None,
         status: Optional[str] = None,
         priority: Optional[str] = None,
     ) -> Optional[Task]:
-        """Update a task (Phase 1: returns None)"""
-        # Phase 1: Stub - returns None
-        # Phase 2: Will update in database
-
+        """Update one of the current user's tasks (requires authentication)"""
         # Validate input
         if not id or not id.strip():
             raise ValueError("Task ID is required")
 
-        # Validate status if provided
+        changes = {}
+        if title is not None:
+            if not title.strip():
+                raise ValueError("Title must not be empty")
+            changes["title"] = title.strip()
+        if description is not None:
+            changes["description"] = description.strip() or None
         if status is not None:
-            valid_statuses = ["todo", "in_progress", "done"]
-            if status not in valid_statuses:
-                raise ValueError(f"Status must be one of: {', '.join(valid_statuses)}")
-
-        # Validate priority if provided
+            changes["status"] = _parse_enum(TaskStatus, status, "Status")
         if priority is not None:
-            valid_priorities = ["low", "medium", "high"]
-            if priority not in valid_priorities:
-                raise ValueError(f"Priority must be one of: {', '.join(valid_priorities)}")
+            changes["priority"] = _parse_enum(TaskPriority, priority, "Priority")
+
+        try:
+            task_id = UUID(id)
+        except ValueError:
+            return None
 
-        return None
+        user = await info.context.require_user()
+        db = await info.context.get_db()
+        row = await update_task(db, user.id, task_id, **changes)
+        return Task.from_row(row) if row is not None else None
 
     @strawberry.mutation
-    async def delete_task(self, id: str) -> bool:
-        """Delete a task (Phase 1: returns False)"""
-        # Phase 1: Stub - returns False
-        # Phase 2: Will delete from database
-
+    async def delete_task(self, info: Info[GraphQLContext, None], id: str) -> bool:
+        """Delete one of the current user's tasks (requires authentication)"""
         # Validate input
         if not id or not id.strip():
             raise ValueError("Task ID is required")
 
-        return False
+        try:
+            task_id = UUID(id)
+        except ValueError:
+            return False
 
-    @strawberry.mutation
+        user = await info.context.require_user()
+        db = await info.context.get_db()
+        return await delete_task(db, user.id, task_id)
+
+    @strawberry.mutation(
+        extensions=[
+            RateLimitExtension(
+                "register", settings.RATE_LIMIT_REGISTER, concurrency=password_hashing
+            )
+        ]
+    )
     async def register(
         self,
         input: RegisterInput,
         info: Info[GraphQLContext, None],
     ) -> AuthPayload:
         """Register a new user"""
-        import structlog
-
-        from app.auth.jwt import create_auth_tokens_for_user
-        from app.core.validation import validate_email, validate_password
-        from app.services.user_service import create_user
-
-        logger = structlog.get_logger(__name__)
-
         # Validate email format
         if not validate_email(input.email):
             logger.warning("Registration attempt with invalid email", email=input.email)
@@ -270,7 +526,6 @@ class Mutation:
             raise
 
         # Create tokens and store refresh token
-
         access_token, refresh_token = await create_auth_tokens_for_user(str(user.id), user.email)
 
         return AuthPayload(
@@ -279,39 +534,39 @@ class Mutation:
             user=User.from_model(user),
         )
 
-    @strawberry.mutation
+    @strawberry.mutation(
+        extensions=[
+            RateLimitExtension("login", settings.RATE_LIMIT_LOGIN, concurrency=password_hashing)
+        ]
+    )
     async def login(
         self,
         input: LoginInput,
         info: Info[GraphQLContext, None],
     ) -> AuthPayload:
         """Login user and return JWT tokens"""
-        import structlog
-
-        from app.core.exceptions import AuthenticationError
-        from app.services.user_service import get_user_by_email, verify_password
-
-        logger = structlog.get_logger(__name__)
-
         # Get user from database
         db = await info.context.get_db()
-        user = await get_user_by_email(db, input.email)
+        user = await get_user_by_email(db, input.email, include_password_hash=True)
         if not user:
             logger.warning("Login attempt with non-existent email", email=input.email)
             raise AuthenticationError("Incorrect email or password")
 
         # Verify password
-        if not verify_password(input.password, user.password_hash):
+        verified, needs_rehash = verify_password_and_check_rehash(
+            input.password, user.password_hash
+        )
+        if not verified:
             logger.warning(
                 "Login attempt with incorrect password", email=input.email, user_id=str(user.id)
             )
             raise AuthenticationError("Incorrect email or password")
 
         logger.info("User logged in successfully", user_id=str(user.id), email=input.email)
+        if needs_rehash:
+            schedule_rehash(user.id, user.password_hash, input.password)
 
         # Create tokens and store refresh token
-        from app.auth.jwt import create_auth_tokens_for_user
-
         access_token, refresh_token = await create_auth_tokens_for_user(str(user.id), user.email)
 
         return AuthPayload(
@@ -320,29 +575,13 @@ class Mutation:
             user=User.from_model(user),
         )
 
-    @strawberry.mutation
+    @strawberry.mutation(extensions=[RateLimitExtension("refresh", settings.RATE_LIMIT_REFRESH)])
     async def refresh_token(
         self,
         input: RefreshTokenInput,
         info: Info[GraphQLContext, None],
     ) -> AuthPayload:
         """Refresh access token with rotation"""
-        from uuid import UUID
-
-        import structlog
-
-        from app.auth.jwt import verify_token
-        from app.cache import delete_refresh_token, get_refresh_token, is_token_revoked
-        from app.core.exceptions import AuthenticationError
-        from app.services.user_service import get_user_by_id
-
-        logger = structlog.get_logger(__name__)
-
-        # Rate limiting: 10 attempts per minute per IP
-        # Note: GraphQL doesn't have direct access to request.app.state
-        # We'll implement rate limiting via Redis in the cache layer if needed
-        # For now, we rely on the REST endpoint rate limiting
-
         # Verify refresh token
         if not input.refresh_token:
             logger.warning("Refresh token mutation called without token")
@@ -357,13 +596,16 @@ class Mutation:
         if not user_id_str or not email:
             raise AuthenticationError("Invalid token payload")
 
-        # Check if token is revoked
-        if await is_token_revoked(user_id_str, input.refresh_token):
+        # Revocation check and token lookup share one Redis round trip (auto-pipelined)
+        revoked, stored_token = await asyncio.gather(
+            is_token_revoked(user_id_str, input.refresh_token),
+            get_refresh_token(user_id_str, input.refresh_token),
+        )
+        if revoked:
             logger.warning("Refresh token revoked", user_id=user_id_str)
             raise AuthenticationError("Token has been revoked")
 
         # Verify token exists in Redis
-        stored_token = await get_refresh_token(user_id_str, input.refresh_token)
         if not stored_token:
             logger.warning("Invalid refresh token", user_id=user_id_str)
             raise AuthenticationError("Invalid refresh token")
@@ -382,8 +624,6 @@ class Mutation:
         logger.info("Token refreshed successfully", user_id=user_id_str, email=email)
 
         # Create new tokens and store refresh token
-        from app.auth.jwt import create_auth_tokens_for_user
-
         access_token, new_refresh_token = await create_auth_tokens_for_user(user_id_str, email)
 
         return AuthPayload(
@@ -398,10 +638,10 @@ class Mutation:
         input: RefreshTokenInput,
         info: Info[GraphQLContext, None],
     ) -> bool:
-        """Logout user and revoke refresh token"""
-        from app.auth.jwt import verify_token_safe
-        from app.cache import revoke_refresh_token
-        from app.core.config import settings
+        """Logout user and revoke refresh token (and the access token, if authenticated)"""
+        access_payload = info.context.get_token_payload()
+        if access_payload:
+            await token_revocation.revoke_token(access_payload)
 
         if not input.refresh_token:
             return False
@@ -426,5 +666,57 @@ class Mutation:
         return False
 
 
+@strawberry.type
+class Subscription:
+    """GraphQL Subscription type (WebSocket)"""
+
+    @strawberry.subscription
+    async def task_changed(
+        self, info: Info[GraphQLContext, None], user_id: str
+    ) -> AsyncGenerator[TaskChange, None]:
+        """
+        Changes to a user's tasks as they are committed (requires authentication as that user)
+
+        Completes when changes may have been missed (slow client, lost Redis connection);
+        clients should refetch and subscribe again.
+        """
+        # Checked before returning the stream so failures are reported as GraphQL errors
+        principal = info.context.principal
+        if principal is None:
+            raise AuthenticationError("Authentication required")
+        if str(principal.user_id) != user_id:
+            raise AuthorizationError("Cannot subscribe to another user's tasks")
+
+        # A session of its own, closed right away: the context's session is shared with the
+        # other operations on this connection, and the stream must not hold a connection
+        async with AsyncSessionLocal() as db:
+            user = await get_user_by_id(db, principal.user_id)
+        if user is None:
+            raise AuthenticationError("Authentication required")
+        return _task_changes(user.id)
+
+
+async def _task_changes(user_id: UUID) -> AsyncGenerator[TaskChange, None]:
+    """Stream a user's task change events from the shared pub/sub listener"""
+    async with pubsub_hub.subscribe(task_channel(user_id)) as subscription:
+        async for data in subscription:
+            try:
+                change = decode_task_change(data)
+            except ValueError as e:
+                logger.warning("Skipping task change event", error=str(e))
+                continue
+            task = change["task"]
+            yield TaskChange(
+                op=change["op"],
+                id=str(change["id"]),
+                task=Task.from_mapping(task) if task is not None else None,
+            )
+
+
 # Create schema
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    subscription=Subscription,
+    scalar_overrides=SCALAR_OVERRIDES,
+)
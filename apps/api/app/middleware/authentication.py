@@ -0,0 +1,104 @@
+"""
+Request authentication
+
+AuthenticationMiddleware reads the access token once per HTTP request or WebSocket handshake,
+from the `Authorization: Bearer` header or else the access token cookie set by /auth/login,
+verifies it (signature, expiry, type, revocation) and stores the result in
+`request.state.principal`. The GraphQL context and REST dependencies read it from there
+instead of verifying the token again.
+
+The cookie is only honoured without an Origin header or from an allowed (CORS) origin, so a
+page on another site can't act with a visitor's session.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+import structlog
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.auth.jwt import verify_token_safe
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError
+from app.services.token_revocation import token_revocation
+
+logger = structlog.get_logger(__name__)
+
+ACCESS_TOKEN_COOKIE = "taskflow_access_token"
+PRINCIPAL_STATE_KEY = "principal"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user of a request, from a verified access token"""
+
+    user_id: UUID
+    claims: dict  # Verified token payload
+
+
+def access_token(connection: HTTPConnection) -> Optional[str]:
+    """Access token presented by the client: Bearer header, or cookie from an allowed origin"""
+    scheme, _, credentials = connection.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
+
+    token = connection.cookies.get(ACCESS_TOKEN_COOKIE)
+    if token:
+        origin = connection.headers.get("Origin")
+        if origin is not None and origin not in settings.CORS_ORIGINS:
+            logger.debug("Access token cookie from disallowed origin ignored", origin=origin)
+            return None
+    return token
+
+
+async def authenticate(connection: HTTPConnection) -> Optional[Principal]:
+    """Verify the request's access token (None when missing, invalid or revoked)"""
+    token = access_token(connection)
+    if not token:
+        return None
+
+    try:
+        claims = verify_token_safe(token)
+        user_id = UUID(claims["sub"])
+    except (AuthenticationError, ValueError) as e:
+        logger.debug("Authentication error", error=str(e))
+        return None
+
+    try:
+        if await token_revocation.is_revoked(claims.get("jti")):
+            logger.debug("Revoked access token", user_id=str(user_id))
+            return None
+    except Exception as e:
+        # Can't tell whether the token was revoked: treat the request as anonymous
+        logger.warning("Token revocation check failed", error=str(e))
+        return None
+
+    return Principal(user_id=user_id, claims=claims)
+
+
+def get_principal(connection: HTTPConnection) -> Optional[Principal]:
+    """
+    Principal stored by AuthenticationMiddleware for this request (None: anonymous)
+
+    Raises:
+        RuntimeError: AuthenticationMiddleware is not installed
+    """
+    state = connection.scope.get("state", {})
+    if PRINCIPAL_STATE_KEY not in state:
+        raise RuntimeError("AuthenticationMiddleware is not installed")
+    return state[PRINCIPAL_STATE_KEY]
+
+
+class AuthenticationMiddleware:
+    """Authenticates every HTTP request and WebSocket handshake once (pure ASGI)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            principal = await authenticate(HTTPConnection(scope))
+            scope.setdefault("state", {})[PRINCIPAL_STATE_KEY] = principal
+        await self.app(scope, receive, send)
@@ -1,18 +1,339 @@
-"""Rate limiting middleware"""
+"""
+Rate limiting
 
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import FastAPI
+Limits are enforced with GCRA (generic cell rate algorithm) in a single Lua script per check,
+so counters are shared by every uvicorn worker and replica through Redis. A per-process token
+bucket runs first: once this process alone has used up a key's allowance (or Redis has told us
+the key is blocked), further hits are rejected locally without a Redis round trip.
+"""
 
-# Create limiter
-limiter = Limiter(key_func=get_remote_address)
+import ipaddress
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cache
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+import structlog
+from fastapi import FastAPI, HTTPException, Request, status
+from prometheus_client import Counter
+
+from app.cache import RATE_LIMIT_POOL, get_redis
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+RATE_LIMIT_PREFIX = "rate_limit:"
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate limit decisions",
+    ["scope", "decision"],
+)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+# KEYS[1]: limiter key
+# ARGV[1]: emission interval (ms), ARGV[2]: burst (requests allowed per period)
+# Returns {allowed, retry_after_ms, remaining}
+# Uses the Redis clock so replicas with skewed clocks agree.
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tolerance = interval * burst
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - tolerance
+if now < allow_at then
+    return {0, allow_at - now, 0}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, 0, math.floor((tolerance - (new_tat - now)) / interval)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A limit of `count` requests per `period` seconds"""
+
+    count: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """
+        Parse a limit string such as "5/minute", "100/hour" or "10/30seconds"
+
+        Raises:
+            ValueError: If the string is not a valid limit
+        """
+        match = _LIMIT_PATTERN.match(value)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+
+        count, multiplier, unit = match.groups()
+        period = _PERIODS[unit] * (int(multiplier) if multiplier else 1)
+        if int(count) <= 0 or period <= 0:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+
+        return cls(count=int(count), period=float(period))
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds between requests at the sustained rate"""
+        return self.period / self.count
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a rate limit check"""
+
+    allowed: bool
+    retry_after: float = 0.0
+    remaining: Optional[int] = None
+
+
+class LocalTokenBucket:
+    """
+    Per-process token buckets (bounded LRU of keys)
+
+    Each bucket holds the full allowance, so an empty local bucket means the key is over the
+    limit globally as well and Redis doesn't need to be asked.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        # key -> [tokens, updated_at, blocked_until]
+        self._buckets: "OrderedDict[str, list[float]]" = OrderedDict()
+
+    def try_acquire(self, key: str, limit: RateLimit, now: float) -> Optional[float]:
+        """Take a token, returning None if allowed or the seconds to wait if not"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(limit.count), now, 0.0]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        tokens, updated_at, blocked_until = bucket
+        if now < blocked_until:
+            return blocked_until - now
+
+        tokens = min(float(limit.count), tokens + (now - updated_at) / limit.emission_interval)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            return (1 - tokens) * limit.emission_interval
+
+        bucket[0] = tokens - 1
+        return None
+
+    def block(self, key: str, until: float) -> None:
+        """Reject the key locally until `until` (monotonic seconds)"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[2] = until
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class RateLimiter:
+    """Distributed GCRA rate limiter with a local pre-check"""
+
+    def __init__(self, prefix: str = RATE_LIMIT_PREFIX, max_local_keys: int = 10000):
+        self.prefix = prefix
+        self.local = LocalTokenBucket(max_local_keys)
+        self._script = None
+        self._script_client = None
+
+    async def _get_script(self):
+        redis_client = await get_redis(RATE_LIMIT_POOL)
+        if self._script is None or self._script_client is not redis_client:
+            self._script = redis_client.register_script(GCRA_SCRIPT)
+            self._script_client = redis_client
+        return self._script
+
+    async def hit(self, scope: str, identity: str, limit: RateLimit) -> RateLimitResult:
+        """
+        Record a hit for `identity` within `scope` and decide whether it is allowed
+
+        Fails open (allows the request) if Redis is unavailable; the local bucket still
+        bounds each process in that case.
+        """
+        key = f"{self.prefix}{scope}:{identity}"
+        now = time.monotonic()
+
+        retry_after = self.local.try_acquire(key, limit, now)
+        if retry_after is not None:
+            RATE_LIMIT_DECISIONS.labels(scope=scope, decision="denied_local").inc()
+            return RateLimitResult(allowed=False, retry_after=retry_after, remaining=0)
+
+        try:
+            script = await self._get_script()
+            allowed, retry_after_ms, remaining = await script(
+                keys=[key],
+                args=[max(1, round(limit.emission_interval * 1000)), limit.count],
+            )
+        except Exception as e:
+            logger.warning("Rate limit check failed, allowing request", scope=scope, error=str(e))
+            RATE_LIMIT_DECISIONS.labels(scope=scope, decision="error").inc()
+            return RateLimitResult(allowed=True)
+
+        if not allowed:
+            retry_after = int(retry_after_ms) / 1000
+            self.local.block(key, now + retry_after)
+            RATE_LIMIT_DECISIONS.labels(scope=scope, decision="denied").inc()
+            return RateLimitResult(allowed=False, retry_after=retry_after, remaining=0)
+
+        RATE_LIMIT_DECISIONS.labels(scope=scope, decision="allowed").inc()
+        return RateLimitResult(allowed=True, remaining=int(remaining))
+
+
+class ConcurrencyLimiter:
+    """
+    Per-process cap on concurrent executions of an expensive operation
+
+    Never waits: callers over the cap are rejected immediately, before doing any work.
+    """
+
+    def __init__(self, name: str, max_concurrent: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.max_concurrent:
+            RATE_LIMIT_DECISIONS.labels(scope=self.name, decision="concurrency").inc()
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+
+
+# Shared limiter (one per process)
+limiter = RateLimiter()
+
+# Argon2 hashing/verification is CPU and memory heavy; cap it per process
+password_hashing = ConcurrencyLimiter("password_hashing", settings.PASSWORD_HASH_MAX_CONCURRENCY)
+
+
+@cache
+def trusted_proxies() -> Tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    """
+    Parsed TRUSTED_PROXIES
+
+    Raises:
+        ValueError: If an entry is not an IP address or network
+    """
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    """Whether `address` is one of TRUSTED_PROXIES (False for anything that isn't an IP)"""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies())
+
+
+def client_ip(request: Request) -> str:
+    """
+    Rate limit key: the client's address
+
+    Behind a trusted proxy, the client is the last X-Forwarded-For address not itself a
+    trusted proxy (entries left of it can be forged by the client). Otherwise it is the peer.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(peer):
+        return peer
+
+    forwarded = [
+        address.strip()
+        for header in request.headers.getlist("X-Forwarded-For")
+        for address in header.split(",")
+        if address.strip()
+    ]
+    for address in reversed(forwarded):
+        if not is_trusted_proxy(address):
+            return address
+    # Only proxies in the chain: the leftmost one is the closest to the client
+    return forwarded[0] if forwarded else peer
+
+
+def rate_limit(
+    scope: str,
+    limit: str,
+    key_func: Callable[[Request], str] = client_ip,
+) -> Callable:
+    """
+    Create a FastAPI dependency enforcing `limit` (e.g. "5/minute") per key within `scope`
+
+    Usage:
+        @router.post("/login", dependencies=[Depends(rate_limit("login", "5/minute"))])
+
+    Raises:
+        ValueError: If `limit` is not a valid limit string
+    """
+    parsed = RateLimit.parse(limit)
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        result = await limiter.hit(scope, key_func(request), parsed)
+        if not result.allowed:
+            logger.warning("Rate limit exceeded", scope=scope, path=request.url.path)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))},
+            )
+
+    return dependency
+
+
+def concurrency_limit(concurrency_limiter: ConcurrencyLimiter) -> Callable:
+    """
+    Create a FastAPI dependency holding a slot of `concurrency_limiter` for the request
+
+    Usage:
+        @router.post("/login", dependencies=[Depends(concurrency_limit(password_hashing))])
+    """
+
+    async def dependency() -> AsyncIterator[None]:
+        if not concurrency_limiter.try_acquire():
+            logger.warning("Concurrency limit reached", limiter=concurrency_limiter.name)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            yield
+        finally:
+            concurrency_limiter.release()
+
+    return dependency
 
 
 def setup_rate_limiting(app: FastAPI) -> None:
-    """Setup rate limiting middleware"""
+    """Setup rate limiting"""
+    # Limits are applied per route with the rate_limit() dependency
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    # Rate limits are applied per route using @limiter.limit decorator
-    # Phase 1: Basic setup
-    # Phase 2: Will add specific limits per route
@@ -1,6 +1,6 @@
 """Database models"""
 
-from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.task import Task, TaskPriority, TaskStatus, TaskTombstone
 from app.models.user import User
 
-__all__ = ["User", "Task", "TaskStatus", "TaskPriority"]
+__all__ = ["User", "Task", "TaskStatus", "TaskPriority", "TaskTombstone"]
@@ -2,13 +2,30 @@
 
 from uuid import uuid4
 
-from sqlalchemy import Column, String, Text, Date, ForeignKey, Enum, DateTime, Index, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    false,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 import enum
 
 from app.database import Base
 
 
+# Text search configuration of Task.search_vector; queries must use the same one
+SEARCH_CONFIG = "english"
+
+
 class TaskStatus(str, enum.Enum):
     """Task status enum"""
 
@@ -25,6 +42,11 @@ class TaskPriority(str, enum.Enum):
     HIGH = "high"
 
 
+def enum_values(enum_class: type[enum.Enum]) -> list[str]:
+    """Database labels of an enum: the member values, as created by migration 001"""
+    return [member.value for member in enum_class]
+
+
 class Task(Base):
     """Task model"""
 
@@ -33,8 +55,18 @@ class Task(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.TODO, index=True)
-    priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.MEDIUM, index=True)
+    status = Column(
+        Enum(TaskStatus, name="taskstatus", values_callable=enum_values),
+        nullable=False,
+        default=TaskStatus.TODO,
+        index=True,
+    )
+    priority = Column(
+        Enum(TaskPriority, name="taskpriority", values_callable=enum_values),
+        nullable=False,
+        default=TaskPriority.MEDIUM,
+        index=True,
+    )
     due_date = Column(Date, nullable=True, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(
@@ -43,10 +75,42 @@ class Task(Base):
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+    # Partition key: completed tasks moved out of the active set by the worker (tasks.archival)
+    # live in the tasks_archived partition, the rest in tasks_active (see 004_task_archive).
+    # Part of the primary key, as Postgres requires: `id` is only unique per partition, so ids
+    # must come from the app (uuid4 default above), never from clients
+    archived = Column(
+        Boolean, primary_key=True, nullable=False, default=False, server_default=false()
+    )
+    # Full-text document (title weighted above description), generated by Postgres
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    )
 
     # Composite indexes for common queries
     __table_args__ = (
         Index("idx_user_status", "user_id", "status"),
         Index("idx_user_due_date", "user_id", "due_date"),
         Index("idx_user_created", "user_id", "created_at"),
+        Index("idx_user_updated", "user_id", "updated_at", "id"),
+        Index("idx_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "LIST (archived)"},
     )
+
+
+class TaskTombstone(Base):
+    """Deleted task, kept so delta sync can report the deletion"""
+
+    __tablename__ = "task_tombstones"
+
+    task_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (Index("idx_tombstone_user_deleted", "user_id", "deleted_at", "task_id"),)
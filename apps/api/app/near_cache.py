@@ -0,0 +1,192 @@
+"""
+In-process near cache for hot Redis keys, kept coherent with server-assisted invalidation
+
+Redis client-side caching (CLIENT TRACKING) runs in broadcast mode for the configured key
+prefixes: whenever any client modifies a matching key, Redis pushes an invalidation message to
+this process and the local copy is dropped. Invalidations arrive on a dedicated connection
+subscribed to __redis__:invalidate (tracking redirected to itself), which works with the RESP2
+connections used by the shared pool.
+
+Reads fall back to Redis whenever the invalidation channel is down, so a broken channel costs
+latency, never correctness. Entries also expire after a TTL as a safety net.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+import structlog
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+NEAR_CACHE_REQUESTS = Counter(
+    "redis_near_cache_requests_total",
+    "Near cache lookups",
+    ["result"],  # hit, miss, bypass
+)
+NEAR_CACHE_INVALIDATIONS = Counter(
+    "redis_near_cache_invalidations_total",
+    "Keys invalidated by Redis (flush counts as one)",
+)
+NEAR_CACHE_ENTRIES = Gauge("redis_near_cache_entries", "Entries held in the near cache")
+
+_MISSING = object()
+
+
+class NearCache:
+    """Bounded LRU of Redis reads invalidated by CLIENT TRACKING (BCAST) push messages"""
+
+    def __init__(self, prefixes: Iterable[str], max_entries: int, ttl_seconds: float):
+        self.prefixes = tuple(prefixes)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.ready = False
+
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # Loads in progress per key, and keys invalidated while a load was in progress
+        self._inflight: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+
+        self._client: Optional[aioredis.Redis] = None
+        self._listener: Optional[asyncio.Task] = None
+
+        NEAR_CACHE_ENTRIES.set_function(lambda: len(self._entries))
+
+    def _matches(self, key: str) -> bool:
+        return key.startswith(self.prefixes)
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, or call `loader` to read it from Redis
+
+        `loader` must read exactly `key` so that invalidations for it apply to the result.
+        """
+        if not self.ready or not self._matches(key):
+            NEAR_CACHE_REQUESTS.labels(result="bypass").inc()
+            return await loader()
+
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING:
+            value, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                NEAR_CACHE_REQUESTS.labels(result="hit").inc()
+                return value
+            del self._entries[key]
+
+        NEAR_CACHE_REQUESTS.labels(result="miss").inc()
+        self._inflight[key] = self._inflight.get(key, 0) + 1
+        try:
+            value = await loader()
+            # Don't cache a value an invalidation may have overtaken, or one read while the
+            # channel was down
+            if self.ready and key not in self._dirty:
+                self._store(key, value)
+            return value
+        finally:
+            remaining = self._inflight[key] - 1
+            if remaining:
+                self._inflight[key] = remaining
+            else:
+                del self._inflight[key]
+                self._dirty.discard(key)
+
+    def _store(self, key: str, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Optional[Iterable[str]]) -> None:
+        """Drop keys from the cache (None drops everything, e.g. on FLUSHDB)"""
+        if keys is None:
+            self._entries.clear()
+            self._dirty.update(self._inflight)
+            NEAR_CACHE_INVALIDATIONS.inc()
+            return
+
+        for key in keys:
+            self._entries.pop(key, None)
+            if key in self._inflight:
+                self._dirty.add(key)
+            NEAR_CACHE_INVALIDATIONS.inc()
+
+    async def _connect(self) -> aioredis.Redis:
+        client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            single_connection_client=True,
+        )
+        client_id = await client.client_id()
+        prefix_args = []
+        for prefix in self.prefixes:
+            prefix_args.extend(["PREFIX", prefix])
+        await client.execute_command(
+            "CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefix_args
+        )
+
+        connection = client.connection
+        await connection.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+        await connection.read_response()  # subscribe confirmation
+        return client
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                self._client = await self._connect()
+                self.ready = True
+                backoff = 0.5
+                logger.info("Redis near cache tracking enabled", prefixes=self.prefixes)
+
+                connection = self._client.connection
+                while True:
+                    message = await connection.read_response()
+                    # ["message", "__redis__:invalidate", [keys] | None]
+                    if isinstance(message, list) and len(message) == 3:
+                        if message[0] == "message" and message[1] == INVALIDATION_CHANNEL:
+                            self.invalidate(message[2])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Redis near cache invalidation channel lost", error=str(e))
+            finally:
+                # Without the channel nothing can be trusted: stop serving and start empty
+                self.ready = False
+                self.invalidate(None)
+                await self._close_client()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _close_client(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+
+    async def start(self) -> None:
+        """Start the invalidation listener (no-op if already running)"""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener and drop all entries"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.ready = False
+        self.invalidate(None)
@@ -0,0 +1,259 @@
+"""
+Shared Redis pub/sub subscriber
+
+Each process holds a single subscriber connection for every channel it listens on (user cache
+invalidations, task change streams of connected clients) and fans messages out in-process, so
+thousands of open subscriptions cost one Redis connection rather than one each.
+
+Handlers are long-lived callbacks run inline for every message. Subscriptions are per-consumer
+bounded queues: a subscription ends when its consumer falls too far behind or when the Redis
+connection is lost, since messages may have been missed; consumers resubscribe and refetch.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+import structlog
+from prometheus_client import Counter, Gauge
+from redis.asyncio.client import PubSub
+
+from app.cache import DEFAULT_POOL, get_pipeline
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+PUBSUB_SUBSCRIPTIONS = Gauge("pubsub_subscriptions", "Open in-process pub/sub subscriptions")
+PUBSUB_SUBSCRIPTIONS_ENDED = Counter(
+    "pubsub_subscriptions_ended_total",
+    "Subscriptions ended because messages may have been missed",
+    ["reason"],  # overflow, disconnected
+)
+
+Handler = Callable[[str], None]
+StateHandler = Callable[[bool], None]
+
+# Queued in place of a message to end a subscription
+_ENDED = object()
+
+
+class Subscription:
+    """Messages published to one channel, for one consumer (async iterator)"""
+
+    def __init__(self, channel: str, max_queued: int):
+        self.channel = channel
+        self._queue: asyncio.Queue = asyncio.Queue(max_queued + 1)  # Room for _ENDED
+        self._ended = False
+
+    def _deliver(self, data: str) -> None:
+        if self._ended:
+            return
+        if self._queue.qsize() >= self._queue.maxsize - 1:
+            self._end("overflow")
+            return
+        self._queue.put_nowait(data)
+
+    def _end(self, reason: str) -> None:
+        if not self._ended:
+            self._ended = True
+            PUBSUB_SUBSCRIPTIONS_ENDED.labels(reason=reason).inc()
+            self._queue.put_nowait(_ENDED)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> str:
+        data = await self._queue.get()
+        if data is _ENDED:
+            raise StopAsyncIteration
+        return data
+
+
+class PubSubHub:
+    """One Redis subscriber connection shared by all in-process listeners"""
+
+    def __init__(self) -> None:
+        self.connected = False
+        self._handlers: Dict[str, List[Tuple[Handler, Optional[StateHandler]]]] = {}
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._pubsub: Optional[PubSub] = None
+        self._subscribed: Set[str] = set()  # Channels SUBSCRIBEd on the current connection
+        self._lock = asyncio.Lock()  # Serializes (un)subscribes and reconnects
+        self._listener: Optional[asyncio.Task] = None
+
+    def create_client(self) -> aioredis.Redis:
+        """Client for the subscriber connection (outside the command pools)"""
+        return aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        )
+
+    def _wanted(self, channel: str) -> bool:
+        return bool(self._handlers.get(channel) or self._subscriptions.get(channel))
+
+    async def _sync(self, channel: str) -> None:
+        """Subscribe to or unsubscribe from `channel` to match local interest"""
+        async with self._lock:
+            if self._pubsub is None:
+                return  # Done by _connect()
+            try:
+                if self._wanted(channel) and channel not in self._subscribed:
+                    await self._pubsub.subscribe(channel)
+                    self._subscribed.add(channel)
+                elif not self._wanted(channel) and channel in self._subscribed:
+                    self._subscribed.discard(channel)
+                    await self._pubsub.unsubscribe(channel)
+            except Exception as e:
+                # The listener notices the broken connection and resubscribes everything
+                logger.warning("Pub/sub subscription change failed", channel=channel, error=str(e))
+
+    async def add_handler(
+        self, channel: str, handler: Handler, on_state: Optional[StateHandler] = None
+    ) -> None:
+        """
+        Call `handler` with the data of every message published to `channel`
+
+        Args:
+            channel: Redis channel
+            handler: Called inline on the event loop; must not block
+            on_state: Called with True once messages are being received and with False when
+                the connection is lost (messages may be missed until it is called with True)
+        """
+        self._handlers.setdefault(channel, []).append((handler, on_state))
+        await self._sync(channel)
+        if on_state is not None and self.connected and channel in self._subscribed:
+            on_state(True)
+
+    async def remove_handler(self, channel: str, handler: Handler) -> None:
+        """Stop calling a handler registered with add_handler()"""
+        handlers = [entry for entry in self._handlers.get(channel, []) if entry[0] != handler]
+        if handlers:
+            self._handlers[channel] = handlers
+        else:
+            self._handlers.pop(channel, None)
+        await self._sync(channel)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, channel: str, max_queued: Optional[int] = None
+    ) -> AsyncIterator[Subscription]:
+        """
+        Receive messages published to `channel` while the context is open
+
+        Args:
+            channel: Redis channel
+            max_queued: Undelivered messages after which the subscription ends
+                (default: PUBSUB_SUBSCRIPTION_MAX_QUEUED)
+        """
+        subscription = Subscription(
+            channel, max_queued or settings.PUBSUB_SUBSCRIPTION_MAX_QUEUED
+        )
+        self._subscriptions.setdefault(channel, set()).add(subscription)
+        PUBSUB_SUBSCRIPTIONS.inc()
+        try:
+            await self._sync(channel)
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions.get(channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[channel]
+            PUBSUB_SUBSCRIPTIONS.dec()
+            await asyncio.shield(self._sync(channel))
+
+    async def publish(self, channel: str, data: bytes | str, pool: str = DEFAULT_POOL) -> None:
+        """Publish a message through a command pool (raises on Redis errors)"""
+        redis_client = await get_pipeline(pool)
+        await redis_client.execute_command("PUBLISH", channel, data)
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        for handler, _ in list(self._handlers.get(channel, ())):
+            try:
+                handler(data)
+            except Exception as e:
+                logger.warning("Pub/sub handler failed", channel=channel, error=str(e))
+        for subscription in list(self._subscriptions.get(channel, ())):
+            subscription._deliver(data)
+
+    def _set_connected(self, connected: bool) -> None:
+        self.connected = connected
+        for handlers in list(self._handlers.values()):
+            for _, on_state in handlers:
+                if on_state is not None:
+                    on_state(connected)
+        if not connected:
+            for subscriptions in self._subscriptions.values():
+                for subscription in subscriptions:
+                    subscription._end("disconnected")
+
+    async def _connect(self, pubsub: PubSub) -> None:
+        async with self._lock:
+            await pubsub.connect()
+            channels = [channel for channel in self._handlers if self._wanted(channel)]
+            channels += [channel for channel in self._subscriptions if channel not in channels]
+            if channels:
+                await pubsub.subscribe(*channels)
+            self._pubsub = pubsub
+            self._subscribed = set(channels)
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            client = self.create_client()
+            pubsub = client.pubsub()
+            try:
+                await self._connect(pubsub)
+                self._set_connected(True)
+                backoff = 0.5
+                logger.info("Pub/sub listener connected", channels=len(self._subscribed))
+
+                listener = asyncio.current_task()
+                while True:
+                    # The timeout lets check_health() ping an idle connection
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+                    )
+                    if listener.cancelling():
+                        # A cancel that landed during the read timeout can be swallowed
+                        raise asyncio.CancelledError()
+                    if message is not None and message["type"] == "message":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Pub/sub connection lost", error=str(e))
+            finally:
+                self._pubsub = None
+                self._subscribed = set()
+                if self.connected:
+                    self._set_connected(False)
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def start(self) -> None:
+        """Start the listener (no-op if already running)"""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the listener, ending all subscriptions"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+pubsub_hub = PubSubHub()
@@ -5,15 +5,19 @@ from app.services.user_service import (
     create_user,
     get_user_by_email,
     get_user_by_id,
+    list_users,
     update_user,
     verify_password,
+    verify_password_and_check_rehash,
 )
 
 __all__ = [
     "create_user",
     "get_user_by_email",
     "get_user_by_id",
+    "list_users",
     "update_user",
     "verify_password",
+    "verify_password_and_check_rehash",
     "change_password",
 ]
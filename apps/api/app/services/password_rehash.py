@@ -0,0 +1,106 @@
+"""
+Password hash upgrades on login
+
+A login whose password matches a hash made with a deprecated scheme (bcrypt) or outdated
+Argon2 parameters schedules a rehash. Computing the new hash costs as much as the login's own
+verification, so it runs in the worker (tasks.auth.rehash_password on the realtime queue, rate
+limited there) instead of delaying the response or competing with logins for CPU.
+
+The task message carries the password, so it is encrypted with PASSWORD_REHASH_KEY (Fernet,
+shared with the worker) and expires after REHASH_PENDING_TTL_SECONDS; broker contents, task
+events and the dead-letter stream only ever see ciphertext. At most one rehash per user is
+pending at a time, so a burst of logins after a parameter change queues each user once.
+"""
+
+import asyncio
+from functools import cache
+from typing import TYPE_CHECKING, Set
+from uuid import UUID
+
+import structlog
+from prometheus_client import Counter
+
+from app.cache import AUTH_POOL, get_redis
+from app.core import serialization
+from app.core.config import settings
+from app.services.user_service import ARGON2_PARAMS
+
+if TYPE_CHECKING:
+    from celery import Celery
+
+logger = structlog.get_logger(__name__)
+
+REHASH_TASK = "tasks.auth.rehash_password"
+REHASH_QUEUE = "realtime"
+REHASH_PENDING_PREFIX = "rehash_pending:"
+# The worker drops older messages (PASSWORD_REHASH_MAX_AGE_SECONDS there, keep them equal)
+REHASH_PENDING_TTL_SECONDS = 3600
+
+PASSWORD_REHASHES = Counter(
+    "password_rehash_requests_total",
+    "Password hash upgrades requested on login",
+    ["result"],  # scheduled, already_pending, failed
+)
+
+# Strong references to in-flight scheduling tasks (the loop only keeps weak ones)
+_scheduling: Set[asyncio.Task] = set()
+
+
+# Celery is only needed to publish this task: load it on first use, not at API startup
+@cache
+def get_celery() -> "Celery":
+    """Celery app used as a producer for worker tasks"""
+    from celery import Celery
+
+    return Celery("taskflow", broker=settings.REDIS_URL)
+
+
+def schedule_rehash(user_id: UUID, password_hash: str, password: str) -> None:
+    """
+    Queue a rehash of a user's password in the background, without delaying the caller
+
+    No-op when PASSWORD_REHASH_KEY is unset. Failures are logged, never raised: the login
+    succeeded either way and the next one tries again.
+
+    Args:
+        user_id: User whose hash is outdated
+        password_hash: The outdated hash (the worker only replaces this exact value)
+        password: The verified plain text password
+    """
+    if not settings.PASSWORD_REHASH_KEY:
+        return
+    task = asyncio.create_task(_schedule(user_id, password_hash, password))
+    _scheduling.add(task)
+    task.add_done_callback(_scheduling.discard)
+
+
+async def _schedule(user_id: UUID, password_hash: str, password: str) -> None:
+    from cryptography.fernet import Fernet
+
+    try:
+        redis_client = await get_redis(AUTH_POOL)
+        claimed = await redis_client.set(
+            f"{REHASH_PENDING_PREFIX}{user_id}", 1, ex=REHASH_PENDING_TTL_SECONDS, nx=True
+        )
+        if not claimed:
+            PASSWORD_REHASHES.labels(result="already_pending").inc()
+            return
+
+        payload = serialization.dumps(
+            {
+                "user_id": user_id,
+                "old_hash": password_hash,
+                "password": password,
+                "argon2": ARGON2_PARAMS,
+            }
+        )
+        token = Fernet(settings.PASSWORD_REHASH_KEY).encrypt(payload).decode()
+        # Publishing is blocking broker I/O
+        await asyncio.to_thread(
+            get_celery().send_task, REHASH_TASK, args=[token], queue=REHASH_QUEUE
+        )
+        PASSWORD_REHASHES.labels(result="scheduled").inc()
+        logger.info("Password rehash scheduled", user_id=str(user_id))
+    except Exception as e:
+        PASSWORD_REHASHES.labels(result="failed").inc()
+        logger.warning("Password rehash scheduling failed", user_id=str(user_id), error=str(e))
@@ -0,0 +1,76 @@
+"""
+Task change events
+
+Task writes publish a compact event to the owner's Redis channel after committing. Each API
+process receives them through its shared pub/sub listener (app.pubsub) and fans them out to
+the owner's GraphQL subscriptions.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Row
+
+from app.core import serialization
+from app.models.task import TaskPriority, TaskStatus
+from app.pubsub import pubsub_hub
+
+logger = structlog.get_logger(__name__)
+
+TASK_CHANNEL_PREFIX = "tasks:changed:"
+
+TASK_CREATED = "created"
+TASK_UPDATED = "updated"
+TASK_DELETED = "deleted"
+
+TaskChange = Dict[str, Any]
+
+
+def task_channel(user_id: UUID | str) -> str:
+    """Channel carrying changes to a user's tasks"""
+    return f"{TASK_CHANNEL_PREFIX}{user_id}"
+
+
+async def publish_task_change(
+    user_id: UUID, op: str, task_id: UUID, row: Optional[Row] = None
+) -> None:
+    """
+    Publish a change to one of a user's tasks (best effort: the write is already committed)
+
+    Args:
+        user_id: Owner's UUID
+        op: TASK_CREATED, TASK_UPDATED or TASK_DELETED
+        task_id: Task UUID
+        row: The task's columns after the change (None for deletions)
+    """
+    event = {"op": op, "id": task_id, "task": dict(row._mapping) if row is not None else None}
+    try:
+        await pubsub_hub.publish(task_channel(user_id), serialization.dumps(event))
+    except Exception as e:
+        logger.warning("Task change publish failed", task_id=str(task_id), error=str(e))
+
+
+def decode_task_change(data: str) -> TaskChange:
+    """
+    Decode a published event; `task` holds the same values as a task_service row mapping
+
+    Raises:
+        ValueError: If the event is malformed
+    """
+    try:
+        event = serialization.loads(data)
+        task = event["task"]
+        if task is not None:
+            task["id"] = UUID(task["id"])
+            task["user_id"] = UUID(task["user_id"])
+            task["status"] = TaskStatus(task["status"])
+            task["priority"] = TaskPriority(task["priority"])
+            if task["due_date"] is not None:
+                task["due_date"] = date.fromisoformat(task["due_date"])
+            task["created_at"] = datetime.fromisoformat(task["created_at"])
+            task["updated_at"] = datetime.fromisoformat(task["updated_at"])
+        return {"op": event["op"], "id": UUID(event["id"]), "task": task}
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid task change event") from e
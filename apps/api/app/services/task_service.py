@@ -0,0 +1,390 @@
+"""Task service for database operations"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from itertools import islice
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Row, cast, delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.core.singleflight import SingleFlight, statement_key
+from app.models.task import SEARCH_CONFIG, Task, TaskPriority, TaskStatus, TaskTombstone
+from app.services.task_events import (
+    TASK_CREATED,
+    TASK_DELETED,
+    TASK_UPDATED,
+    publish_task_change,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Columns readable by list/detail queries, by field name. Reads select (a subset of) these as
+# plain rows: no ORM instances, identity map or change tracking.
+TASK_COLUMNS = {
+    column.key: column
+    for column in (
+        Task.id,
+        Task.title,
+        Task.description,
+        Task.status,
+        Task.priority,
+        Task.due_date,
+        Task.user_id,
+        Task.created_at,
+        Task.updated_at,
+    )
+}
+
+# Needed for keyset pagination whatever the caller selects
+CURSOR_COLUMNS = ("id", "created_at")
+
+# Keyset position: (created_at, id) of the last task on the previous page
+TaskCursor = Tuple[datetime, UUID]
+
+# Needed for delta sync positions whatever the caller selects
+SYNC_COLUMNS = ("id", "updated_at")
+
+# Keyset position of a search result: (rank, created_at, id) of the last match seen
+SearchCursor = Tuple[float, datetime, UUID]
+
+task_reads = SingleFlight("task_service")
+
+
+@dataclass(frozen=True)
+class TaskChanges:
+    """A page of changes to a user's tasks, oldest first"""
+
+    changed: List[Row]  # Created or updated tasks
+    deleted: List[UUID]  # IDs of deleted tasks
+    cursor: TaskCursor  # (timestamp, id) to pass as `after` next time
+    has_more: bool  # Further changes are waiting past `cursor`
+
+
+def archived_filter(archived: Optional[bool]) -> Tuple[ColumnElement, ...]:
+    """
+    WHERE clauses selecting active or archived tasks (none for both)
+
+    A literal condition on the partition key lets Postgres scan only that partition.
+    """
+    if archived is None:
+        return ()
+    return (Task.archived.is_(archived),)
+
+
+async def list_tasks(
+    db: AsyncSession,
+    user_id: UUID,
+    limit: int,
+    after: Optional[TaskCursor] = None,
+    columns: Optional[Sequence[ColumnElement]] = None,
+    archived: Optional[bool] = False,
+) -> Sequence[Row]:
+    """
+    List a user's tasks, newest first, with keyset pagination
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        limit: Maximum number of rows to return
+        after: Position of the last task already seen
+        columns: Subset of TASK_COLUMNS to read, including CURSOR_COLUMNS (default: all)
+        archived: List active (False) or archived (True) tasks only, or both (None)
+
+    Returns:
+        Rows with the selected fields (read-only, shared with concurrent identical calls)
+    """
+    stmt = select(*(columns or TASK_COLUMNS.values())).where(
+        Task.user_id == user_id, *archived_filter(archived)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(*after))
+    stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit)
+
+    async def load() -> Sequence[Row]:
+        result = await db.execute(stmt)
+        return result.all()
+
+    return await task_reads.do(statement_key(stmt), load)
+
+
+async def get_task(
+    db: AsyncSession,
+    user_id: UUID,
+    task_id: UUID,
+    columns: Optional[Sequence[ColumnElement]] = None,
+) -> Optional[Row]:
+    """
+    Get one of a user's tasks by ID
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        task_id: Task UUID
+        columns: Subset of TASK_COLUMNS to read (default: all)
+
+    Returns:
+        Row with the selected fields if found and owned by the user, None otherwise
+    """
+    stmt = select(*(columns or TASK_COLUMNS.values())).where(
+        Task.id == task_id, Task.user_id == user_id
+    )
+
+    async def load() -> Optional[Row]:
+        result = await db.execute(stmt)
+        return result.one_or_none()
+
+    return await task_reads.do(statement_key(stmt), load)
+
+
+async def search_tasks(
+    db: AsyncSession,
+    user_id: UUID,
+    query: str,
+    limit: int,
+    after: Optional[SearchCursor] = None,
+    columns: Optional[Sequence[ColumnElement]] = None,
+    archived: Optional[bool] = False,
+) -> Sequence[Row]:
+    """
+    Full-text search over a user's task titles and descriptions, best match first
+
+    `query` uses web search syntax ("quoted phrases", -excluded, or). Matching uses the GIN
+    index on Task.search_vector; with TASK_SEARCH_TRIGRAM_ENABLED, titles containing a word
+    similar to the query (typos, partial words) also match via the pg_trgm index.
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        query: Search text
+        limit: Maximum number of rows to return
+        after: Position of the last match already seen
+        columns: Subset of TASK_COLUMNS to read, including CURSOR_COLUMNS (default: all)
+        archived: Search active (False) or archived (True) tasks only, or both (None)
+
+    Returns:
+        Rows with the selected fields plus `rank` (read-only, shared with concurrent
+        identical calls)
+    """
+    tsquery = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query)
+    matches = Task.search_vector.op("@@")(tsquery)
+    rank = func.ts_rank_cd(Task.search_vector, tsquery)
+    if settings.TASK_SEARCH_TRIGRAM_ENABLED:
+        # `title %> query`: some word of the title is similar to the query (indexable form)
+        matches = or_(matches, Task.title.op("%>")(query))
+        rank = func.greatest(rank, func.word_similarity(query, Task.title))
+
+    stmt = select(*(columns or TASK_COLUMNS.values()), rank.label("rank")).where(
+        Task.user_id == user_id, matches, *archived_filter(archived)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Task.created_at, Task.id) < tuple_(*after))
+    stmt = stmt.order_by(rank.desc(), Task.created_at.desc(), Task.id.desc()).limit(limit)
+
+    async def load() -> Sequence[Row]:
+        result = await db.execute(stmt)
+        return result.all()
+
+    return await task_reads.do(statement_key(stmt), load)
+
+
+async def create_task(
+    db: AsyncSession,
+    user_id: UUID,
+    title: str,
+    description: Optional[str] = None,
+    priority: TaskPriority = TaskPriority.MEDIUM,
+    due_date: Optional[date] = None,
+) -> Row:
+    """
+    Create a task and publish the change to the owner's subscribers
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        title: Task title
+        description: Optional description
+        priority: Task priority
+        due_date: Optional due date
+
+    Returns:
+        Row with all TASK_COLUMNS of the new task
+    """
+    stmt = (
+        insert(Task)
+        .values(
+            user_id=user_id,
+            title=title,
+            description=description,
+            priority=priority,
+            due_date=due_date,
+        )
+        .returning(*TASK_COLUMNS.values())
+    )
+    row = (await db.execute(stmt)).one()
+    await db.commit()
+    await publish_task_change(user_id, TASK_CREATED, row.id, row)
+
+    logger.info("Task created", task_id=str(row.id), user_id=str(user_id))
+    return row
+
+
+async def update_task(
+    db: AsyncSession, user_id: UUID, task_id: UUID, **changes: Any
+) -> Optional[Row]:
+    """
+    Update one of a user's tasks and publish the change to the owner's subscribers
+
+    Reopening an archived task (any status but done) makes it active again; other updates
+    leave it in the archive.
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        task_id: Task UUID
+        **changes: Column values to set (title, description, status, priority, due_date)
+
+    Returns:
+        Row with all TASK_COLUMNS after the update if found and owned by the user, None otherwise
+    """
+    if not changes:
+        return await get_task(db, user_id, task_id)
+
+    values = dict(changes)
+    if values.get("status", TaskStatus.DONE) != TaskStatus.DONE:
+        # Moves the row to the active partition if it was archived (no-op otherwise)
+        values["archived"] = False
+
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**values)
+        .returning(*TASK_COLUMNS.values())
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return None
+    await db.commit()
+    await publish_task_change(user_id, TASK_UPDATED, task_id, row)
+
+    logger.info("Task updated", task_id=str(task_id), fields=sorted(changes))
+    return row
+
+
+async def delete_task(db: AsyncSession, user_id: UUID, task_id: UUID) -> bool:
+    """
+    Delete one of a user's tasks and publish the change to the owner's subscribers
+
+    Returns:
+        True if the task existed and was owned by the user
+    """
+    stmt = delete(Task).where(Task.id == task_id, Task.user_id == user_id).returning(Task.id)
+    if (await db.execute(stmt)).one_or_none() is None:
+        return False
+    # Tombstone for delta sync; the user's expired tombstones go in the same transaction
+    await db.execute(insert(TaskTombstone).values(task_id=task_id, user_id=user_id))
+    await db.execute(
+        delete(TaskTombstone).where(
+            TaskTombstone.user_id == user_id,
+            TaskTombstone.deleted_at < tombstone_cutoff(),
+        )
+    )
+    await db.commit()
+    await publish_task_change(user_id, TASK_DELETED, task_id)
+
+    logger.info("Task deleted", task_id=str(task_id))
+    return True
+
+
+def tombstone_cutoff() -> datetime:
+    """Deletions before this time are forgotten (sync cursors older than it are expired)"""
+    return datetime.now(UTC) - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+
+
+async def list_task_changes(
+    db: AsyncSession,
+    user_id: UUID,
+    limit: int,
+    after: Optional[TaskCursor] = None,
+    columns: Optional[Sequence[ColumnElement]] = None,
+) -> TaskChanges:
+    """
+    Tasks created, updated or deleted after a sync position, for delta sync
+
+    Changes are ordered by (updated_at or deleted_at, id). Timestamps are transaction start
+    times, so a slow transaction can commit a change behind a position already handed out:
+    once caught up, the returned cursor lags by TASK_SYNC_SETTLE_SECONDS and the most recent
+    changes are reported again on the next sync (clients apply them idempotently).
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        limit: Maximum number of changes to return
+        after: Cursor from the previous sync (None for a full sync, without deletions)
+        columns: Subset of TASK_COLUMNS to read, including SYNC_COLUMNS (default: all)
+
+    Raises:
+        ValueError: If `after` predates the tombstone retention period
+    """
+    if after is not None and after[0] < tombstone_cutoff():
+        raise ValueError("Sync cursor expired; sync again without a cursor")
+
+    changed_stmt = select(*(columns or TASK_COLUMNS.values())).where(Task.user_id == user_id)
+    if after is not None:
+        changed_stmt = changed_stmt.where(tuple_(Task.updated_at, Task.id) > tuple_(*after))
+    changed_stmt = changed_stmt.order_by(Task.updated_at, Task.id).limit(limit + 1)
+    changed = (await db.execute(changed_stmt)).all()
+
+    # A full sync starts from nothing, so there are no deletions to report
+    deleted: Sequence[Row] = ()
+    if after is not None:
+        deleted_stmt = (
+            select(TaskTombstone.deleted_at, TaskTombstone.task_id)
+            .where(
+                TaskTombstone.user_id == user_id,
+                tuple_(TaskTombstone.deleted_at, TaskTombstone.task_id) > tuple_(*after),
+            )
+            .order_by(TaskTombstone.deleted_at, TaskTombstone.task_id)
+            .limit(limit + 1)
+        )
+        deleted = (await db.execute(deleted_stmt)).all()
+
+    # Merge both streams in position order (task IDs are unique, so positions never tie)
+    merged = heapq.merge(
+        ((row.updated_at, row.id, row) for row in changed),
+        ((row.deleted_at, row.task_id, None) for row in deleted),
+        key=lambda change: change[:2],
+    )
+    page = list(islice(merged, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    if has_more:
+        cursor = page[-1][:2]
+    else:
+        settled = datetime.now(UTC) - timedelta(seconds=settings.TASK_SYNC_SETTLE_SECONDS)
+        cursor = (settled, UUID(int=0))
+
+    return TaskChanges(
+        changed=[row for _, _, row in page if row is not None],
+        deleted=[task_id for _, task_id, row in page if row is None],
+        cursor=cursor,
+        has_more=has_more,
+    )
+
+
+def task_cursor(row: Row) -> TaskCursor:
+    """Keyset position of a task row"""
+    return row.created_at, row.id
+
+
+def search_cursor(row: Row) -> SearchCursor:
+    """Keyset position of a search_tasks() row"""
+    return row.rank, row.created_at, row.id
+
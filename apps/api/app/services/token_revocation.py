@@ -0,0 +1,186 @@
+"""
+Access token revocation
+
+Revoked token IDs (the `jti` claim) live in a Redis sorted set scored by the token's expiry,
+shared by all replicas. Each process mirrors the set in a Bloom filter, so a token that was
+never revoked is cleared without a Redis round trip; only filter hits (revoked tokens and rare
+false positives) are confirmed with ZSCORE.
+
+Revocations are published to every replica as they happen. The filter is rebuilt from Redis
+when the pub/sub connection (re)connects, since deltas may have been missed, and periodically
+to drop expired IDs. Until it has been built, and while pub/sub is down, every check goes to
+Redis.
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+
+import structlog
+from prometheus_client import Counter
+
+from app.cache import AUTH_POOL, get_pipeline, get_redis
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.pubsub import pubsub_hub
+
+logger = structlog.get_logger(__name__)
+
+REVOKED_TOKENS_KEY = "revoked_jti"  # Sorted set: jti -> expiry (unix seconds)
+REVOCATION_CHANNEL = "auth:revoked"
+
+TOKEN_REVOCATION_CHECKS = Counter(
+    "token_revocation_checks_total",
+    "Access token revocation checks",
+    ["result"],  # filter_miss, revoked, false_positive, unfiltered
+)
+
+
+class TokenRevocationFilter:
+    """Bloom filter of revoked token IDs, kept in sync with Redis"""
+
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.ready = False  # The filter holds every revoked ID; otherwise ask Redis
+
+        self._filter = BloomFilter(capacity, error_rate)
+        self._connected = False
+        # IDs received while a rebuild is reading Redis, added to the new filter
+        self._received_during_rebuild: Optional[List[str]] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._started = False
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a token ID until `expires_at` (unix seconds), on every replica
+
+        Raises:
+            redis.RedisError: The revocation could not be stored
+        """
+        self._on_revoked(jti)
+        redis_client = await get_redis(AUTH_POOL)
+        await redis_client.zadd(REVOKED_TOKENS_KEY, {jti: expires_at})
+        try:
+            await pubsub_hub.publish(REVOCATION_CHANNEL, jti, AUTH_POOL)
+        except Exception as e:
+            # Stored: other replicas pick it up at their next rebuild
+            logger.warning("Token revocation publish failed", error=str(e))
+
+    async def revoke_token(self, payload: dict) -> None:
+        """Revoke a verified token until it expires (no-op for tokens without a jti)"""
+        jti = payload.get("jti")
+        if jti is not None:
+            await self.revoke(jti, float(payload["exp"]))
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Whether a token ID has been revoked
+
+        Tokens without a jti (issued before it was added) can't be revoked.
+
+        Raises:
+            redis.RedisError: A filter hit, or an unfiltered check, could not be confirmed
+        """
+        if jti is None:
+            return False
+        if self.ready and jti not in self._filter:
+            TOKEN_REVOCATION_CHECKS.labels(result="filter_miss").inc()
+            return False
+
+        redis_client = await get_pipeline(AUTH_POOL)
+        expires_at = await redis_client.zscore(REVOKED_TOKENS_KEY, jti)
+        revoked = expires_at is not None and float(expires_at) > time.time()
+        if revoked:
+            result = "revoked"
+        else:
+            result = "false_positive" if self.ready else "unfiltered"
+        TOKEN_REVOCATION_CHECKS.labels(result=result).inc()
+        return revoked
+
+    async def rebuild(self) -> None:
+        """Replace the filter with the unexpired IDs in Redis (raises on Redis errors)"""
+        self._received_during_rebuild = []
+        try:
+            now = time.time()
+            redis_client = await get_redis(AUTH_POOL)
+            await redis_client.zremrangebyscore(REVOKED_TOKENS_KEY, "-inf", now)
+            jtis = await redis_client.zrangebyscore(REVOKED_TOKENS_KEY, now, "+inf")
+            # Grow past the configured capacity rather than degrade the false positive rate
+            capacity = max(self.capacity, 2 * len(jtis))
+            rebuilt = BloomFilter(capacity, self.error_rate, jtis)
+            for jti in self._received_during_rebuild:
+                rebuilt.add(jti)
+        finally:
+            self._received_during_rebuild = None
+        self._filter = rebuilt
+        logger.debug("Token revocation filter rebuilt", revoked=len(jtis), capacity=capacity)
+
+    async def _rebuild_after_connect(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception as e:
+            logger.warning("Token revocation filter rebuild failed", error=str(e))
+            return
+        # Only trust the filter if no deltas can have been missed since
+        self.ready = self._connected
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            if not self.ready:
+                continue
+            try:
+                await self.rebuild()
+            except Exception as e:
+                # The current filter stays valid; expired IDs only cost extra confirmations
+                logger.warning("Token revocation filter refresh failed", error=str(e))
+
+    def _on_revoked(self, jti: str) -> None:
+        self._filter.add(jti)
+        if self._received_during_rebuild is not None:
+            self._received_during_rebuild.append(jti)
+
+    def _on_state(self, connected: bool) -> None:
+        self._connected = connected
+        if not connected:
+            self.ready = False
+            return
+        # Revocations may have been missed while disconnected
+        if self._rebuild_task is not None:
+            self._rebuild_task.cancel()
+        self._rebuild_task = asyncio.create_task(self._rebuild_after_connect())
+
+    async def start(self) -> None:
+        """Receive revocations through the shared pub/sub listener (no-op if started)"""
+        if not self._started:
+            self._started = True
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+            await pubsub_hub.add_handler(
+                REVOCATION_CHANNEL, self._on_revoked, on_state=self._on_state
+            )
+
+    async def stop(self) -> None:
+        """Stop receiving revocations; checks go to Redis afterwards"""
+        if self._started:
+            self._started = False
+            await pubsub_hub.remove_handler(REVOCATION_CHANNEL, self._on_revoked)
+            for task in (self._rebuild_task, self._refresh_task):
+                if task is not None:
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            self._rebuild_task = self._refresh_task = None
+        self.ready = False
+        self._connected = False
+
+
+token_revocation = TokenRevocationFilter(
+    capacity=settings.TOKEN_REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_FILTER_ERROR_RATE,
+    refresh_seconds=settings.TOKEN_REVOCATION_FILTER_REFRESH_SECONDS,
+)
@@ -0,0 +1,237 @@
+"""
+Two-tier cache for user lookups
+
+L1 is a per-process TTL LRU holding full records. L2 is Redis (cache pool) holding a compact
+JSON form shared by all replicas. The password hash never goes to L2, so lookups that need it
+(login) are served from L1 or the database only.
+
+Writers invalidate both tiers after committing and publish the change so other replicas drop
+their L1 entries. L1 is bypassed while the invalidation subscription is down, and both tiers
+expire on their own as a safety net.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from prometheus_client import Counter
+
+from app.cache import CACHE_POOL, get_pipeline
+from app.core import serialization
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.pubsub import pubsub_hub
+
+logger = structlog.get_logger(__name__)
+
+USER_CACHE_PREFIX = "user:"
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+USER_CACHE_REQUESTS = Counter(
+    "user_cache_requests_total",
+    "User cache lookups",
+    ["result"],  # l1_hit, l2_hit, miss
+)
+
+UserRecord = Dict[str, Any]
+Loader = Callable[[], Awaitable[Optional[UserRecord]]]
+
+
+def id_key(user_id: UUID | str) -> str:
+    return f"{USER_CACHE_PREFIX}id:{user_id}"
+
+
+def email_key(email: str) -> str:
+    return f"{USER_CACHE_PREFIX}email:{email}"
+
+
+def to_record(user: Any) -> UserRecord:
+    """Plain dict of a User row's cached fields"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "password_hash": user.password_hash,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+def dumps_compact(record: UserRecord) -> bytes:
+    return serialization.dumps(
+        {
+            "id": record["id"],
+            "email": record["email"],
+            "created_at": record["created_at"],
+            "updated_at": record["updated_at"],
+        }
+    )
+
+
+def loads_compact(data: str) -> UserRecord:
+    raw = serialization.loads(data)
+    return {
+        "id": UUID(raw["id"]),
+        "email": raw["email"],
+        "password_hash": None,  # Not shared through Redis
+        "created_at": datetime.fromisoformat(raw["created_at"]) if raw["created_at"] else None,
+        "updated_at": datetime.fromisoformat(raw["updated_at"]) if raw["updated_at"] else None,
+    }
+
+
+class UserCache:
+    """In-process LRU in front of Redis, with single-flight loads per key"""
+
+    def __init__(self, max_entries: int, l1_ttl_seconds: float, l2_ttl_seconds: int):
+        self.max_entries = max_entries
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.l2_ttl_seconds = l2_ttl_seconds
+        self.ready = False  # L1 is only used while invalidations are being received
+
+        self._entries: "OrderedDict[str, Tuple[UserRecord, float]]" = OrderedDict()
+        # Bumped on every invalidation so loads that started earlier don't cache stale rows
+        self._generation = 0
+        self._flights = SingleFlight("user_cache")
+        self._started = False
+
+    def _l1_get(self, key: str, need_password_hash: bool) -> Optional[UserRecord]:
+        if not self.ready:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        record, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        if need_password_hash and record["password_hash"] is None:
+            return None
+        self._entries.move_to_end(key)
+        return record
+
+    def _l1_store(self, record: UserRecord) -> None:
+        if not self.ready:
+            return
+        expires_at = time.monotonic() + self.l1_ttl_seconds
+        for key in (id_key(record["id"]), email_key(record["email"])):
+            self._entries[key] = (record, expires_at)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _l1_drop(self, keys: Iterable[str]) -> None:
+        self._generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def get(
+        self, key: str, loader: Loader, need_password_hash: bool = False
+    ) -> Optional[UserRecord]:
+        """
+        Return the user record for `key`, loading it from the database on a miss
+
+        Concurrent misses for the same key share one load.
+
+        Args:
+            key: id_key() or email_key()
+            loader: Reads the record from the database (None if not found)
+            need_password_hash: Skip Redis, which never holds the hash
+        """
+        record = self._l1_get(key, need_password_hash)
+        if record is not None:
+            USER_CACHE_REQUESTS.labels(result="l1_hit").inc()
+            return record
+
+        return await self._flights.do(
+            (key, need_password_hash), lambda: self._load(key, loader, need_password_hash)
+        )
+
+    async def _load(
+        self, key: str, loader: Loader, need_password_hash: bool
+    ) -> Optional[UserRecord]:
+        generation = self._generation
+
+        if not need_password_hash:
+            try:
+                redis_client = await get_pipeline(CACHE_POOL)
+                data = await redis_client.get(key)
+            except Exception as e:
+                logger.warning("User cache read failed", error=str(e))
+                data = None
+            if data:
+                USER_CACHE_REQUESTS.labels(result="l2_hit").inc()
+                record = loads_compact(data)
+                if generation == self._generation:
+                    self._l1_store(record)
+                return record
+
+        USER_CACHE_REQUESTS.labels(result="miss").inc()
+        record = await loader()
+        if record is not None and generation == self._generation:
+            self._l1_store(record)
+            await self._l2_store(record)
+        return record
+
+    async def _l2_store(self, record: UserRecord) -> None:
+        try:
+            redis_client = await get_pipeline(CACHE_POOL)
+            data = dumps_compact(record)
+            await asyncio.gather(
+                redis_client.setex(id_key(record["id"]), self.l2_ttl_seconds, data),
+                redis_client.setex(email_key(record["email"]), self.l2_ttl_seconds, data),
+            )
+        except Exception as e:
+            logger.warning("User cache write failed", error=str(e))
+
+    async def invalidate(self, user_id: UUID | str, *emails: str) -> None:
+        """Drop a user from both tiers here and from L1 on every other replica"""
+        keys = [id_key(user_id)] + [email_key(email) for email in emails if email]
+        self._l1_drop(keys)
+
+        try:
+            redis_client = await get_pipeline(CACHE_POOL)
+            await asyncio.gather(
+                redis_client.delete(*keys),
+                pubsub_hub.publish(INVALIDATION_CHANNEL, serialization.dumps(keys), CACHE_POOL),
+            )
+        except Exception as e:
+            # Other replicas fall back to their L1 TTL
+            logger.warning("User cache invalidation failed", user_id=str(user_id), error=str(e))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def _on_invalidation(self, data: str) -> None:
+        self._l1_drop(serialization.loads(data))
+
+    def _on_state(self, connected: bool) -> None:
+        # Invalidations may have been missed while disconnected
+        self.clear()
+        self.ready = connected
+
+    async def start(self) -> None:
+        """Receive invalidations through the shared pub/sub listener (no-op if started)"""
+        if not self._started:
+            self._started = True
+            await pubsub_hub.add_handler(
+                INVALIDATION_CHANNEL, self._on_invalidation, on_state=self._on_state
+            )
+
+    async def stop(self) -> None:
+        """Stop receiving invalidations and drop all L1 entries"""
+        if self._started:
+            self._started = False
+            await pubsub_hub.remove_handler(INVALIDATION_CHANNEL, self._on_invalidation)
+        self.ready = False
+        self.clear()
+
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    l1_ttl_seconds=settings.USER_CACHE_L1_TTL_SECONDS,
+    l2_ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
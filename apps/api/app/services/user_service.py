@@ -1,67 +1,145 @@
 """User service for database operations"""
 
-from typing import Optional
+from functools import cache
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 from uuid import UUID
 
 import structlog
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
+from app.core.config import settings
+from app.core.singleflight import SingleFlight, statement_key
 from app.models.user import User
+from app.services.user_cache import email_key, id_key, to_record, user_cache
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 logger = structlog.get_logger(__name__)
 
-# Password hashing context
+# Argon2 parameters for new hashes (also sent to the worker for rehashing, see password_rehash)
 # Using Argon2id (recommended variant) with reasonable defaults
 # - time_cost: Number of iterations (higher = more secure but slower)
 # - memory_cost: Memory usage in KB (higher = more secure but uses more RAM)
 # - parallelism: Number of parallel threads
+# Hashes made with other parameters are upgraded on the user's next login
+ARGON2_PARAMS = {
+    "type": "id",  # Use Argon2id (recommended hybrid variant): 'id', 'i' or 'd'
+    "time_cost": 2,  # 2 iterations (reasonable for most apps)
+    "memory_cost": 65536,  # 64 MB (reasonable for most apps)
+    "parallelism": 1,  # Single thread (adjust if needed)
+}
+
+# Password hashing context
 # Argon2 supports passwords up to 2^32-1 bytes (effectively unlimited)
 # Including "bcrypt" in schemes allows verification of existing bcrypt hashes during migration
 # New passwords will use Argon2 (first scheme in list)
-pwd_context = CryptContext(
-    schemes=["argon2", "bcrypt"],  # Argon2 for new passwords, bcrypt for legacy verification
-    deprecated="auto",
-    argon2__type="id",  # Use Argon2id (recommended hybrid variant) - valid values: 'id', 'i', 'd'
-    argon2__time_cost=2,  # 2 iterations (reasonable for most apps)
-    argon2__memory_cost=65536,  # 64 MB (reasonable for most apps)
-    argon2__parallelism=1,  # Single thread (adjust if needed)
-)
+# Built on first use: passlib and its backends are only needed by the auth paths, not by
+# tooling that imports this module (migrations, scripts). The API warms it at startup.
+@cache
+def get_pwd_context() -> "CryptContext":
+    """Get the shared password hashing context"""
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],  # Argon2 for new passwords, bcrypt for legacy verification
+        deprecated="auto",  # Every scheme but the first needs updating (see needs_update)
+        **{f"argon2__{name}": value for name, value in ARGON2_PARAMS.items()},
+    )
+
+
+# Identical concurrent reads share one query (results are plain records, see to_record)
+user_reads = SingleFlight("user_service")
+
+# Columns readable by list queries, by field name, selected as plain rows instead of ORM
+# instances. password_hash is deliberately not listed.
+USER_LIST_COLUMNS = {
+    column.key: column for column in (User.id, User.email, User.created_at, User.updated_at)
+}
+
+
+async def _select_user(db: AsyncSession, condition) -> Optional[User]:
+    stmt = select(User).where(condition)
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
 
 
-async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+async def _load_record(db: AsyncSession, condition) -> Optional[dict]:
+    user = await _select_user(db, condition)
+    return to_record(user) if user else None
+
+
+async def get_user_by_email(
+    db: AsyncSession, email: str, include_password_hash: bool = False
+) -> Optional[User]:
     """
-    Get user by email address
+    Get user by email address (cached)
 
     Args:
         db: Database session
         email: User email address
+        include_password_hash: Populate password_hash (needed for login; bypasses Redis)
 
     Returns:
-        User object if found, None otherwise
+        Detached User object if found, None otherwise. Use the session to load an
+        attached instance before modifying it.
     """
-    stmt = select(User).where(User.email == email)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    return user
+    def load():
+        return _load_record(db, User.email == email)
+
+    if settings.USER_CACHE_ENABLED:
+        record = await user_cache.get(
+            email_key(email), load, need_password_hash=include_password_hash
+        )
+    else:
+        record = await user_reads.do(email_key(email), load)
+    return User(**record) if record else None
 
 
 async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
     """
-    Get user by ID
+    Get user by ID (cached, without password_hash)
 
     Args:
         db: Database session
         user_id: User UUID
 
     Returns:
-        User object if found, None otherwise
+        Detached User object if found, None otherwise
     """
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    return user
+    def load():
+        return _load_record(db, User.id == user_id)
+
+    if settings.USER_CACHE_ENABLED:
+        record = await user_cache.get(id_key(user_id), load)
+    else:
+        record = await user_reads.do(id_key(user_id), load)
+    return User(**record) if record else None
+
+
+async def list_users(
+    db: AsyncSession, columns: Optional[Sequence[ColumnElement]] = None
+) -> Sequence[Row]:
+    """
+    List all users, newest first
+
+    Args:
+        db: Database session
+        columns: Subset of USER_LIST_COLUMNS to read (default: all)
+
+    Returns:
+        Rows with the selected fields (never password_hash), shared with concurrent
+        identical calls
+    """
+    stmt = select(*(columns or USER_LIST_COLUMNS.values())).order_by(User.created_at.desc())
+
+    async def load() -> Sequence[Row]:
+        result = await db.execute(stmt)
+        return result.all()
+
+    return await user_reads.do(statement_key(stmt), load)
 
 
 async def create_user(db: AsyncSession, email: str, password: str) -> User:
@@ -85,13 +163,14 @@ async def create_user(db: AsyncSession, email: str, password: str) -> User:
         raise ValueError(f"User with email {email} already exists")
 
     # Hash password (Argon2 supports passwords up to 2^32-1 bytes)
-    password_hash = pwd_context.hash(password)
+    password_hash = get_pwd_context().hash(password)
 
     # Create user
     user = User(email=email, password_hash=password_hash)
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await user_cache.invalidate(user.id, email)
 
     logger.info("User created", user_id=str(user.id), email=email)
     return user
@@ -108,7 +187,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_password_and_check_rehash(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, bool]:
+    """
+    Verify a password and tell whether its hash should be upgraded
+
+    The check costs nothing beyond the verification: it compares the hash's scheme and
+    parameters with the current ones.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        (matches, needs_rehash): needs_rehash when the password matches but the hash uses a
+        deprecated scheme (bcrypt) or outdated Argon2 parameters
+    """
+    context = get_pwd_context()
+    if not context.verify(plain_password, hashed_password):
+        return False, False
+    return True, context.needs_update(hashed_password)
 
 
 async def update_user(db: AsyncSession, user_id: UUID, **kwargs) -> Optional[User]:
@@ -123,9 +225,11 @@ async def update_user(db: AsyncSession, user_id: UUID, **kwargs) -> Optional[Use
     Returns:
         Updated User object if found, None otherwise
     """
-    user = await get_user_by_id(db, user_id)
+    # Load an attached instance (cached users are detached)
+    user = await _select_user(db, User.id == user_id)
     if not user:
         return None
+    old_email = user.email
 
     # Update fields
     for key, value in kwargs.items():
@@ -134,6 +238,7 @@ async def update_user(db: AsyncSession, user_id: UUID, **kwargs) -> Optional[Use
 
     await db.commit()
     await db.refresh(user)
+    await user_cache.invalidate(user_id, old_email, user.email)
 
     logger.info("User updated", user_id=str(user_id), fields=list(kwargs.keys()))
     return user
@@ -152,7 +257,7 @@ async def change_password(db: AsyncSession, user_id: UUID, new_password: str) ->
         True if password was changed, False if user not found
     """
     # Hash password (Argon2 supports passwords up to 2^32-1 bytes)
-    password_hash = pwd_context.hash(new_password)
+    password_hash = get_pwd_context().hash(new_password)
     user = await update_user(db, user_id, password_hash=password_hash)
 
     if user:
@@ -0,0 +1,422 @@
+"""
+Auth hot-path micro-benchmarks: JWT, Argon2 and Redis token storage
+
+Times the functions every login, refresh and authenticated request goes through, with the
+current settings:
+    jwt     create_access_token, create_refresh_token, verify_token
+    argon2  hash and verify_password with user_service's password context
+    redis   each refresh/revoked token function in app.cache, and the access token revocation
+            check with and without its Bloom filter, against REDIS_URL (or an in-memory
+            fakeredis with --fake-redis, which leaves out the round trip)
+
+--sweep adds cost-vs-latency tables for choosing settings: JWT_ALGORITHM candidates
+(HS256/384/512, RS256, ES256; python-jose has no EdDSA) and an Argon2 time_cost x memory_cost
+grid. Login verifies the password inline, so one API process sustains about 1/verify logins
+per second; with --target-logins the grid also shows how many processes each setting needs
+for that rate.
+
+--save appends the run, tagged with the git commit, to a JSON-lines history file and shows
+the change against the previous entry; --history prints the recorded medians per commit.
+
+Usage (from apps/api):
+    python -m benchmarks.auth [--only jwt,argon2,redis] [--repeat 200] [--fake-redis]
+        [--sweep] [--time-costs 1,2,3] [--memory-costs 19456,65536,131072]
+        [--target-logins 50] [--save] [--history] [--results benchmarks/results/auth.jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from jose import jwk, jwt
+
+from app import cache
+from app.auth.jwt import create_access_token, create_refresh_token, verify_token
+from app.core.config import settings
+from app.services.token_revocation import TokenRevocationFilter
+from app.services.user_service import get_pwd_context, verify_password
+from benchmarks.fakes import use_fake_redis
+
+SECTIONS = ("jwt", "argon2", "redis")
+DEFAULT_RESULTS = Path(__file__).with_name("results") / "auth.jsonl"
+PASSWORD = "correct horse battery staple"
+SWEEP_ALGORITHMS = ("HS256", "HS384", "HS512", "RS256", "ES256")
+
+# name -> {"median_ms": ..., "p95_ms": ...}
+Results = Dict[str, Dict[str, float]]
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    timings = sorted(timings)
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[max(0, math.ceil(len(timings) * 0.95) - 1)] * 1000,
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    fn()  # Warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+async def measure_async(
+    fn: Callable[[int], Awaitable[object]],
+    repeat: int,
+    setup: Optional[Callable[[int], Awaitable[object]]] = None,
+) -> Dict[str, float]:
+    """Time `fn(i)` for i in range(repeat), running the untimed `setup(i)` first"""
+    timings = []
+    for i in range(-1, repeat):  # -1 warms up
+        if setup is not None:
+            await setup(i)
+        started = time.perf_counter()
+        await fn(i)
+        if i >= 0:
+            timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+def report(results: Results, name: str, summary: Dict[str, float]) -> None:
+    results[name] = summary
+    print(
+        f"  {name:<32} median {summary['median_ms']:9.3f} ms"
+        f"   p95 {summary['p95_ms']:9.3f} ms"
+    )
+
+
+def bench_jwt(results: Results, repeat: int) -> None:
+    print(f"JWT ({settings.JWT_ALGORITHM}):")
+    claims = {"sub": str(uuid.uuid4()), "email": "bench@example.com"}
+    access_token = create_access_token(claims)
+    report(results, "jwt.create_access_token", measure(lambda: create_access_token(claims), repeat))
+    report(
+        results, "jwt.create_refresh_token", measure(lambda: create_refresh_token(claims), repeat)
+    )
+    report(results, "jwt.verify_token", measure(lambda: verify_token(access_token), repeat))
+
+
+def jwt_keys(algorithm: str) -> Tuple[str, str]:
+    """(signing key, verification key) for a sweep algorithm"""
+    if algorithm.startswith("HS"):
+        return settings.JWT_SECRET_KEY, settings.JWT_SECRET_KEY
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    if algorithm.startswith("RS"):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def sweep_jwt(results: Results, repeat: int) -> None:
+    print("\nJWT algorithm sweep (access token claims, keys parsed once as app.auth.keys does):")
+    print(
+        f"  {'algorithm':<10}{'sign ms':>10}{'verify ms':>11}{'token bytes':>13}"
+        f"{'sign ms, PEM per call':>24}"
+    )
+    claims = {
+        "sub": str(uuid.uuid4()),
+        "email": "bench@example.com",
+        "exp": datetime.now(UTC) + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES),
+        "type": "access",
+    }
+    headers = {"kid": "bench"}
+    for algorithm in SWEEP_ALGORITHMS:
+        signing_pem, verification_pem = jwt_keys(algorithm)
+        signing_key = jwk.construct(signing_pem, algorithm)
+        verification_key = jwk.construct(verification_pem, algorithm)
+
+        token = jwt.encode(claims, signing_key, algorithm=algorithm, headers=headers)
+        sign = measure(
+            lambda: jwt.encode(claims, signing_key, algorithm=algorithm, headers=headers), repeat
+        )
+        verify = measure(
+            lambda: jwt.decode(token, verification_key, algorithms=[algorithm]), repeat
+        )
+        sign_pem = measure(
+            lambda: jwt.encode(claims, signing_pem, algorithm=algorithm, headers=headers),
+            max(1, repeat // 10),
+        )
+        results[f"jwt.sweep.{algorithm}.sign"] = sign
+        results[f"jwt.sweep.{algorithm}.verify"] = verify
+        marker = "  (current)" if algorithm == settings.JWT_ALGORITHM else ""
+        print(
+            f"  {algorithm:<10}{sign['median_ms']:>10.3f}{verify['median_ms']:>11.3f}"
+            f"{len(token):>13}{sign_pem['median_ms']:>24.3f}{marker}"
+        )
+
+
+def bench_argon2(results: Results, repeat: int) -> None:
+    context = get_pwd_context()
+    password_hash = context.hash(PASSWORD)
+    print(f"\nArgon2 ({password_hash.split('$')[3]}):")
+    report(results, "argon2.hash", measure(lambda: context.hash(PASSWORD), repeat))
+    verify = measure(lambda: verify_password(PASSWORD, password_hash), repeat)
+    report(results, "argon2.verify_password", verify)
+    print(f"  ~{1000 / verify['median_ms']:.0f} logins/s per API process (verify runs inline)")
+
+
+def sweep_argon2(
+    results: Results,
+    repeat: int,
+    time_costs: List[int],
+    memory_costs: List[int],
+    target_logins: Optional[float],
+) -> None:
+    from passlib.hash import argon2
+
+    print("\nArgon2id cost sweep (verify, parallelism=1):")
+    header = f"  {'time_cost':>9}{'memory_cost':>13}{'verify ms':>11}{'logins/s':>10}"
+    if target_logins:
+        header += f"{f'processes for {target_logins:g}/s':>25}"
+    print(header)
+    for time_cost in time_costs:
+        for memory_cost in memory_costs:
+            handler = argon2.using(
+                type="id", time_cost=time_cost, memory_cost=memory_cost, parallelism=1
+            )
+            password_hash = handler.hash(PASSWORD)
+            verify = measure(lambda: handler.verify(PASSWORD, password_hash), repeat)
+            results[f"argon2.sweep.t{time_cost}.m{memory_cost}.verify"] = verify
+            logins = 1000 / verify["median_ms"]
+            line = (
+                f"  {time_cost:>9}{f'{memory_cost // 1024} MiB':>13}"
+                f"{verify['median_ms']:>11.1f}{logins:>10.1f}"
+            )
+            if target_logins:
+                line += f"{math.ceil(target_logins / logins):>25}"
+            print(line)
+
+
+async def bench_redis(results: Results, repeat: int, tokens_per_user: int, target: str) -> None:
+    print(f"\nRedis token storage ({target}):")
+    user_id = str(uuid.uuid4())  # Fresh user: nothing real is touched
+    # Real-length tokens; the suffix keeps every iteration's key distinct
+    base_token = create_refresh_token({"sub": user_id, "email": "bench@example.com"})
+
+    def token(i: int) -> str:
+        return f"{base_token}.{i}"
+
+    async def store(i: int) -> None:
+        await cache.store_refresh_token(user_id, token(i))
+
+    async def store_for_user(i: int) -> None:
+        for n in range(tokens_per_user):
+            await cache.store_refresh_token(user_id, f"{token(i)}.{n}")
+
+    try:
+        report(results, "redis.store_refresh_token", await measure_async(store, repeat))
+        report(
+            results,
+            "redis.get_refresh_token",
+            await measure_async(lambda i: cache.get_refresh_token(user_id, token(i)), repeat),
+        )
+        report(
+            results,
+            "redis.is_token_revoked",
+            await measure_async(lambda i: cache.is_token_revoked(user_id, token(i)), repeat),
+        )
+        report(
+            results,
+            "redis.revoke_refresh_token",
+            await measure_async(
+                lambda i: cache.revoke_refresh_token(user_id, token(i)), repeat, setup=store
+            ),
+        )
+        report(
+            results,
+            "redis.delete_refresh_token",
+            await measure_async(
+                lambda i: cache.delete_refresh_token(user_id, token(i)), repeat, setup=store
+            ),
+        )
+        report(
+            results,
+            f"redis.revoke_all_user_tokens[{tokens_per_user}]",
+            await measure_async(
+                lambda i: cache.revoke_all_user_tokens(user_id),
+                max(1, repeat // 10),  # SCANs the keyspace; keep it short
+                setup=store_for_user,
+            ),
+        )
+
+        revocation = TokenRevocationFilter(
+            settings.TOKEN_REVOCATION_FILTER_CAPACITY,
+            settings.TOKEN_REVOCATION_FILTER_ERROR_RATE,
+            refresh_seconds=3600,
+        )
+        jtis = [uuid.uuid4().hex for _ in range(repeat + 1)]
+        report(
+            results,
+            "revocation.is_revoked[redis]",
+            await measure_async(lambda i: revocation.is_revoked(jtis[i]), repeat),
+        )
+        await revocation.rebuild()
+        revocation.ready = True  # As once the pub/sub listener is connected
+        report(
+            results,
+            "revocation.is_revoked[filter]",
+            await measure_async(lambda i: revocation.is_revoked(jtis[i]), repeat),
+        )
+    finally:
+        redis_client = await cache.get_redis(cache.AUTH_POOL)
+        keys = [key async for key in redis_client.scan_iter(match=f"*{user_id}*")]
+        if keys:
+            await redis_client.delete(*keys)
+        await cache.close_redis()
+
+
+def git_revision() -> Tuple[str, bool]:
+    """(short commit hash, working tree has changes)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def load_history(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def label(entry: dict) -> str:
+    return entry["commit"] + ("+" if entry["dirty"] else "")
+
+
+def save(results: Results, path: Path) -> None:
+    """Append this run to the history and show the change against the previous entry"""
+    history = load_history(path)
+    commit, dirty = git_revision()
+    entry = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+    print(f"\nSaved to {path} as {label(entry)}")
+
+    if history:
+        previous = history[-1]
+        print(f"Median change vs {label(previous)} ({previous['timestamp']}):")
+        for name, summary in results.items():
+            before = previous["results"].get(name)
+            if before:
+                change = (summary["median_ms"] / before["median_ms"] - 1) * 100
+                print(f"  {name:<40} {change:+7.1f}%")
+
+
+def print_history(path: Path, last: int) -> None:
+    history = load_history(path)[-last:]
+    if not history:
+        print(f"No history in {path} (record runs with --save)")
+        return
+    names = list(dict.fromkeys(name for entry in history for name in entry["results"]))
+    width = max(len(name) for name in names) + 2
+    print("Median ms per recorded run:\n")
+    print(" " * width + "".join(f"{label(entry):>12}" for entry in history))
+    for name in names:
+        cells = []
+        for entry in history:
+            summary = entry["results"].get(name)
+            cells.append(f"{summary['median_ms']:>12.3f}" if summary else f"{'-':>12}")
+        print(f"{name:<{width}}" + "".join(cells))
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0], formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--only", type=parse_list, default=list(SECTIONS), help="Sections")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per JWT/Redis benchmark")
+    parser.add_argument("--hash-repeat", type=int, default=10, help="Runs per Argon2 benchmark")
+    parser.add_argument("--fake-redis", action="store_true", help="Use in-memory fakeredis")
+    parser.add_argument("--tokens-per-user", type=int, default=5, help="For revoke_all")
+    parser.add_argument("--sweep", action="store_true", help="JWT algorithm and Argon2 sweeps")
+    parser.add_argument("--time-costs", type=parse_list, default=["1", "2", "3"])
+    parser.add_argument("--memory-costs", type=parse_list, default=["19456", "65536", "131072"])
+    parser.add_argument("--target-logins", type=float, help="Logins/s the API must sustain")
+    parser.add_argument("--save", action="store_true", help="Append results to the history")
+    parser.add_argument("--history", action="store_true", help="Print recorded runs and exit")
+    parser.add_argument("--last", type=int, default=10, help="Runs shown by --history")
+    parser.add_argument("--results", type=Path, default=DEFAULT_RESULTS)
+    args = parser.parse_args()
+
+    unknown = set(args.only) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown section(s): {', '.join(sorted(unknown))}")
+    if args.history:
+        print_history(args.results, args.last)
+        return
+
+    results: Results = {}
+    if "jwt" in args.only:
+        bench_jwt(results, args.repeat)
+        if args.sweep:
+            sweep_jwt(results, args.repeat)
+    if "argon2" in args.only:
+        bench_argon2(results, args.hash_repeat)
+        if args.sweep:
+            sweep_argon2(
+                results,
+                args.hash_repeat,
+                [int(cost) for cost in args.time_costs],
+                [int(cost) for cost in args.memory_costs],
+                args.target_logins,
+            )
+    if "redis" in args.only:
+        if args.fake_redis:
+            use_fake_redis()
+        target = "fakeredis" if args.fake_redis else settings.REDIS_URL
+        asyncio.run(bench_redis(results, args.repeat, args.tokens_per_user, target))
+
+    if args.save:
+        save(results, args.results)
+
+
+if __name__ == "__main__":
+    main()
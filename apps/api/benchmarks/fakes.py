@@ -0,0 +1,26 @@
+"""In-memory stand-ins for benchmarks that would otherwise need a Redis server"""
+
+import sys
+
+
+def use_fake_redis() -> None:
+    """
+    Serve every Redis pool and the pub/sub listener from one in-memory fakeredis server
+
+    Call before the first Redis access. Latencies measured against it reflect the client code
+    only, not a network round trip.
+    """
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("--fake-redis needs fakeredis (requirements-dev.txt)")
+
+    from app import cache
+    from app.pubsub import pubsub_hub
+
+    server = fakeredis.FakeServer()
+    for pool in cache.REDIS_POOLS:
+        cache._redis_clients[pool] = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    pubsub_hub.create_client = lambda: fakeredis.FakeAsyncRedis(
+        server=server, decode_responses=True
+    )
@@ -0,0 +1,116 @@
+"""
+Import-time budget check
+
+Imports each entrypoint in a fresh interpreter with `python -X importtime` and fails if its
+cumulative import time (median of several runs) exceeds the budget, or if it pulls in modules
+it must not load eagerly (e.g. passlib in the API process, FastAPI in migrations). Prints the
+packages with the most import time of their own.
+
+Budgets are set with headroom for a small container; use --scale on slower or faster hosts.
+
+Usage (from apps/api):
+    python -m benchmarks.importtime [--repeat 5] [--scale 1.0] [--top 10]
+
+Exit status is 1 when any budget is exceeded, so it can gate CI.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class Entrypoint:
+    name: str
+    modules: Tuple[str, ...]
+    budget_ms: float
+    forbidden: Tuple[str, ...] = field(default=())
+
+
+ENTRYPOINTS = (
+    # uvicorn main:app
+    Entrypoint(
+        "api",
+        ("main",),
+        budget_ms=2500,
+        forbidden=("passlib", "argon2"),  # Loaded by the startup warm-up, not at import
+    ),
+    # alembic/env.py
+    Entrypoint(
+        "migrations",
+        ("app.database", "app.core.config", "app.models"),
+        budget_ms=1000,
+        forbidden=("fastapi", "strawberry", "passlib", "redis", "prometheus_client"),
+    ),
+)
+
+
+def measure(modules: Tuple[str, ...]) -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Import `modules` in a fresh interpreter
+
+    Returns:
+        (total ms, self ms per top-level package, names of all loaded modules)
+    """
+    code = "import sys\n" + "".join(f"import {module}\n" for module in modules)
+    code += "sys.stderr.write('\\nLOADED ' + ' '.join(sys.modules) + '\\n')\n"
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+    total = 0.0
+    per_package: Dict[str, float] = defaultdict(float)
+    loaded: List[str] = []
+    for line in stderr.splitlines():
+        if line.startswith("LOADED "):
+            loaded = line.split()[1:]
+        elif line.startswith("import time:") and not line.startswith("import time: self"):
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            # Nested imports are indented below their parent
+            if not name[1:].startswith(" "):
+                total += int(cumulative_us) / 1000
+            per_package[name.strip().split(".")[0]] += int(self_us) / 1000
+
+    return total, dict(per_package), loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entrypoint (median)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply all budgets")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to show")
+    args = parser.parse_args()
+
+    failed = False
+    for entrypoint in ENTRYPOINTS:
+        runs = [measure(entrypoint.modules) for _ in range(args.repeat)]
+        total = statistics.median(run[0] for run in runs)
+        _, per_package, loaded = runs[-1]
+        budget = entrypoint.budget_ms * args.scale
+        forbidden = sorted(
+            module
+            for module in loaded
+            if any(module == name or module.startswith(f"{name}.") for name in entrypoint.forbidden)
+        )
+
+        ok = total <= budget and not forbidden
+        failed = failed or not ok
+        status = "ok" if ok else "FAIL"
+        print(f"[{status}] {entrypoint.name}: {total:.0f} ms (budget {budget:.0f} ms)")
+        for name, ms in sorted(per_package.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if forbidden:
+            print(f"    eagerly imported: {', '.join(forbidden[:10])}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
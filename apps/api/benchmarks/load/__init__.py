@@ -0,0 +1,19 @@
+"""
+API load tests
+
+Scripted scenarios (login storms, token refresh, `me`, paginated `tasks`, bulk task
+mutations) driven over HTTP against seeded users, reporting latency percentiles and
+throughput per operation and comparing them with a stored baseline.
+
+    python -m benchmarks.load.seed     # Seed users and tasks into DATABASE_URL
+    python -m benchmarks.load          # Run the scenarios (see --help)
+"""
+
+# Every seeded user has this password
+LOAD_TEST_PASSWORD = "LoadTest-123!"
+LOAD_TEST_EMAIL_DOMAIN = "loadtest.example.com"
+
+
+def user_email(index: int) -> str:
+    """Email of the index-th seeded user"""
+    return f"user{index}@{LOAD_TEST_EMAIL_DOMAIN}"
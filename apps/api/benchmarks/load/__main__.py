@@ -0,0 +1,233 @@
+"""
+API load test runner
+
+Runs each selected scenario for --duration seconds with --concurrency virtual users (after a
+--warmup), then prints count, RPS and p50/p95/p99 latency per operation. With a baseline
+file, flags operations whose p95 grew or RPS dropped by more than --tolerance and exits 1.
+
+Targets:
+    --base-url URL          A running API (start it with RATE_LIMIT_ENABLED=false, or the
+                            login and refresh scenarios measure rate limiting)
+    (default)               The app in this process over ASGI, no network; rate limiting and
+                            SQL echo are turned off. Add --fake-redis to replace Redis with
+                            fakeredis, and --postgres-container to run against a throwaway
+                            Postgres (testcontainers + Docker; migrated and seeded)
+
+Usage (from apps/api; seed first with `python -m benchmarks.load.seed`):
+    python -m benchmarks.load [--scenarios login,refresh,me,tasks,mutations]
+        [--concurrency 20] [--duration 20] [--warmup 3] [--users 100]
+        [--baseline benchmarks/load/baseline.json] [--save-baseline] [--tolerance 0.15]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+import httpx
+
+from benchmarks.fakes import use_fake_redis
+from benchmarks.load import user_email
+from benchmarks.load.scenarios import SCENARIOS, Options, VirtualUser, login
+from benchmarks.load.stats import Recorder, compare, summarize
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def start_postgres_container(stack: AsyncExitStack) -> None:
+    """Start a disposable Postgres and point DATABASE_URL (and migrations) at it"""
+    try:
+        from testcontainers.postgres import PostgresContainer
+    except ImportError:
+        sys.exit("--postgres-container needs testcontainers (requirements-dev.txt)")
+
+    container = PostgresContainer("postgres:16-alpine", driver="asyncpg")
+    container.start()
+    stack.callback(container.stop)
+    os.environ["DATABASE_URL"] = container.get_connection_url()
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], check=True)
+
+
+@asynccontextmanager
+async def in_process_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Client bound to the app in this process, with startup/shutdown run around it"""
+    import main
+
+    await main.startup_event()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app),
+            base_url="http://loadtest",
+            timeout=60,
+        ) as client:
+            yield client
+    finally:
+        await main.shutdown_event()
+
+
+@asynccontextmanager
+async def remote_client(base_url: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        yield client
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, name: str, args: argparse.Namespace, options: Options
+) -> Dict[str, dict]:
+    """Run one scenario and summarize its operations"""
+    scenario = SCENARIOS[name]
+    users = [VirtualUser(user_email(index % args.users)) for index in range(args.concurrency)]
+    if scenario.needs_login:
+        await asyncio.gather(*(login(client, user) for user in users))
+
+    recorder = Recorder()
+    deadline = time.perf_counter() + args.warmup + args.duration
+
+    async def virtual_user(user: VirtualUser) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                await scenario.step(client, user, recorder, options)
+            except Exception as e:
+                # Untimed setup work failed (e.g. re-login); back off and keep going
+                print(f"  {name}: {type(e).__name__}: {e}", file=sys.stderr)
+                await asyncio.sleep(0.1)
+
+    async def open_window() -> None:
+        await asyncio.sleep(args.warmup)
+        recorder.start_window(args.duration)
+
+    await asyncio.gather(open_window(), *(virtual_user(user) for user in users))
+    return {
+        operation: summarize(samples, args.duration)
+        for operation, samples in recorder.samples.items()
+    }
+
+
+def print_results(results: Dict[str, dict], baseline: Dict[str, dict]) -> None:
+    header = f"{'operation':<16}{'count':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header + ("   p95 vs baseline" if baseline else "") + "   errors")
+    for operation, summary in results.items():
+        line = (
+            f"{operation:<16}{summary['count']:>8}{summary['rps']:>9.1f}"
+            f"{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+        )
+        base = baseline.get(operation)
+        if base:
+            line += f"   {(summary['p95_ms'] / base['p95_ms'] - 1) * 100:>+14.1f}%"
+        elif baseline:
+            line += f"   {'-':>15}"
+        errors = ", ".join(f"{kind}={count}" for kind, count in summary["errors"].items())
+        print(f"{line}   {errors or '-'}")
+
+
+async def run(args: argparse.Namespace) -> int:
+    options = Options(page_size=args.page_size, batch_size=args.batch_size)
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = await stack.enter_async_context(
+                remote_client(args.base_url, args.concurrency)
+            )
+        else:
+            # Settings are read at import time, so configure before importing the app
+            os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+            os.environ.setdefault("DEBUG", "false")
+            if args.postgres_container:
+                start_postgres_container(stack)
+            if args.fake_redis:
+                use_fake_redis()
+            if args.postgres_container:
+                from benchmarks.load.seed import seed
+
+                await seed(args.users, args.seed_tasks, batch=5000)
+            client = await stack.enter_async_context(in_process_client())
+
+        results: Dict[str, dict] = {}
+        for name in args.scenarios:
+            print(f"Running {name} ({SCENARIOS[name].description})...", file=sys.stderr)
+            results.update(await run_scenario(client, name, args, options))
+
+    meta = {key: vars(args)[key] for key in ("concurrency", "duration", "users", "page_size")}
+    baseline: Dict[str, dict] = {}
+    if args.baseline.exists() and not args.save_baseline:
+        stored = json.loads(args.baseline.read_text())
+        baseline = stored["operations"]
+        if stored.get("meta") != meta:
+            print(
+                f"Warning: baseline was recorded with {stored.get('meta')}, this run uses {meta}",
+                file=sys.stderr,
+            )
+
+    print(
+        f"\n{args.concurrency} virtual users, {args.duration:.0f}s per scenario"
+        f" ({args.base_url or 'in-process'})\n"
+    )
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps({"meta": meta, "operations": results}, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+def parse_scenarios(value: str) -> List[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})"
+        )
+    return names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0], formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--scenarios", type=parse_scenarios, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds first")
+    parser.add_argument("--users", type=int, default=100, help="Seeded users to log in as")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=10, help="Mutations per request")
+    parser.add_argument("--base-url", help="Target a running API instead of in-process")
+    parser.add_argument("--fake-redis", action="store_true", help="In-process: use fakeredis")
+    parser.add_argument(
+        "--postgres-container",
+        action="store_true",
+        help="In-process: disposable Postgres via testcontainers (needs Docker)",
+    )
+    parser.add_argument(
+        "--seed-tasks", type=int, default=200, help="Tasks per user for --postgres-container"
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed p95/RPS change (fraction)"
+    )
+    args = parser.parse_args()
+    if args.base_url and (args.fake_redis or args.postgres_container):
+        parser.error("--fake-redis/--postgres-container only apply to in-process runs")
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
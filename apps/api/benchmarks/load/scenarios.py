@@ -0,0 +1,177 @@
+"""
+Load test scenarios
+
+Each scenario is one virtual user's loop body: it issues one or more timed operations per
+iteration. Virtual users log in (untimed) before the measurement starts, except in the login
+storm, which times the logins themselves.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.load import LOAD_TEST_PASSWORD
+from benchmarks.load.stats import OperationError, Recorder
+
+TASKS_QUERY = """
+query Tasks($first: Int, $after: String) {
+  tasks(first: $first, after: $after) {
+    nodes { id title status priority dueDate createdAt }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+ME_QUERY = "query Me { me { id email createdAt } }"
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    tasks_cursor: Optional[str] = None
+    task_ids: List[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Options:
+    page_size: int = 50
+    batch_size: int = 10  # Mutations per bulk request
+
+
+def _check(response: httpx.Response) -> Any:
+    if response.status_code >= 400:
+        raise OperationError(f"http_{response.status_code}")
+    body = response.json()
+    if isinstance(body, dict) and body.get("errors"):
+        raise OperationError("graphql")
+    return body
+
+
+async def _graphql(
+    client: httpx.AsyncClient, user: VirtualUser, query: str, variables: Optional[dict] = None
+) -> dict:
+    response = await client.post(
+        "/graphql",
+        json={"query": query, "variables": variables or {}},
+        headers={"Authorization": f"Bearer {user.access_token}"},
+    )
+    return _check(response)["data"]
+
+
+async def login(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    response = await client.post(
+        "/auth/login", json={"email": user.email, "password": LOAD_TEST_PASSWORD}
+    )
+    body = _check(response)
+    user.access_token = body["access_token"]
+    user.refresh_token = body["refresh_token"]
+
+
+async def refresh(client: httpx.AsyncClient, user: VirtualUser) -> dict:
+    response = await client.post("/auth/refresh", json={"refresh_token": user.refresh_token})
+    body = _check(response)
+    # Refresh tokens rotate: the old one is no longer valid
+    user.access_token = body["access_token"]
+    user.refresh_token = body["refresh_token"]
+    return body
+
+
+async def me(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    await _graphql(client, user, ME_QUERY)
+
+
+async def tasks_page(client: httpx.AsyncClient, user: VirtualUser, options: Options) -> None:
+    data = await _graphql(
+        client, user, TASKS_QUERY, {"first": options.page_size, "after": user.tasks_cursor}
+    )
+    page_info = data["tasks"]["pageInfo"]
+    # Walk the whole list, then start over
+    user.tasks_cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
+
+
+async def create_tasks(client: httpx.AsyncClient, user: VirtualUser, options: Options) -> None:
+    fields = " ".join(
+        f'c{i}: createTask(title: $title, priority: "low") {{ id }}'
+        for i in range(options.batch_size)
+    )
+    data = await _graphql(
+        client, user, f"mutation CreateTasks($title: String!) {{ {fields} }}", {"title": "Load"}
+    )
+    user.task_ids = [task["id"] for task in data.values()]
+
+
+async def update_tasks(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    fields = " ".join(
+        f'u{i}: updateTask(id: "{task_id}", status: "done") {{ id }}'
+        for i, task_id in enumerate(user.task_ids)
+    )
+    await _graphql(client, user, f"mutation UpdateTasks {{ {fields} }}")
+
+
+async def delete_tasks(client: httpx.AsyncClient, user: VirtualUser) -> None:
+    fields = " ".join(
+        f'd{i}: deleteTask(id: "{task_id}")' for i, task_id in enumerate(user.task_ids)
+    )
+    await _graphql(client, user, f"mutation DeleteTasks {{ {fields} }}")
+    user.task_ids = []
+
+
+Step = Callable[[httpx.AsyncClient, VirtualUser, Recorder, Options], Awaitable[None]]
+
+
+async def _login_step(
+    client: httpx.AsyncClient, user: VirtualUser, recorder: Recorder, options: Options
+) -> None:
+    await recorder.timed("login", lambda: login(client, user))
+
+
+async def _refresh_step(
+    client: httpx.AsyncClient, user: VirtualUser, recorder: Recorder, options: Options
+) -> None:
+    if await recorder.timed("refresh", lambda: refresh(client, user)) is None:
+        # The refresh token may have been consumed: start a new session
+        await login(client, user)
+
+
+async def _me_step(
+    client: httpx.AsyncClient, user: VirtualUser, recorder: Recorder, options: Options
+) -> None:
+    await recorder.timed("me", lambda: me(client, user))
+
+
+async def _tasks_step(
+    client: httpx.AsyncClient, user: VirtualUser, recorder: Recorder, options: Options
+) -> None:
+    await recorder.timed("tasks_page", lambda: tasks_page(client, user, options))
+
+
+async def _mutations_step(
+    client: httpx.AsyncClient, user: VirtualUser, recorder: Recorder, options: Options
+) -> None:
+    await recorder.timed("create_tasks", lambda: create_tasks(client, user, options))
+    if user.task_ids:
+        await recorder.timed("update_tasks", lambda: update_tasks(client, user))
+        await recorder.timed("delete_tasks", lambda: delete_tasks(client, user))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    step: Step
+    needs_login: bool = True  # Log in before measuring
+    description: str = ""
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("login", _login_step, needs_login=False, description="Login storm"),
+        Scenario("refresh", _refresh_step, description="Refresh token rotation"),
+        Scenario("me", _me_step, description="Current user query"),
+        Scenario("tasks", _tasks_step, description="Paginated tasks query"),
+        Scenario("mutations", _mutations_step, description="Bulk create/update/delete"),
+    )
+}
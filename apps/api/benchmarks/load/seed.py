@@ -0,0 +1,128 @@
+"""
+Seed users and tasks for load tests
+
+Creates --users users (user<n>@loadtest.example.com, password LOAD_TEST_PASSWORD) with
+--tasks tasks each, spread over the last 90 days, in bulk inserts against DATABASE_URL.
+Previously seeded load-test users and their tasks are removed first, so every run starts from
+the same data set. Other users are left alone.
+
+Usage (from apps/api, after `alembic upgrade head`):
+    python -m benchmarks.load.seed [--users 100] [--tasks 200] [--batch 5000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from typing import List
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, insert, select
+
+from app.cache import close_redis
+from app.database import engine
+from app.models import Task, TaskPriority, TaskStatus, TaskTombstone, User
+from app.services.user_cache import user_cache
+from app.services.user_service import get_pwd_context
+from benchmarks.load import LOAD_TEST_EMAIL_DOMAIN, LOAD_TEST_PASSWORD, user_email
+
+# Titles/descriptions are built from these so search has realistic hits
+WORDS = (
+    "review deploy write plan fix update call email prepare design test refactor migrate "
+    "release budget report invoice meeting roadmap backlog onboarding customer feedback "
+    "database cache latency dashboard mobile sprint retro hiring contract"
+).split()
+
+
+def make_tasks(user_id: UUID, count: int, now: datetime, rng: random.Random) -> List[dict]:
+    tasks = []
+    for _ in range(count):
+        created_at = now - timedelta(seconds=rng.randrange(90 * 24 * 3600))
+        title = " ".join(rng.choices(WORDS, k=rng.randint(2, 5))).capitalize()
+        tasks.append(
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "title": title,
+                "description": (
+                    " ".join(rng.choices(WORDS, k=rng.randint(5, 30)))
+                    if rng.random() < 0.7
+                    else None
+                ),
+                "status": rng.choice(list(TaskStatus)),
+                "priority": rng.choice(list(TaskPriority)),
+                "due_date": (
+                    (created_at + timedelta(days=rng.randint(1, 30))).date()
+                    if rng.random() < 0.5
+                    else None
+                ),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    return tasks
+
+
+async def seed(users: int, tasks_per_user: int, batch: int, random_seed: int = 42) -> None:
+    """Replace the load-test users and tasks"""
+    rng = random.Random(random_seed)
+    # One hash for everyone: hashing is deliberately slow
+    password_hash = get_pwd_context().hash(LOAD_TEST_PASSWORD)
+    now = datetime.now(UTC)
+    started = time.perf_counter()
+
+    async with engine.begin() as conn:
+        is_seeded = User.email.like(f"%@{LOAD_TEST_EMAIL_DOMAIN}")
+        old_users = (await conn.execute(select(User.id, User.email).where(is_seeded))).all()
+        seeded = select(User.id).where(is_seeded)
+        await conn.execute(delete(TaskTombstone).where(TaskTombstone.user_id.in_(seeded)))
+        await conn.execute(delete(Task).where(Task.user_id.in_(seeded)))
+        await conn.execute(delete(User).where(User.id.in_(seeded)))
+
+        user_rows = [
+            {"id": uuid4(), "email": user_email(index), "password_hash": password_hash}
+            for index in range(users)
+        ]
+        for offset in range(0, len(user_rows), batch):
+            await conn.execute(insert(User), user_rows[offset : offset + batch])
+
+        pending: List[dict] = []
+        inserted = 0
+        for user in user_rows:
+            pending.extend(make_tasks(user["id"], tasks_per_user, now, rng))
+            if len(pending) >= batch:
+                await conn.execute(insert(Task), pending)
+                inserted += len(pending)
+                pending = []
+        if pending:
+            await conn.execute(insert(Task), pending)
+            inserted += len(pending)
+
+    # A running API may still cache the replaced users (by ID and by email)
+    for old_user in old_users:
+        await user_cache.invalidate(old_user.id, old_user.email)
+
+    elapsed = time.perf_counter() - started
+    print(f"Seeded {users} users and {inserted} tasks in {elapsed:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks per user")
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per INSERT")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            await seed(args.users, args.tasks, args.batch)
+        finally:
+            await engine.dispose()
+            await close_redis()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
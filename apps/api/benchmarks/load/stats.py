@@ -0,0 +1,105 @@
+"""Latency recording, summaries and baseline comparison for load tests"""
+
+import math
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class OperationError(Exception):
+    """A request completed but failed (HTTP error status or GraphQL errors)"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        super().__init__(kind)
+
+
+@dataclass
+class OperationSamples:
+    latencies: List[float] = field(default_factory=list)  # Seconds, successful requests
+    errors: Counter = field(default_factory=Counter)  # By kind, e.g. "http_429"
+
+
+class Recorder:
+    """Times operations, keeping only those started inside the measurement window"""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, OperationSamples] = defaultdict(OperationSamples)
+        self.window_start = math.inf
+        self.window_end = math.inf
+
+    def start_window(self, seconds: float) -> None:
+        self.window_start = time.perf_counter()
+        self.window_end = self.window_start + seconds
+
+    async def timed(self, operation: str, call: Callable[[], Awaitable[T]]) -> Optional[T]:
+        """
+        Run and time one operation
+
+        Returns:
+            The call's result, or None if it raised (recorded as an error)
+        """
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except OperationError as e:
+            error: Optional[str] = e.kind
+            result = None
+        except Exception as e:
+            error = type(e).__name__
+            result = None
+        else:
+            error = None
+        if self.window_start <= started < self.window_end:
+            if error is None:
+                self.samples[operation].latencies.append(time.perf_counter() - started)
+            else:
+                self.samples[operation].errors[error] += 1
+        return result
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: OperationSamples, seconds: float) -> dict:
+    """Count, RPS, p50/p95/p99 (ms) and errors of one operation over a window"""
+    latencies = sorted(samples.latencies)
+    return {
+        "count": len(latencies),
+        "rps": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": dict(samples.errors),
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Regressions of `current` against `baseline` (both {operation: summary})
+
+    An operation regresses when its p95 latency grows or its RPS drops by more than
+    `tolerance` (a fraction), or when it fails where the baseline didn't.
+    """
+    regressions = []
+    for operation, summary in current.items():
+        base = baseline.get(operation)
+        if base is None:
+            continue
+        if summary["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{operation}: p95 {summary['p95_ms']:.1f} ms vs {base['p95_ms']:.1f} ms"
+            )
+        if summary["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{operation}: {summary['rps']:.1f} rps vs {base['rps']:.1f} rps")
+        if summary["errors"] and not base["errors"]:
+            regressions.append(f"{operation}: errors {summary['errors']}")
+    return regressions
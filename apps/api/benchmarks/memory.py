@@ -0,0 +1,210 @@
+"""
+Memory benchmark: resolving a 10k-task connection
+
+Builds the GraphQL output objects from column rows the way the tasks resolver does, executes
+the query and encodes the response. Measures memory held by the output objects, peak traced
+allocations, peak RSS growth and GC collections/pause time for the slotted Task type and for an
+equivalent __dict__-backed type.
+Each variant runs in a fresh subprocess so RSS peaks don't mix. No database needed.
+
+Usage (from apps/api):
+    python -m benchmarks.memory [--tasks 10000]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from typing import List, Optional
+
+import strawberry
+
+from app.core import serialization
+from app.graphql.encoding import SCALAR_OVERRIDES
+from app.graphql.pagination import PageInfo
+from app.graphql.schema import Task
+from app.models.task import TaskPriority, TaskStatus
+
+QUERY = """
+query {
+  tasks {
+    nodes { id title description status priority dueDate userId createdAt updatedAt }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+class FakeRow:
+    """Stand-in for a SQLAlchemy Row (from_row only uses _mapping)"""
+
+    __slots__ = ("_mapping",)
+
+    def __init__(self, mapping: dict):
+        self._mapping = mapping
+
+
+@strawberry.type(name="Task")
+class DictTask:
+    """Task without __slots__ (the previous representation)"""
+
+    id: str
+    title: str
+    description: Optional[str]
+    status: str
+    priority: str
+    due_date: Optional[date]
+    user_id: str
+    created_at: datetime
+    updated_at: datetime
+
+    from_row = classmethod(Task.from_row.__func__)
+    from_mapping = classmethod(Task.from_mapping.__func__)
+
+
+def make_rows(count: int) -> List[FakeRow]:
+    now = datetime.now(UTC)
+    user_id = uuid.uuid4()
+    statuses, priorities = list(TaskStatus), list(TaskPriority)
+    return [
+        FakeRow(
+            {
+                "id": uuid.uuid4(),
+                "title": f"Task {i}",
+                "description": "Lorem ipsum dolor sit amet" if i % 2 else None,
+                "status": statuses[i % 3],
+                "priority": priorities[i % 3],
+                "due_date": date.today() + timedelta(days=i % 30) if i % 4 else None,
+                "user_id": user_id,
+                "created_at": now - timedelta(seconds=i),
+                "updated_at": now,
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def make_schema(task_type: type, rows: List[FakeRow]) -> strawberry.Schema:
+    @strawberry.type(name="TaskConnection")
+    class Connection:
+        nodes: List[task_type]
+        page_info: PageInfo
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def tasks(self) -> Connection:
+            return Connection(
+                nodes=[task_type.from_row(row) for row in rows],
+                page_info=PageInfo(has_next_page=False, end_cursor=None),
+            )
+
+    return strawberry.Schema(query=Query, scalar_overrides=SCALAR_OVERRIDES)
+
+
+def run_variant(variant: str, count: int) -> dict:
+    task_type = Task if variant == "slots" else DictTask
+    rows = make_rows(count)
+    schema = make_schema(task_type, rows)
+
+    # Untraced run first, so peak RSS reflects a single execution
+    gc_pause = 0.0
+    gc_collections = 0
+    gc_started = 0.0
+
+    def on_gc(phase: str, info: dict) -> None:
+        nonlocal gc_pause, gc_collections, gc_started
+        if phase == "start":
+            gc_started = time.perf_counter()
+        else:
+            gc_collections += 1
+            gc_pause += time.perf_counter() - gc_started
+
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    gc.callbacks.append(on_gc)
+    started = time.perf_counter()
+    result = asyncio.run(schema.execute(QUERY))
+    body = serialization.dumps({"data": result.data})
+    elapsed = time.perf_counter() - started
+    gc.callbacks.remove(on_gc)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    assert not result.errors, result.errors
+    response_bytes = len(body)
+    del result, body
+
+    # Memory retained by the output objects alone
+    gc.collect()
+    tracemalloc.start()
+    objects = [task_type.from_row(row) for row in rows]
+    objects_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    # Peak allocations while executing and encoding
+    gc.collect()
+    tracemalloc.start()
+    result = asyncio.run(schema.execute(QUERY))
+    body = serialization.dumps({"data": result.data})
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result, body
+
+    return {
+        "variant": variant,
+        "tasks": count,
+        "bytes": response_bytes,
+        "objects_bytes": objects_bytes,
+        "traced_peak_bytes": traced_peak,
+        "rss_growth_kib": rss_after - rss_before,  # ru_maxrss is KiB on Linux
+        "gc_collections": gc_collections,
+        "gc_pause_seconds": gc_pause,
+        "seconds": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--variant", choices=("dict", "slots"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.tasks)))
+        return
+
+    results = {}
+    for variant in ("dict", "slots"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.memory", "--tasks", str(args.tasks)]
+            + ["--variant", variant],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[variant] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{args.tasks} tasks, {results['slots']['bytes'] / 1024:.0f} KiB response\n")
+    print(f"{'':24}{'__dict__':>14}{'__slots__':>14}")
+    rows = (
+        ("output objects (MiB)", "objects_bytes", 1024 * 1024),
+        ("traced peak (MiB)", "traced_peak_bytes", 1024 * 1024),
+        ("peak RSS growth (MiB)", "rss_growth_kib", 1024),
+        ("GC collections", "gc_collections", 1),
+        ("GC pause (ms)", "gc_pause_seconds", 0.001),
+        ("wall time (ms)", "seconds", 0.001),
+    )
+    for label, key, scale in rows:
+        before, after = results["dict"][key] / scale, results["slots"][key] / scale
+        print(f"{label:<24}{before:>14.2f}{after:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Serialization micro-benchmark: a 500-task GraphQL response
+
+Compares the previous path (Strawberry isoformat() scalars + stdlib json) with the current one
+(pass-through temporal scalars + orjson), for schema execution plus encoding and for encoding
+alone. No database or Redis needed.
+
+Usage (from apps/api):
+    python -m benchmarks.serialization [--tasks 500] [--repeat 200]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from typing import Callable, List
+
+import strawberry
+
+from app.core import serialization
+from app.graphql.encoding import SCALAR_OVERRIDES
+from app.graphql.schema import Task
+
+QUERY = """
+query {
+  tasks {
+    id title description status priority dueDate userId createdAt updatedAt
+  }
+}
+"""
+
+
+def make_tasks(count: int) -> List[Task]:
+    now = datetime.now(UTC)
+    user_id = str(uuid.uuid4())
+    return [
+        Task(
+            id=str(uuid.uuid4()),
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing" if i % 2 else None,
+            status=("todo", "in_progress", "done")[i % 3],
+            priority=("low", "medium", "high")[i % 3],
+            due_date=date.today() + timedelta(days=i % 30) if i % 4 else None,
+            user_id=user_id,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def make_schema(tasks: List[Task], **kwargs) -> strawberry.Schema:
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def tasks(self) -> List[Task]:
+            return tasks
+
+    return strawberry.Schema(query=Query, **kwargs)
+
+
+def measure(fn: Callable[[], object], repeat: int) -> List[float]:
+    fn()  # Warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> float:
+    timings = sorted(timings)
+    median = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"  {name:<28} median {median * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    stdlib_schema = make_schema(tasks)
+    fast_schema = make_schema(tasks, scalar_overrides=SCALAR_OVERRIDES)
+
+    def execute(schema: strawberry.Schema) -> dict:
+        result = asyncio.run(schema.execute(QUERY))
+        assert not result.errors, result.errors
+        return {"data": result.data}
+
+    stdlib_payload = execute(stdlib_schema)
+    fast_payload = execute(fast_schema)
+
+    # Both paths must produce the same JSON document
+    assert json.loads(json.dumps(stdlib_payload)) == serialization.loads(
+        serialization.dumps(fast_payload)
+    )
+    size = len(serialization.dumps(fast_payload))
+    print(f"{args.tasks} tasks, {size / 1024:.1f} KiB response, {args.repeat} runs\n")
+
+    print("Encode only:")
+    before = report("stdlib json", measure(lambda: json.dumps(stdlib_payload), args.repeat))
+    after = report("orjson", measure(lambda: serialization.dumps(fast_payload), args.repeat))
+    print(f"  speedup: {before / after:.1f}x\n")
+
+    print("Execute + encode:")
+    before = report(
+        "isoformat scalars + json",
+        measure(lambda: json.dumps(execute(stdlib_schema)), args.repeat),
+    )
+    after = report(
+        "native scalars + orjson",
+        measure(lambda: serialization.dumps(execute(fast_schema)), args.repeat),
+    )
+    print(f"  speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,24 @@ TaskFlow FastAPI Application Entry Point
 """
 
 import structlog
+from app.auth.keys import JWKS_MAX_AGE_SECONDS, get_key_ring
 from app.auth.routes import router as auth_router
-from app.cache import close_redis, get_redis
+from app.cache import REDIS_POOLS, close_redis, get_redis, start_near_cache
 from app.core.config import settings
 from app.core.errors import setup_exception_handlers
 from app.graphql.context import get_context
+from app.graphql.encoding import FastGraphQLRouter
 from app.graphql.schema import schema
-from app.middleware.rate_limit import setup_rate_limiting
+from app.middleware.authentication import AuthenticationMiddleware
+from app.middleware.rate_limit import setup_rate_limiting, trusted_proxies
+from app.pubsub import pubsub_hub
+from app.services.token_revocation import token_revocation
+from app.services.user_cache import user_cache
+from app.services.user_service import get_pwd_context
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from prometheus_client import Counter, Histogram, make_asgi_app
-from strawberry.fastapi import GraphQLRouter
 
 logger = structlog.get_logger(__name__)
 
@@ -22,6 +28,7 @@ app = FastAPI(
     title="TaskFlow API",
     description="TaskFlow GraphQL API",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -49,6 +56,9 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Verify the access token once per request; handlers read request.state.principal
+app.add_middleware(AuthenticationMiddleware)
+
 # Setup exception handlers
 setup_exception_handlers(app)
 
@@ -66,7 +76,7 @@ REQUEST_DURATION = Histogram(
 )
 
 # GraphQL endpoint
-graphql_app = GraphQLRouter(schema, context_getter=get_context)
+graphql_app = FastGraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_app, prefix="/graphql")
 
 # Auth routes
@@ -76,14 +86,30 @@ app.include_router(auth_router, prefix="/auth", tags=["auth"])
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
-    # Initialize Redis connection pool
-    await get_redis()
+    # Initialize Redis connection pools
+    for pool in REDIS_POOLS:
+        await get_redis(pool)
+    await start_near_cache()
+    await pubsub_hub.start()
+    if settings.USER_CACHE_ENABLED:
+        await user_cache.start()
+    if settings.TOKEN_REVOCATION_FILTER_ENABLED:
+        await token_revocation.start()
+    # Load the password hashing backends now rather than on the first login
+    get_pwd_context()
+    # Parse the JWT keys now: a bad key configuration fails startup, not the first login
+    get_key_ring()
+    # Same for TRUSTED_PROXIES, rather than the first rate limited request
+    trusted_proxies()
     logger.info("Application startup complete")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    await user_cache.stop()
+    await token_revocation.stop()
+    await pubsub_hub.stop()
     await close_redis()
     logger.info("Application shutdown complete")
 
@@ -91,7 +117,7 @@ async def shutdown_event():
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "message": "Welcome to TaskFlow API",
             "version": "0.1.0",
@@ -108,7 +134,7 @@ async def root():
 @app.get("/api")
 async def api_info():
     """API information endpoint"""
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "message": "TaskFlow API",
             "version": "0.1.0",
@@ -118,22 +144,31 @@ async def api_info():
     )
 
 
+@app.get("/.well-known/jwks.json")
+async def jwks():
+    """Public keys for verifying access tokens (empty with a shared-secret JWT_ALGORITHM)"""
+    return ORJSONResponse(
+        get_key_ring().jwks(),
+        headers={"Cache-Control": f"public, max-age={JWKS_MAX_AGE_SECONDS}"},
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return JSONResponse({"status": "healthy"})
+    return ORJSONResponse({"status": "healthy"})
 
 
 @app.get("/ready")
 async def readiness_check():
     """Readiness check endpoint"""
-    return JSONResponse({"status": "ready"})
+    return ORJSONResponse({"status": "ready"})
 
 
 @app.options("/{full_path:path}")
 async def options_handler(full_path: str):
     """Handle OPTIONS requests for CORS preflight"""
-    return JSONResponse(
+    return ORJSONResponse(
         content={},
         headers={
             "Access-Control-Allow-Origin": "*",
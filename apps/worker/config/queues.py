@@ -0,0 +1,137 @@
+"""Celery queue topology, routing and per-queue worker profiles"""
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Iterable, List, Optional
+
+from kombu import Exchange, Queue
+
+
+@dataclass(frozen=True)
+class QueueProfile:
+    """Worker tuning for a queue (prefetch, time limits, recycling and concurrency)"""
+
+    prefetch_multiplier: int
+    soft_time_limit: int
+    time_limit: int
+    max_tasks_per_child: int
+    concurrency: int
+
+
+# Queue profiles
+# - realtime: short jobs that go stale if they wait (password rehashes); one message per
+#   process so a slow job never holds others back, tight limits so a stuck job can't hold a
+#   slot for long
+# - default: anything not explicitly routed
+# - analytics: long-running aggregations/backfills; one message per process at a time
+# - bulk_io: imports/exports/archival; long limits, frequent recycling to cap memory growth
+QUEUE_PROFILES: dict[str, QueueProfile] = {
+    "realtime": QueueProfile(
+        prefetch_multiplier=1,
+        soft_time_limit=25,  # 25 seconds
+        time_limit=30,  # 30 seconds
+        max_tasks_per_child=5000,
+        concurrency=8,
+    ),
+    "default": QueueProfile(
+        prefetch_multiplier=1,
+        soft_time_limit=25 * 60,  # 25 minutes
+        time_limit=30 * 60,  # 30 minutes
+        max_tasks_per_child=1000,
+        concurrency=4,
+    ),
+    "analytics": QueueProfile(
+        prefetch_multiplier=1,
+        soft_time_limit=55 * 60,  # 55 minutes
+        time_limit=60 * 60,  # 1 hour
+        max_tasks_per_child=50,
+        concurrency=2,
+    ),
+    "bulk_io": QueueProfile(
+        prefetch_multiplier=1,
+        soft_time_limit=115 * 60,  # 1 hour 55 minutes
+        time_limit=120 * 60,  # 2 hours
+        max_tasks_per_child=100,
+        concurrency=2,
+    ),
+}
+
+DEFAULT_QUEUE = "default"
+
+TASK_QUEUES = tuple(
+    Queue(name, Exchange(name, type="direct"), routing_key=name) for name in QUEUE_PROFILES
+)
+
+# Task name patterns -> queue (first match wins, unmatched tasks go to DEFAULT_QUEUE)
+TASK_ROUTES: dict[str, dict[str, str]] = {
+    "tasks.analytics.*": {"queue": "analytics", "routing_key": "analytics"},
+    "tasks.archival.*": {"queue": "bulk_io", "routing_key": "bulk_io"},
+    # One hash per job, and requests expire (PASSWORD_REHASH_MAX_AGE_SECONDS): they can't wait
+    # behind hours-long bulk_io runs. The task's rate limit keeps them from crowding realtime
+    "tasks.auth.*": {"queue": "realtime", "routing_key": "realtime"},
+}
+
+
+def queue_for_task(task_name: str) -> str:
+    """Return the queue a task is routed to"""
+    for pattern, route in TASK_ROUTES.items():
+        if fnmatchcase(task_name, pattern):
+            return route["queue"]
+    return DEFAULT_QUEUE
+
+
+def parse_queues(value: str) -> List[str]:
+    """
+    Parse a comma-separated queue list (e.g. "realtime,default")
+
+    Raises:
+        ValueError: If the list is empty or names an unknown queue
+    """
+    queues = [name.strip() for name in value.split(",") if name.strip()]
+    if not queues:
+        raise ValueError("At least one queue must be selected")
+
+    unknown = [name for name in queues if name not in QUEUE_PROFILES]
+    if unknown:
+        raise ValueError(
+            f"Unknown queue(s): {', '.join(unknown)}. "
+            f"Valid queues: {', '.join(QUEUE_PROFILES)}"
+        )
+
+    return list(dict.fromkeys(queues))
+
+
+def resolve_profile(queues: Iterable[str]) -> QueueProfile:
+    """
+    Combine the profiles of the queues consumed by one worker process
+
+    The most conservative value wins: the lowest prefetch and recycling thresholds (so a
+    light queue never hoards messages behind a heavy job) and the highest time limits
+    (so a heavy job is never killed by a light queue's limit).
+    """
+    profiles = [QUEUE_PROFILES[name] for name in queues]
+    return QueueProfile(
+        prefetch_multiplier=min(p.prefetch_multiplier for p in profiles),
+        soft_time_limit=max(p.soft_time_limit for p in profiles),
+        time_limit=max(p.time_limit for p in profiles),
+        max_tasks_per_child=min(p.max_tasks_per_child for p in profiles),
+        concurrency=max(p.concurrency for p in profiles),
+    )
+
+
+class QueueTimeLimits:
+    """
+    Celery task annotation applying the time limits of the queue a task is routed to
+
+    Keeps per-queue limits intact when one worker process consumes several queues.
+    """
+
+    def annotate(self, task) -> Optional[dict]:
+        profile = QUEUE_PROFILES[queue_for_task(task.name)]
+        return {
+            "soft_time_limit": profile.soft_time_limit,
+            "time_limit": profile.time_limit,
+        }
+
+    def annotate_any(self) -> Optional[dict]:
+        return None
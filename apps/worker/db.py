@@ -0,0 +1,34 @@
+"""
+Database access for tasks
+
+Celery tasks are synchronous and each call to `run()` drives its own event loop, so
+connections are not pooled across tasks (an asyncpg connection is bound to the loop that
+opened it). Tasks that touch the database are batch jobs where one connect per run is noise.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config.settings import settings
+
+T = TypeVar("T")
+
+
+@asynccontextmanager
+async def connect() -> AsyncIterator[AsyncConnection]:
+    """Connection for one task run (commit explicitly: uncommitted work is rolled back on exit)"""
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            yield connection
+    finally:
+        await engine.dispose()
+
+
+def run(job: Callable[[], Awaitable[T]]) -> T:
+    """Run a coroutine function to completion from a (synchronous) task"""
+    return asyncio.run(job())
@@ -0,0 +1,21 @@
+"""Dead-letter queue for tasks that exhausted their retries"""
+
+from dlq.store import (
+    DeadLetter,
+    count_dead_letters,
+    dead_letter,
+    delete_dead_letters,
+    get_dead_letter,
+    iter_dead_letters,
+    record_retry,
+)
+
+__all__ = [
+    "DeadLetter",
+    "count_dead_letters",
+    "dead_letter",
+    "delete_dead_letters",
+    "get_dead_letter",
+    "iter_dead_letters",
+    "record_retry",
+]
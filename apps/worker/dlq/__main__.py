@@ -0,0 +1,207 @@
+"""
+Dead-letter queue CLI
+
+Usage:
+    python -m dlq stats
+    python -m dlq list [--task PATTERN] [--exception NAME] [--since ISO] [--limit N]
+    python -m dlq show ENTRY_ID
+    python -m dlq replay [filters] [--rate N] [--limit N] [--dry-run] [--keep]
+    python -m dlq purge [filters] [--yes]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from dlq.store import (
+    DeadLetter,
+    count_dead_letters,
+    delete_dead_letters,
+    get_dead_letter,
+    iter_dead_letters,
+)
+
+# Delete replayed entries in batches rather than one XDEL per task
+DELETE_BATCH_SIZE = 100
+
+
+def _parse_since(value: str) -> datetime:
+    """ISO 8601 timestamp; without an offset it is taken as UTC, like the stored entries"""
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid ISO timestamp: {value}")
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since
+
+
+def _add_filters(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--task", help="Glob matched against the task name")
+    parser.add_argument("--exception", help="Exception class name (exact match)")
+    parser.add_argument("--since", type=_parse_since, help="Only entries at or after (ISO 8601)")
+    parser.add_argument("--limit", type=int, help="Maximum number of entries")
+
+
+def _select(args: argparse.Namespace) -> Iterator[DeadLetter]:
+    letters = iter_dead_letters(
+        task_pattern=args.task,
+        exception_type=args.exception,
+        since=args.since,
+    )
+    for index, letter in enumerate(letters):
+        if args.limit is not None and index >= args.limit:
+            return
+        yield letter
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    by_task: Counter = Counter()
+    by_exception: Counter = Counter()
+    for letter in iter_dead_letters():
+        by_task[letter.task_name] += 1
+        by_exception[letter.exception_type] += 1
+
+    print(f"Total: {count_dead_letters()}")
+    print("\nBy task:")
+    for name, count in by_task.most_common():
+        print(f"  {count:>8}  {name}")
+    print("\nBy exception:")
+    for name, count in by_exception.most_common():
+        print(f"  {count:>8}  {name}")
+    return 0
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    for letter in _select(args):
+        print(
+            f"{letter.entry_id}  {letter.failed_at}  {letter.task_name}  "
+            f"[{letter.queue}]  {letter.exception_type}: {letter.exception_message[:120]}"
+        )
+    return 0
+
+
+def cmd_show(args: argparse.Namespace) -> int:
+    letter = get_dead_letter(args.entry_id)
+    if letter is None:
+        print(f"Dead letter {args.entry_id} not found", file=sys.stderr)
+        return 1
+
+    print(json.dumps(letter.__dict__, indent=2, default=str))
+    return 0
+
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    # Imported lazily so read-only commands don't need the Celery app configured
+    from main import app
+
+    if args.rate <= 0:
+        print("--rate must be positive", file=sys.stderr)
+        return 2
+
+    interval = 1.0 / args.rate
+    replayed = 0
+    pending_delete: List[str] = []
+    next_send = time.monotonic()
+
+    try:
+        for letter in _select(args):
+            if args.dry_run:
+                print(f"Would replay {letter.entry_id} {letter.task_name} -> {letter.queue}")
+                replayed += 1
+                continue
+
+            # Pace sends so a large replay doesn't stampede the queue (and the database)
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_send = max(next_send, time.monotonic()) + interval
+
+            result = app.send_task(
+                letter.task_name,
+                args=letter.args,
+                kwargs=letter.kwargs,
+                queue=letter.queue or None,
+                headers={"dlq_entry_id": letter.entry_id, "dlq_task_id": letter.task_id},
+            )
+            print(f"Replayed {letter.entry_id} {letter.task_name} as {result.id}")
+            replayed += 1
+
+            if not args.keep:
+                pending_delete.append(letter.entry_id)
+                if len(pending_delete) >= DELETE_BATCH_SIZE:
+                    delete_dead_letters(pending_delete)
+                    pending_delete = []
+    except Exception as e:
+        print(f"Replay stopped after {replayed} task(s): {e}", file=sys.stderr)
+        return 1
+    finally:
+        # Whatever was sent must leave the stream, or the next replay runs it twice
+        delete_dead_letters(pending_delete)
+
+    print(f"{'Would replay' if args.dry_run else 'Replayed'} {replayed} task(s)")
+    return 0
+
+
+def cmd_purge(args: argparse.Namespace) -> int:
+    entry_ids = [letter.entry_id for letter in _select(args)]
+    if not entry_ids:
+        print("Nothing to purge")
+        return 0
+
+    if not args.yes:
+        answer = input(f"Permanently delete {len(entry_ids)} dead letter(s)? [y/N] ")
+        if answer.strip().lower() != "y":
+            print("Cancelled")
+            return 1
+
+    deleted = 0
+    for start in range(0, len(entry_ids), DELETE_BATCH_SIZE):
+        deleted += delete_dead_letters(entry_ids[start : start + DELETE_BATCH_SIZE])
+    print(f"Purged {deleted} dead letter(s)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m dlq", description="Inspect and replay DLQ")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser("stats", help="Counts by task and exception")
+    stats.set_defaults(func=cmd_stats)
+
+    list_ = commands.add_parser("list", help="List dead letters")
+    _add_filters(list_)
+    list_.set_defaults(func=cmd_list)
+
+    show = commands.add_parser("show", help="Show one dead letter with traceback and retries")
+    show.add_argument("entry_id")
+    show.set_defaults(func=cmd_show)
+
+    replay = commands.add_parser("replay", help="Re-enqueue dead letters")
+    _add_filters(replay)
+    replay.add_argument(
+        "--rate", type=float, default=5.0, help="Tasks enqueued per second (default: 5)"
+    )
+    replay.add_argument("--dry-run", action="store_true", help="Show what would be replayed")
+    replay.add_argument("--keep", action="store_true", help="Keep entries after replaying")
+    replay.set_defaults(func=cmd_replay)
+
+    purge = commands.add_parser("purge", help="Delete dead letters")
+    _add_filters(purge)
+    purge.add_argument("--yes", action="store_true", help="Don't ask for confirmation")
+    purge.set_defaults(func=cmd_purge)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
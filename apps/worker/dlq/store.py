@@ -0,0 +1,212 @@
+"""Dead-letter storage backed by a Redis stream"""
+
+import json
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from typing import Any, Iterator, List, Optional
+
+import redis
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+RETRY_HISTORY_PREFIX = "dlq:retries:"
+
+# Keep stored tracebacks bounded so a deep stack can't bloat the stream
+MAX_TRACEBACK_CHARS = 8000
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get Redis client instance (singleton)"""
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+    return _redis_client
+
+
+@dataclass
+class DeadLetter:
+    """A dead-lettered task as stored in the stream"""
+
+    entry_id: str
+    task_id: str
+    task_name: str
+    queue: str
+    args: List[Any]
+    kwargs: dict
+    exception_type: str
+    exception_message: str
+    traceback: str
+    retries: List[dict]
+    failed_at: str
+
+    @classmethod
+    def from_entry(cls, entry_id: str, fields: dict) -> "DeadLetter":
+        """Build from a raw stream entry"""
+        return cls(
+            entry_id=entry_id,
+            task_id=fields.get("task_id", ""),
+            task_name=fields.get("task_name", ""),
+            queue=fields.get("queue", ""),
+            args=json.loads(fields.get("args", "[]")),
+            kwargs=json.loads(fields.get("kwargs", "{}")),
+            exception_type=fields.get("exception_type", ""),
+            exception_message=fields.get("exception_message", ""),
+            traceback=fields.get("traceback", ""),
+            retries=json.loads(fields.get("retries", "[]")),
+            failed_at=fields.get("failed_at", ""),
+        )
+
+
+def record_retry(task_id: str, attempt: int, exc: BaseException) -> None:
+    """
+    Append a retry attempt to the task's retry history
+
+    Args:
+        task_id: Celery task ID
+        attempt: Retry number (0 for the first retry)
+        exc: Exception that triggered the retry
+    """
+    key = f"{RETRY_HISTORY_PREFIX}{task_id}"
+    entry = {
+        "attempt": attempt,
+        "exception_type": type(exc).__name__,
+        "exception_message": str(exc),
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    pipe = get_redis().pipeline()
+    pipe.rpush(key, json.dumps(entry))
+    pipe.expire(key, settings.DLQ_RETRY_HISTORY_TTL_SECONDS)
+    pipe.execute()
+
+
+def dead_letter(
+    task_id: str,
+    task_name: str,
+    queue: str,
+    args: Any,
+    kwargs: Any,
+    exc: BaseException,
+    einfo: Any = None,
+) -> str:
+    """
+    Record a task that failed after its final retry
+
+    Args:
+        task_id: Celery task ID
+        task_name: Registered task name
+        queue: Queue the task was consumed from (used on replay)
+        args: Positional task arguments
+        kwargs: Keyword task arguments
+        exc: Final exception
+        einfo: Celery ExceptionInfo, if available
+
+    Returns:
+        Stream entry ID
+    """
+    client = get_redis()
+    history_key = f"{RETRY_HISTORY_PREFIX}{task_id}"
+    retries = [json.loads(item) for item in client.lrange(history_key, 0, -1)]
+
+    if einfo is not None:
+        tb = str(einfo.traceback)
+    else:
+        tb = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+
+    fields = {
+        "task_id": task_id,
+        "task_name": task_name,
+        "queue": queue,
+        "args": json.dumps(list(args or []), default=str),
+        "kwargs": json.dumps(dict(kwargs or {}), default=str),
+        "exception_type": type(exc).__name__,
+        "exception_message": str(exc),
+        "traceback": tb[-MAX_TRACEBACK_CHARS:],
+        "retries": json.dumps(retries),
+        "failed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    pipe = client.pipeline()
+    pipe.xadd(
+        settings.DLQ_STREAM,
+        fields,
+        maxlen=settings.DLQ_MAX_LENGTH,
+        approximate=True,
+    )
+    pipe.delete(history_key)
+    entry_id, _ = pipe.execute()
+
+    logger.error(
+        "Task dead-lettered",
+        task_id=task_id,
+        task_name=task_name,
+        queue=queue,
+        exception_type=fields["exception_type"],
+        retries=len(retries),
+        entry_id=entry_id,
+    )
+    return entry_id
+
+
+def iter_dead_letters(
+    task_pattern: Optional[str] = None,
+    exception_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    batch_size: int = 500,
+) -> Iterator[DeadLetter]:
+    """
+    Iterate dead letters oldest first, optionally filtered
+
+    Args:
+        task_pattern: Glob matched against the task name (e.g. "tasks.analytics.*")
+        exception_type: Exact exception class name
+        since: Only entries recorded at or after this time
+        batch_size: Entries fetched per XRANGE call
+    """
+    client = get_redis()
+    # Stream IDs are millisecond timestamps, so a time filter is a range bound
+    start = f"{int(since.timestamp() * 1000)}-0" if since else "-"
+
+    while True:
+        entries = client.xrange(settings.DLQ_STREAM, min=start, max="+", count=batch_size)
+        if not entries:
+            return
+
+        for entry_id, fields in entries:
+            letter = DeadLetter.from_entry(entry_id, fields)
+            if task_pattern and not fnmatchcase(letter.task_name, task_pattern):
+                continue
+            if exception_type and letter.exception_type != exception_type:
+                continue
+            yield letter
+
+        start = f"({entries[-1][0]}"
+
+
+def get_dead_letter(entry_id: str) -> Optional[DeadLetter]:
+    """Get a single dead letter by stream entry ID"""
+    entries = get_redis().xrange(settings.DLQ_STREAM, min=entry_id, max=entry_id)
+    if not entries:
+        return None
+    return DeadLetter.from_entry(*entries[0])
+
+
+def delete_dead_letters(entry_ids: List[str]) -> int:
+    """Delete dead letters by stream entry ID, returns the number removed"""
+    if not entry_ids:
+        return 0
+    return get_redis().xdel(settings.DLQ_STREAM, *entry_ids)
+
+
+def count_dead_letters() -> int:
+    """Total dead letters currently stored"""
+    return get_redis().xlen(settings.DLQ_STREAM)
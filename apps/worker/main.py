@@ -1,21 +1,63 @@
 """
 TaskFlow Celery Worker Entry Point
+
+Usage:
+    python main.py worker --queues realtime,default   # consume selected queues
+    python main.py <celery command> ...               # any other Celery command
 """
 
+import argparse
+import sys
+from typing import List, Optional
+
+import structlog
 from celery import Celery
 from celery.schedules import crontab
 
+from config.queues import (
+    DEFAULT_QUEUE,
+    QUEUE_PROFILES,
+    TASK_QUEUES,
+    TASK_ROUTES,
+    QueueProfile,
+    QueueTimeLimits,
+    parse_queues,
+    resolve_profile,
+)
 from config.settings import settings
-from tasks import analytics  # noqa: F401
+from metrics import process as metrics_process  # noqa: F401  (registers worker signals)
+from tasks import analytics, archival, auth  # noqa: F401
+
+logger = structlog.get_logger(__name__)
 
 # Create Celery app
 app = Celery(
     "taskflow",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["tasks.analytics"],
+    include=["tasks.analytics", "tasks.archival", "tasks.auth"],
+    # Records retry history and dead-letters tasks that fail after their final retry
+    task_cls="tasks.base:DeadLetterTask",
 )
 
+
+def configured_profile() -> QueueProfile:
+    """
+    Profile of the queues in WORKER_QUEUES, or the default queue's if it is invalid
+
+    Importing this module (beat, `celery inspect`, the DLQ CLI) must not fail on a bad
+    WORKER_QUEUES: only consuming queues needs it, and run_worker reports the error.
+    """
+    try:
+        return resolve_profile(parse_queues(settings.WORKER_QUEUES))
+    except ValueError as exc:
+        logger.warning("Invalid WORKER_QUEUES, using the default profile", error=str(exc))
+        return QUEUE_PROFILES[DEFAULT_QUEUE]
+
+
+# Worker-level tuning follows the queues this process consumes (WORKER_QUEUES)
+worker_profile = configured_profile()
+
 # Celery configuration
 app.conf.update(
     task_serializer="json",
@@ -24,27 +66,27 @@ app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
-    task_time_limit=30 * 60,  # 30 minutes
-    task_soft_time_limit=25 * 60,  # 25 minutes
-    worker_prefetch_multiplier=1,
-    worker_max_tasks_per_child=1000,
+    task_time_limit=worker_profile.time_limit,
+    task_soft_time_limit=worker_profile.soft_time_limit,
+    worker_prefetch_multiplier=worker_profile.prefetch_multiplier,
+    worker_max_tasks_per_child=worker_profile.max_tasks_per_child,
     broker_connection_retry_on_startup=True,  # Fix deprecation warning
-    # Dead Letter Queue configuration
+    # Queues and routing (see config/queues.py)
+    task_queues=TASK_QUEUES,
+    task_routes=TASK_ROUTES,
+    task_annotations=(QueueTimeLimits(),),
+    # Redeliver tasks whose worker died mid-run instead of losing them
     task_reject_on_worker_lost=True,
     task_acks_late=True,
-    task_default_queue="default",
-    task_default_exchange="default",
-    task_default_routing_key="default",
-    # DLQ settings
+    task_default_queue=DEFAULT_QUEUE,
+    task_default_exchange=DEFAULT_QUEUE,
+    task_default_routing_key=DEFAULT_QUEUE,
     task_default_delivery_mode=2,  # Persistent
     task_ignore_result=False,
-    # Failed task handling
+    # Failed tasks are dead-lettered to the DLQ_STREAM Redis stream by DeadLetterTask
+    # (inspect and replay with `python -m dlq`)
     task_send_sent_event=True,
     worker_send_task_events=True,
-    # DLQ queue name
-    task_default_dead_letter_queue="dlq",
-    task_default_dead_letter_exchange="dlq",
-    task_default_dead_letter_routing_key="dlq",
 )
 
 # Periodic tasks
@@ -53,7 +95,68 @@ app.conf.beat_schedule = {
         "task": "tasks.analytics.aggregate_task_analytics",
         "schedule": crontab(minute=0),  # Every hour
     },
+    "archive-completed-tasks-hourly": {
+        "task": "tasks.archival.archive_completed_tasks",
+        "schedule": crontab(minute=30),  # Every hour, away from the analytics run
+    },
 }
 
+
+def run_worker(argv: List[str]) -> None:
+    """
+    Start a worker consuming a queue group with that group's profile
+
+    Unrecognised arguments are passed through to `celery worker`.
+    """
+    parser = argparse.ArgumentParser(prog="main.py worker")
+    parser.add_argument(
+        "--queues",
+        "-Q",
+        default=settings.WORKER_QUEUES,
+        help="Comma-separated queues to consume (default: WORKER_QUEUES)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=settings.WORKER_CONCURRENCY,
+        help="Worker processes (default: WORKER_CONCURRENCY or the queue profile)",
+    )
+    args, celery_args = parser.parse_known_args(argv)
+
+    try:
+        queues = parse_queues(args.queues)
+    except ValueError as exc:
+        parser.error(f"--queues (default: WORKER_QUEUES): {exc}")
+
+    profile = resolve_profile(queues)
+    app.conf.update(
+        task_time_limit=profile.time_limit,
+        task_soft_time_limit=profile.soft_time_limit,
+        worker_prefetch_multiplier=profile.prefetch_multiplier,
+        worker_max_tasks_per_child=profile.max_tasks_per_child,
+    )
+
+    app.worker_main(
+        [
+            "worker",
+            f"--queues={','.join(queues)}",
+            f"--concurrency={args.concurrency or profile.concurrency}",
+            f"--prefetch-multiplier={profile.prefetch_multiplier}",
+            f"--max-tasks-per-child={profile.max_tasks_per_child}",
+            *celery_args,
+        ]
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "worker":
+        run_worker(argv[1:])
+    else:
+        app.start(argv)
+
+
 if __name__ == "__main__":
-    app.start()
+    main()
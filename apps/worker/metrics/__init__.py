@@ -0,0 +1 @@
+"""Worker metrics (Prometheus exporter and worker process signals)"""
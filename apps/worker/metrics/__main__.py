@@ -0,0 +1,23 @@
+"""
+Worker metrics exporter
+
+Usage:
+    python -m metrics [--port PORT]
+"""
+
+import argparse
+
+from config.settings import settings
+from main import app
+from metrics.exporter import serve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m metrics", description=__doc__)
+    parser.add_argument("--port", type=int, default=settings.METRICS_PORT)
+    args = parser.parse_args()
+    serve(app, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
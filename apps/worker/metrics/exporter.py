@@ -0,0 +1,166 @@
+"""
+Prometheus exporter for Celery task events and queue depth
+
+Runs as its own process: consumes the worker event stream (worker_send_task_events /
+task_send_sent_event) and polls queue lengths from Redis, so worker processes stay free of
+HTTP servers and multiprocess metric files.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from celery import Celery
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+import redis
+import structlog
+
+from config.queues import QUEUE_PROFILES
+from config.settings import settings
+from metrics.process import PROCESS_EXITED_EVENT
+
+logger = structlog.get_logger(__name__)
+
+# Kombu's Redis transport stores non-zero priorities in separate lists
+# named "<queue>\x06\x16<priority>"
+PRIORITY_SEPARATOR = "\x06\x16"
+PRIORITY_STEPS = (3, 6, 9)
+
+TASK_RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Task execution time",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 1800, 3600, 7200),
+)
+TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time between a task being sent and a worker starting it",
+    ["task", "queue"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+)
+TASK_EVENTS = Counter(
+    "celery_task_events_total",
+    "Task state transitions",
+    ["task", "state"],
+)
+QUEUE_LENGTH = Gauge("celery_queue_length", "Messages waiting in a queue", ["queue"])
+DLQ_LENGTH = Gauge("celery_dlq_length", "Tasks in the dead-letter stream")
+PROCESS_EXITS = Counter(
+    "celery_worker_process_exits_total",
+    "Worker child process exits",
+    ["hostname", "recycled"],
+)
+PROCESS_RSS_AT_EXIT = Histogram(
+    "celery_worker_process_rss_at_exit_bytes",
+    "Resident memory of worker child processes when they exit",
+    ["hostname", "recycled"],
+    buckets=tuple(mb * 1024 * 1024 for mb in (64, 128, 192, 256, 384, 512, 768, 1024, 2048)),
+)
+
+# Terminal states counted from events (task-sent/received/started feed the histograms)
+COUNTED_STATES = {
+    "task-succeeded": "succeeded",
+    "task-failed": "failed",
+    "task-retried": "retried",
+    "task-rejected": "rejected",
+    "task-revoked": "revoked",
+}
+
+
+class EventConsumer:
+    """Turns Celery task events into Prometheus metrics"""
+
+    def __init__(self, app: Celery):
+        self.app = app
+        self.state = app.events.State()
+
+    def on_event(self, event: dict) -> None:
+        event_type = event.get("type", "")
+
+        if event_type == PROCESS_EXITED_EVENT:
+            self._on_process_exit(event)
+            return
+
+        self.state.event(event)
+        if not event_type.startswith("task-"):
+            return
+
+        task = self.state.tasks.get(event.get("uuid"))
+        task_name = (task.name if task else None) or "unknown"
+
+        if event_type == "task-started" and task is not None:
+            sent_at = task.sent or task.received
+            if sent_at:
+                queue = task.routing_key or task.exchange or "unknown"
+                TASK_QUEUE_WAIT.labels(task=task_name, queue=queue).observe(
+                    max(0.0, event["timestamp"] - sent_at)
+                )
+        elif event_type == "task-succeeded" and event.get("runtime") is not None:
+            TASK_RUNTIME.labels(task=task_name).observe(event["runtime"])
+
+        state = COUNTED_STATES.get(event_type)
+        if state:
+            TASK_EVENTS.labels(task=task_name, state=state).inc()
+
+    def _on_process_exit(self, event: dict) -> None:
+        labels = {
+            "hostname": event.get("hostname", "unknown"),
+            "recycled": str(bool(event.get("recycled"))).lower(),
+        }
+        PROCESS_EXITS.labels(**labels).inc()
+        if event.get("rss_bytes"):
+            PROCESS_RSS_AT_EXIT.labels(**labels).observe(event["rss_bytes"])
+
+    def run(self) -> None:
+        """Consume events forever, reconnecting on broker errors"""
+        while True:
+            try:
+                with self.app.connection() as connection:
+                    receiver = self.app.events.Receiver(connection, handlers={"*": self.on_event})
+                    logger.info("Consuming Celery events")
+                    receiver.capture(limit=None, timeout=None, wakeup=True)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                logger.warning("Event consumer disconnected, reconnecting", error=str(e))
+                time.sleep(5)
+
+
+class QueueDepthPoller(threading.Thread):
+    """Periodically reads queue lengths from Redis"""
+
+    def __init__(self, interval: float, client: Optional[redis.Redis] = None):
+        super().__init__(name="queue-depth-poller", daemon=True)
+        self.interval = interval
+        self.client = client or redis.Redis.from_url(settings.REDIS_URL)
+
+    def poll(self) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for queue in QUEUE_PROFILES:
+            pipe.llen(queue)
+            for priority in PRIORITY_STEPS:
+                pipe.llen(f"{queue}{PRIORITY_SEPARATOR}{priority}")
+        pipe.xlen(settings.DLQ_STREAM)
+        results = pipe.execute()
+
+        per_queue = len(PRIORITY_STEPS) + 1
+        for index, queue in enumerate(QUEUE_PROFILES):
+            lengths = results[index * per_queue : (index + 1) * per_queue]
+            QUEUE_LENGTH.labels(queue=queue).set(sum(lengths))
+        DLQ_LENGTH.set(results[-1])
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("Failed to poll queue depth", error=str(e))
+            time.sleep(self.interval)
+
+
+def serve(app: Celery, port: int = settings.METRICS_PORT) -> None:
+    """Start the HTTP exporter, the queue poller and the event consumer (blocks)"""
+    start_http_server(port)
+    logger.info("Metrics exporter listening", port=port)
+    QueueDepthPoller(settings.METRICS_QUEUE_POLL_SECONDS).start()
+    EventConsumer(app).run()
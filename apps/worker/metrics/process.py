@@ -0,0 +1,54 @@
+"""
+Worker child-process signals feeding the metrics exporter
+
+Child processes are recycled after worker_max_tasks_per_child tasks. On exit each child
+reports its memory as a custom `worker-process-exited` event, so the exporter can show how
+much memory a child holds by the time it is recycled.
+"""
+
+import os
+import resource
+
+from celery import current_app
+from celery.signals import task_postrun, worker_process_shutdown
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PROCESS_EXITED_EVENT = "worker-process-exited"
+
+_tasks_executed = 0
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process (Linux), 0 if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@task_postrun.connect
+def _count_task(**kwargs) -> None:
+    global _tasks_executed
+    _tasks_executed += 1
+
+
+@worker_process_shutdown.connect
+def _report_process_exit(**kwargs) -> None:
+    app = current_app
+    max_tasks = app.conf.worker_max_tasks_per_child
+    try:
+        with app.events.default_dispatcher() as dispatcher:
+            dispatcher.send(
+                PROCESS_EXITED_EVENT,
+                pid=os.getpid(),
+                tasks_executed=_tasks_executed,
+                recycled=bool(max_tasks) and _tasks_executed >= max_tasks,
+                rss_bytes=_current_rss_bytes(),
+                # ru_maxrss is in kilobytes on Linux
+                peak_rss_bytes=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+            )
+    except Exception as e:
+        logger.warning("Failed to report worker process exit", error=str(e))
@@ -1,4 +1,4 @@
 """Celery tasks"""
 
 # Import tasks to ensure they're registered
-from . import analytics  # noqa: F401
+from . import analytics, archival, auth  # noqa: F401
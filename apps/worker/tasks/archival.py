@@ -0,0 +1,75 @@
+"""
+Task archival
+
+Completed tasks untouched for TASK_ARCHIVE_AFTER_DAYS move from the tasks_active partition to
+tasks_archived (setting the `archived` partition key moves the row), so the indexes that
+serve the task list and search stay small. Archival doesn't change `updated_at`: it isn't a
+change to the task for delta sync.
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from celery import shared_task
+from sqlalchemy import text
+
+import db
+from config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# One bounded batch per transaction. Rows locked by a concurrent update are skipped (the
+# update refreshes updated_at, so they no longer qualify); uses idx_tasks_active_done_updated.
+ARCHIVE_BATCH = text(
+    """
+    WITH batch AS (
+        SELECT id FROM tasks_active
+        WHERE status = 'done' AND updated_at < :cutoff
+        ORDER BY updated_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE tasks SET archived = true
+    FROM batch
+    WHERE tasks.id = batch.id AND tasks.archived = false
+    """
+)
+
+
+@shared_task(bind=True, max_retries=3, name="tasks.archival.archive_completed_tasks")
+def archive_completed_tasks(self) -> dict:
+    """
+    Archive completed tasks last updated more than TASK_ARCHIVE_AFTER_DAYS ago
+
+    Runs periodically. Moves at most TASK_ARCHIVE_MAX_BATCHES batches per run, committing
+    each, so locks are short and a backlog is worked off over several runs.
+    """
+    cutoff = datetime.now(UTC) - timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    batch_size = settings.TASK_ARCHIVE_BATCH_SIZE
+
+    async def archive() -> int:
+        archived = 0
+        async with db.connect() as connection:
+            for batch in range(settings.TASK_ARCHIVE_MAX_BATCHES):
+                if batch:
+                    # Leave room for other writers and for replication to keep up
+                    await asyncio.sleep(settings.TASK_ARCHIVE_BATCH_PAUSE_SECONDS)
+                result = await connection.execute(
+                    ARCHIVE_BATCH, {"cutoff": cutoff, "batch_size": batch_size}
+                )
+                await connection.commit()
+                archived += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+        return archived
+
+    try:
+        logger.info("Starting task archival", cutoff=cutoff.isoformat())
+        archived = db.run(archive)
+        logger.info("Task archival completed", archived=archived)
+        return {"status": "success", "archived": archived}
+    except Exception as exc:
+        logger.exception("Error archiving tasks", exc_info=exc)
+        # Retry with exponential backoff (batches already committed stay archived)
+        raise self.retry(exc=exc, countdown=60 * (2**self.request.retries))
@@ -0,0 +1,98 @@
+"""
+Authentication maintenance tasks
+"""
+
+import json
+from typing import Optional
+
+import structlog
+from celery import shared_task
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import text
+
+import db
+from config.settings import settings
+from dlq.store import get_redis
+
+logger = structlog.get_logger(__name__)
+
+# Shared with the API (app/services/password_rehash.py and app/services/user_cache.py)
+REHASH_PENDING_PREFIX = "rehash_pending:"
+USER_CACHE_INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+# Compare-and-set: a password changed since the login that scheduled the rehash wins
+UPDATE_PASSWORD_HASH = text(
+    """
+    UPDATE users SET password_hash = :new_hash, updated_at = now()
+    WHERE id = :user_id AND password_hash = :old_hash
+    RETURNING email
+    """
+)
+
+
+def _decrypt(token: str) -> Optional[dict]:
+    """Rehash request from the API, or None if it is expired or can't be decrypted"""
+    try:
+        payload = Fernet(settings.PASSWORD_REHASH_KEY).decrypt(
+            token, ttl=settings.PASSWORD_REHASH_MAX_AGE_SECONDS
+        )
+    except (InvalidToken, ValueError):
+        return None
+    return json.loads(payload)
+
+
+def _invalidate_user_cache(user_id: str, email: str) -> None:
+    """Drop the user's cached record (shared tier and every API replica's local tier)"""
+    keys = [f"user:id:{user_id}", f"user:email:{email}"]
+    redis_client = get_redis()
+    redis_client.delete(*keys)
+    redis_client.publish(USER_CACHE_INVALIDATION_CHANNEL, json.dumps(keys))
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    name="tasks.auth.rehash_password",
+    rate_limit=settings.PASSWORD_REHASH_RATE_LIMIT,
+    ignore_result=True,
+)
+def rehash_password(self, token: str) -> None:
+    """
+    Replace a user's outdated password hash, scheduled by the API after a successful login
+
+    The request is encrypted by the API (it carries the password) and names the Argon2
+    parameters to use, so the API's hashing policy stays the only one. Requests older than
+    PASSWORD_REHASH_MAX_AGE_SECONDS, or that can't be decrypted, are dropped.
+    """
+    request = _decrypt(token)
+    if request is None:
+        logger.warning("Dropping expired or undecryptable password rehash request")
+        return
+
+    from passlib.hash import argon2
+
+    user_id = request["user_id"]
+    try:
+        new_hash = argon2.using(**request["argon2"]).hash(request["password"])
+
+        async def store() -> Optional[str]:
+            async with db.connect() as connection:
+                result = await connection.execute(
+                    UPDATE_PASSWORD_HASH,
+                    {"user_id": user_id, "old_hash": request["old_hash"], "new_hash": new_hash},
+                )
+                email = result.scalar_one_or_none()
+                await connection.commit()
+                return email
+
+        email = db.run(store)
+        if email is None:
+            logger.info("Password changed before rehash, skipped", user_id=user_id)
+        else:
+            _invalidate_user_cache(user_id, email)
+            logger.info("Password rehashed", user_id=user_id)
+        get_redis().delete(f"{REHASH_PENDING_PREFIX}{user_id}")
+    except Exception as exc:
+        logger.exception("Error rehashing password", user_id=user_id, exc_info=exc)
+        # Retry with exponential backoff
+        raise self.retry(exc=exc, countdown=60 * (2**self.request.retries))
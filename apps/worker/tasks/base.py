@@ -0,0 +1,36 @@
+"""
+Base task class with dead-letter handling
+"""
+
+from celery import Task
+import structlog
+
+from dlq import dead_letter, record_retry
+
+logger = structlog.get_logger(__name__)
+
+
+class DeadLetterTask(Task):
+    """
+    Task that records its retry history and dead-letters itself on final failure
+
+    on_failure only runs once retries are exhausted (or for errors that are not retried),
+    so every failed task ends up in the DLQ stream with enough context to replay it.
+    """
+
+    def on_retry(self, exc, task_id, args, kwargs, einfo) -> None:
+        try:
+            record_retry(task_id, self.request.retries, exc)
+        except Exception as e:
+            # Never let DLQ bookkeeping mask the task's own retry
+            logger.warning("Failed to record task retry", task_id=task_id, error=str(e))
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
+        delivery_info = self.request.delivery_info or {}
+        queue = delivery_info.get("routing_key") or self.app.conf.task_default_queue
+        try:
+            dead_letter(task_id, self.name, queue, args, kwargs, exc, einfo)
+        except Exception as e:
+            logger.exception(
+                "Failed to dead-letter task", task_id=task_id, task_name=self.name, exc_info=e
+            )